@@ -1,11 +1,15 @@
+import asyncio
+import functools
 import logging
 import os
-from typing import Any, AsyncGenerator
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, AsyncGenerator, Callable, TypeVar
 
 from llama_cpp import Llama
 
 from leapfrogai_sdk import BackendConfig
-from leapfrogai_sdk.llm import LLM, GenerationConfig
+from leapfrogai_sdk.llm import LLM, GenerationChunk, GenerationConfig
+from prefix_cache import PrefixCache
 
 logging.basicConfig(
     level=os.getenv("LFAI_LOG_LEVEL", logging.INFO),
@@ -13,37 +17,95 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Bytes of evaluated conversation context kept for reuse by follow-up turns
+PREFIX_CACHE_BYTES = int(os.getenv("LFAI_PREFIX_CACHE_BYTES", 2 * 1024**3))
+
 
 @LLM
 class Model:
     backend_config = BackendConfig()
+    llm: Llama | None = None
+
+    def __init__(self):
+        # Every use of the model runs on one thread of its own: llama.cpp isn't thread-safe,
+        # and generating on the event loop would block health checks. A request cancelled
+        # mid-call can't overlap the next one, whose calls queue behind it.
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="llama")
+        # One request generates at a time, rather than interleaving their tokens
+        self.lock = asyncio.Lock()
+        self.prefix_cache = PrefixCache(PREFIX_CACHE_BYTES)
 
-    if not os.path.exists(backend_config.model.source):
-        raise ValueError(f"Model path ({backend_config.model.source}) does not exist")
+    def load(self):
+        source = self.backend_config.model.source
+        if not os.path.exists(source):
+            raise ValueError(f"Model path ({source}) does not exist")
+        logger.info(f"Loading model from {source}")
+        self.llm = Llama(
+            model_path=source,
+            n_ctx=self.backend_config.max_context_length,
+            n_gpu_layers=0,
+        )
 
-    llm = Llama(
-        model_path=backend_config.model.source,
-        n_ctx=backend_config.max_context_length,
-        n_gpu_layers=0,
-    )
+    async def run(self, fn: Callable[..., T], *args, **kwargs) -> T:
+        return await asyncio.get_running_loop().run_in_executor(
+            self.executor, functools.partial(fn, *args, **kwargs)
+        )
 
     async def generate(
         self, prompt: str, config: GenerationConfig
     ) -> AsyncGenerator[str, Any]:
         logger.info("Begin generating streamed response")
-        for res in self.llm(
-            prompt,
-            stream=True,
-            temperature=config.temperature,
-            max_tokens=config.max_new_tokens,
-            top_p=config.top_p,
-            top_k=config.top_k,
-            stop=self.backend_config.stop_tokens,
-        ):
-            yield res["choices"][0]["text"]  # type: ignore
+        async with self.lock:
+            await self.run(self.prefix_cache.restore, self.llm, config.cache_key)
+            stream = self.llm(
+                prompt,
+                stream=True,
+                temperature=config.temperature,
+                max_tokens=config.max_new_tokens,
+                top_p=config.top_p,
+                top_k=config.top_k,
+                stop=self.backend_config.stop_tokens,
+            )
+            try:
+                while (res := await self.run(next, stream, None)) is not None:
+                    yield res["choices"][0]["text"]  # type: ignore
+            finally:
+                # Also keep what was evaluated when the client stopped the stream early
+                await self.run(self.prefix_cache.save, self.llm, config.cache_key)
         logger.info("Streamed response complete")
 
+    def complete(self, prompt: str, config: GenerationConfig) -> dict:
+        self.prefix_cache.restore(self.llm, config.cache_key)
+        try:
+            return self.llm(  # type: ignore
+                prompt,
+                temperature=config.temperature,
+                max_tokens=config.max_new_tokens,
+                top_p=config.top_p,
+                top_k=config.top_k,
+                stop=self.backend_config.stop_tokens,
+            )
+        finally:
+            self.prefix_cache.save(self.llm, config.cache_key)
+
+    async def generate_full(
+        self, prompt: str, config: GenerationConfig
+    ) -> GenerationChunk:
+        logger.info("Begin generating response")
+        async with self.lock:
+            res = await self.run(self.complete, prompt, config)
+        logger.info("Response complete")
+        usage = res["usage"]
+        return GenerationChunk(
+            res["choices"][0]["text"],
+            usage["completion_tokens"],
+            usage["prompt_tokens"],
+        )
+
     async def count_tokens(self, raw_text: str) -> int:
         string_bytes: bytes = bytes(raw_text, "utf-8")
-        tokens: list[int] = self.llm.tokenize(string_bytes)
+        # On the model's thread, so long texts don't block the event loop
+        tokens: list[int] = await self.run(self.llm.tokenize, string_bytes)
         return len(tokens)
@@ -0,0 +1,64 @@
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from llama_cpp import Llama
+    from llama_cpp.llama import LlamaState
+
+
+class PrefixCache:
+    """Evaluated context saved per conversation, so follow-up turns skip re-evaluating it.
+
+    llama.cpp skips re-evaluating the tokens a prompt shares with the loaded context, so
+    restoring a conversation's state before its next turn leaves only what was added since
+    to process. States hold the evaluated context and can be large, so the cache is bounded
+    by their total size in bytes, evicting the least recently used first.
+
+    Not thread-safe; the backend only uses it from the model's own thread.
+    """
+
+    def __init__(self, capacity_bytes: int):
+        self.capacity_bytes = capacity_bytes
+        # Least recently used first
+        self.states: OrderedDict[str, "LlamaState"] = OrderedDict()
+        self.size = 0
+        # Cache key of the conversation currently loaded in the context
+        self.loaded_key: str | None = None
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def restore(self, llm: "Llama", cache_key: str | None):
+        """Load the context saved for a conversation, unless it's already loaded."""
+        if cache_key is None or cache_key == self.loaded_key:
+            return
+        state = self.states.get(cache_key)
+        if state is not None:
+            llm.load_state(state)
+            self.states.move_to_end(cache_key)
+            self.loaded_key = cache_key
+
+    def save(self, llm: "Llama", cache_key: str | None):
+        """Keep the context just evaluated for a conversation, if it grew since last saved."""
+        self.loaded_key = cache_key
+        if cache_key is None:
+            return
+
+        saved = self.states.get(cache_key)
+        if saved is not None and saved.n_tokens >= llm.n_tokens:
+            self.states.move_to_end(cache_key)
+            return
+
+        self._remove(cache_key)
+        state = llm.save_state()
+        if state.llama_state_size > self.capacity_bytes:
+            return
+        self.states[cache_key] = state
+        self.size += state.llama_state_size
+        while self.size > self.capacity_bytes:
+            self._remove(next(iter(self.states)))
+
+    def _remove(self, cache_key: str):
+        state = self.states.pop(cache_key, None)
+        if state is not None:
+            self.size -= state.llama_state_size
@@ -4,10 +4,9 @@ import os
 
 from InstructorEmbedding import INSTRUCTOR
 from leapfrogai_sdk import (
-    Embedding,
     EmbeddingRequest,
-    EmbeddingResponse,
     GrpcContext,
+    embedding_response,
     serve,
 )
 
@@ -19,10 +18,18 @@ logger = logging.getLogger(__name__)
 
 
 model_dir = os.environ.get("LFAI_MODEL_PATH", ".model")
-model = INSTRUCTOR(model_dir)
 
 
 class InstructorEmbedding:
+    model: INSTRUCTOR | None = None
+
+    def load(self):
+        logger.info(f"Loading model from {model_dir}")
+        self.model = INSTRUCTOR(model_dir)
+
+    def warmup(self):
+        self.model.encode(sentences=["Hello"])
+
     async def CreateEmbedding(self, request: EmbeddingRequest, context: GrpcContext):
         logger.info(
             f"processing CreateEmbedding request: char-length: {len(str(request.inputs))} word-count: {len(str(request.inputs).split())}"
@@ -30,15 +37,13 @@ class InstructorEmbedding:
 
         # Run the CPU-intensive encoding in a separate thread
         embeddings = await asyncio.to_thread(
-            model.encode, sentences=request.inputs, show_progress_bar=True
+            self.model.encode, sentences=request.inputs, show_progress_bar=True
         )
 
-        embeddings = [Embedding(embedding=inner_list) for inner_list in embeddings]
-
         logger.info(
             f"finished processing CreateEmbedding request, created {len(embeddings)} embeddings"
         )
-        return EmbeddingResponse(embeddings=embeddings)
+        return embedding_response(embeddings, request.encoding)
 
 
 if __name__ == "__main__":
@@ -59,6 +59,20 @@ class ConfigOptions(BaseConfig):
         description="If True, uses Ray for distributed worker management. Allows for distributed inferencing in multi-node situations.",
         examples=[True, False],
     )
+    enable_prefix_caching: bool = Field(
+        default=False,
+        title="Enable Automatic Prefix Caching",
+        description="Reuse the KV cache of prompt prefixes shared between requests, such as the instructions and history re-sent on every turn of a thread. "
+        "Lowers time to first token on follow-up turns at the cost of keeping cached blocks in GPU memory.",
+        examples=[True, False],
+    )
+    request_state_ttl: float = Field(
+        default=600.0,
+        title="Request State TTL",
+        description="Seconds a request may go without any output from the engine before it is failed and its state evicted. "
+        "Keep this above the longest time a request can wait in the engine's queue.",
+        examples=[600.0],
+    )
     trust_remote_code: bool = Field(
         title="Trust Downloaded Model Code",
         description="Whether to trust inferencing code downloaded as part of the model download."
@@ -97,6 +111,8 @@ class AppConfig(BaseConfig):
                 "worker_use_ray": "backend_options.worker_use_ray",
                 "engine_use_ray": "backend_options.engine_use_ray",
                 "load_format": "backend_options.load_format",
+                "enable_prefix_caching": "backend_options.enable_prefix_caching",
+                "request_state_ttl": "backend_options.request_state_ttl",
             },
         )
     ]
@@ -1,11 +1,7 @@
 import asyncio
 import logging
 import os
-import queue
-import random
-import threading
-import time
-from typing import Any, Dict, AsyncGenerator
+from typing import Any, AsyncGenerator
 
 from dotenv import load_dotenv
 from vllm import SamplingParams
@@ -15,8 +11,10 @@ from vllm.outputs import RequestOutput
 from vllm.utils import random_uuid
 
 from config import AppConfig
+from output_scheduler import OutputScheduler
+from request_registry import RequestRegistry
 from leapfrogai_sdk import BackendConfig
-from leapfrogai_sdk.llm import GenerationConfig, LLM
+from leapfrogai_sdk.llm import GenerationChunk, GenerationConfig, LLM
 
 load_dotenv()
 
@@ -31,62 +29,20 @@ def clamp(n: float | int, smallest: float | int, largest: float | int):
     return max(smallest, min(n, largest))
 
 
-class RandomAsyncIterator:
-    """Manages multiple async iterables and allows iterating over them in a random order."""
-
-    def __init__(self, async_iterables):
-        # Convert each iterable into an async iterator
-        self.async_iterators = [ai.__aiter__() for ai in async_iterables]
-
-    def __aiter__(self):
-        return self
-
-    async def __anext__(self):
-        """Return the next item from a randomly chosen iterator. If all iterators are exhausted, stop iteration."""
-        if not self.async_iterators:  # Check if there are no iterators left
-            raise StopAsyncIteration
-
-        # Select a random iterator from the list
-        random_index = random.randint(0, len(self.async_iterators) - 1)
-        try:
-            # Attempt to get the next item from the randomly selected iterator
-            return await self.async_iterators[random_index].__anext__()
-        except StopAsyncIteration:
-            # If the selected iterator is exhausted, remove it from the list
-            del self.async_iterators[random_index]
-
-        # If all iterators are exhausted, raise StopAsyncIteration
-        raise StopAsyncIteration
-
-    def is_empty(self):
-        """Check if there are any iterators left."""
-        return len(self.async_iterators) <= 0
-
-    def add_iterator(self, async_iterable):
-        """Add a new async iterable to the pool of iterators."""
-        self.async_iterators.append(async_iterable.__aiter__())
-
-    def remove_iterator(self, async_iterable):
-        """Attempt to remove an async iterable from the pool if it exists."""
-        try:
-            self.async_iterators.remove(async_iterable.__aiter__())
-        except ValueError:
-            pass  # If the iterable is not found, ignore the error
-
-
 @LLM
 class Model:
     """Implements an LLM model with concurrent output generation and management."""
 
-    done_by_id: Dict[str, bool] = {}
-    delta_queue_by_id: Dict[str, queue.Queue] = {}
-    result_by_id: Dict[str, RequestOutput] = {}
-    random_iterator: RandomAsyncIterator = RandomAsyncIterator([])
-
     def __init__(self):
-        # Background thread for managing output iteration
-        _thread = threading.Thread(target=asyncio.run, args=(self.iterate_outputs(),))
-        _thread.start()
+        # Multiplexes the engine's output streams on the event loop serving the RPCs, so
+        # every request is driven from that one loop
+        self.scheduler = OutputScheduler(
+            deliver=self.deliver_output, end=self.end_request
+        )
+        self.requests = RequestRegistry(
+            ttl=AppConfig().backend_options.request_state_ttl,
+            model=BackendConfig().name or "vllm",
+        )
 
         quantization = (
             None
@@ -108,68 +64,37 @@ class Model:
             worker_use_ray=AppConfig().backend_options.worker_use_ray,
             gpu_memory_utilization=AppConfig().backend_options.gpu_memory_utilization,
             trust_remote_code=AppConfig().backend_options.trust_remote_code,
+            enable_prefix_caching=AppConfig().backend_options.enable_prefix_caching,
         )
-        self.engine = AsyncLLMEngine.from_engine_args(self.engine_args)
+        self.engine: AsyncLLMEngine | None = None
+        self._tokenizer = None
         print(self.engine_args)
 
-    async def iterate_outputs(self):
-        """Continuously processes outputs from the random iterator and manages state by request IDs."""
-
-        t0_by_id: dict[str, float] = {}
-        index_by_id: dict[str, int] = {}
-        num_tokens_by_id: dict[str, int] = {}
-
-        while True:
-            if not self.random_iterator.is_empty():
-                request_output: RequestOutput
-                async for request_output in self.random_iterator:
-                    request_id = request_output.request_id
-
-                    # At least one iteration must be done for each request_id
-                    if (
-                        self.delta_queue_by_id.get(request_id)
-                        and request_output.finished
-                    ):
-                        # Signal that the "generate" function can stop waiting for additional inputs
-                        logger.info(
-                            f"Generated {num_tokens_by_id[request_id]} tokens in {time.time() - t0_by_id[request_id]:.2f}s"
-                        )
-                        self.done_by_id[request_id] = True
-                    else:
-                        # Initialize dictionary entries
-                        if t0_by_id.get(request_id) is None:
-                            t0_by_id[request_id] = time.time()
-
-                        if index_by_id.get(request_id) is None:
-                            index_by_id[request_id] = 0
-
-                        if num_tokens_by_id.get(request_id) is None:
-                            num_tokens_by_id[request_id] = 0
-
-                    if (
-                        request_output.outputs[0].text
-                        and "\ufffd" == request_output.outputs[0].text[-1]
-                    ):
-                        continue
-
-                    # Update tracking information
-                    text_delta = request_output.outputs[0].text[
-                        index_by_id[request_id] :
-                    ]
-                    index_by_id[request_id] = len(request_output.outputs[0].text)
-                    num_tokens_by_id[request_id] = len(
-                        request_output.outputs[0].token_ids
-                    )
-
-                    # Add the result to the queue for this request
-                    self.delta_queue_by_id[request_id].put(text_delta)
-            time.sleep(0)
-
-    async def create_response(
-        self, request_id: str, prompt: str, config: GenerationConfig
-    ):
-        """Initiate a response generation for the given prompt and configuration, adding the result to the iterator
-        pool."""
+    def load(self):
+        logger.info(f"Loading model from {BackendConfig().model.source}")
+        self.engine = AsyncLLMEngine.from_engine_args(self.engine_args)
+
+    async def deliver_output(self, request_output: RequestOutput):
+        """Stream the delta of an engine output to the request reading it."""
+        self.requests.stream(request_output)
+        await self.evict_expired_requests()
+
+    def end_request(self, request_id: str, error: Exception | None):
+        """Fail a request whose engine stream ended before a finished output."""
+        if request_id in self.requests:
+            self.requests.fail(
+                request_id,
+                error or RuntimeError(f"Request {request_id} ended without finishing"),
+            )
+
+    async def evict_expired_requests(self):
+        """Fail requests that stopped producing output and free their engine slots."""
+        for request_id in self.requests.evict_expired():
+            logger.warning(f"Evicting request {request_id} without recent output")
+            await self.engine.abort(request_id)
+
+    def sampling_params(self, config: GenerationConfig) -> SamplingParams:
+        """Translate the SDK's generation config into vLLM sampling parameters."""
 
         # Collect LeapfrogAI SDK-defined parameters not aligned with vLLM SamplingParams
         params = {
@@ -200,7 +125,13 @@ class Model:
                 params[param] = config[param]
 
         # Pass the collected params to vLLM SamplingParams
-        sampling_params = SamplingParams(**params)
+        return SamplingParams(**params)
+
+    def create_response(self, request_id: str, prompt: str, config: GenerationConfig):
+        """Initiate a response generation for the given prompt and configuration, adding its outputs to those the
+        scheduler delivers."""
+
+        sampling_params = self.sampling_params(config)
 
         logger.info(f"Begin generation for request {request_id}")
         logger.debug(f"{request_id} sampling_params: {sampling_params}")
@@ -209,57 +140,89 @@ class Model:
         # that contain the prompt, generated text, and other information.
         gen_iter = self.engine.generate(prompt, sampling_params, request_id)
         logger.info(f"Begin iteration for request {request_id}")
-        self.random_iterator.add_iterator(gen_iter)
-
-    async def generate_session(
-        self, session: str, prompt: str, config: GenerationConfig
-    ):
-        """Manage a session's lifecycle for generating output, including setting up necessary state and iterators."""
-
-        if self.delta_queue_by_id.get(session) is None:
-            self.delta_queue_by_id[session] = queue.Queue()
-
-        await self.create_response(session, prompt, config)
-
-    def is_queue_empty(self, request_id) -> bool:
-        """Check if the queue for a given request ID is empty or non-existent."""
-
-        cur_request_queue = self.delta_queue_by_id.get(request_id)
-        return cur_request_queue is None or cur_request_queue.empty()
+        self.scheduler.add(request_id, gen_iter, config.priority)
 
     async def generate(
         self, prompt: str, config: GenerationConfig
-    ) -> AsyncGenerator[str, Any]:
+    ) -> AsyncGenerator[GenerationChunk, Any]:
         """Initiate and manage the generation process for a given prompt, yielding generated text segments."""
 
         request_id = random_uuid()
-        self.done_by_id[request_id] = False
+        await self.evict_expired_requests()
 
-        # Spawns a thread to request a response for the prompt
-        _thread = threading.Thread(
-            target=asyncio.run,
-            args=(self.generate_session(request_id, prompt, config),),
-        )
-        _thread.start()
+        try:
+            state = self.requests.create(request_id)
+            self.create_response(request_id, prompt, config)
+
+            logger.info(f"Begin reading the output for request {request_id}")
+
+            # Wait for each delta instead of polling, so idle requests cost nothing
+            while (chunk := await state.deltas.get()) is not None:
+                if isinstance(chunk, Exception):
+                    raise chunk
+                yield chunk
+        finally:
+            self.scheduler.discard(request_id)
+            if self.requests.abort(request_id):
+                # The consumer stopped early, e.g. the client cancelled the RPC, so free
+                # the engine's slot instead of generating up to max_tokens for nobody
+                logger.info(f"Aborting request {request_id}")
+                await self.engine.abort(request_id)
 
-        logger.info(f"Begin reading the output for request {request_id}")
+        logger.info(f"Finished request {request_id}")
 
-        while not self.done_by_id.get(request_id) or not self.is_queue_empty(
-            request_id
-        ):
-            result = ""
+    async def generate_full(
+        self, prompt: str, config: GenerationConfig
+    ) -> GenerationChunk:
+        """Generate the whole completion for a non-streaming RPC.
 
-            # Ensure that the queue is not None and contains items before calling .get()
-            cur_queue = self.delta_queue_by_id.get(request_id)
-            if cur_queue is not None and not cur_queue.empty():
-                result = cur_queue.get()
+        Reads only the last of the engine's outputs for the request, so the deltas of
+        intermediate outputs are neither computed nor queued.
+        """
 
-            yield result
+        request_id = random_uuid()
+        await self.evict_expired_requests()
+        logger.info(f"Begin generation for request {request_id}")
 
+        request_output: RequestOutput | None = None
+        try:
+            # Tracked like streamed requests, so stalled ones are evicted too
+            state = self.requests.create(request_id)
+            async for request_output in self.engine.generate(
+                prompt, self.sampling_params(config), request_id
+            ):
+                self.requests.touch(request_id)
+        finally:
+            self.requests.abort(request_id)
+            if request_output is None or not request_output.finished:
+                logger.info(f"Aborting request {request_id}")
+                await self.engine.abort(request_id)
+
+        if request_output is None or not request_output.finished:
+            # Holds the error if the request was evicted
+            if not state.deltas.empty():
+                raise state.deltas.get_nowait()
+            raise RuntimeError(f"Request {request_id} ended without finishing")
+
+        output = request_output.outputs[0]
         logger.info(f"Finished request {request_id}")
+        return GenerationChunk(
+            output.text, len(output.token_ids), len(request_output.prompt_token_ids)
+        )
+
+    async def tokenizer(self) -> Any:
+        """The engine's tokenizer, fetched from the engine on first use."""
+        if self._tokenizer is None:
+            self._tokenizer = await self.engine.get_tokenizer()
+        return self._tokenizer
 
     async def count_tokens(self, raw_text: str) -> int:
-        tokens: list[int] | list[str] = (await self.engine.get_tokenizer()).tokenize(
-            raw_text
-        )
+        tokens: list[int] | list[str] = (await self.tokenizer()).tokenize(raw_text)
         return len(tokens)
+
+    async def count_tokens_batch(self, texts: list[str]) -> list[int]:
+        tokenizer = await self.tokenizer()
+        # Fast tokenizers encode a batch in parallel and release the GIL, so this runs off
+        # the event loop serving the other requests
+        encodings = await asyncio.to_thread(tokenizer, texts, add_special_tokens=False)
+        return [len(input_ids) for input_ids in encodings["input_ids"]]
@@ -0,0 +1,125 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Any, AsyncIterable, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class OutputScheduler:
+    """Multiplexes the engine's output streams of every request onto one consumer.
+
+    Each stream is read by its own task, which keeps only the latest output of its
+    request: vLLM's outputs are cumulative, so a request delivered late skips intermediate
+    outputs without losing any text. Requests with a new output are delivered in order of
+    priority class (lowest value first) and, within a class, in the order they became
+    ready, so every request is served once per round. A lower class waits at most for the
+    higher-class requests ready ahead of it, which the engine's step bounds.
+    """
+
+    def __init__(
+        self,
+        deliver: Callable[[Any], Awaitable[None]],
+        end: Callable[[str, Exception | None], None],
+    ):
+        # Called with each output to deliver, and with the ID of each request whose stream
+        # ended, after its last output was delivered, along with the error it raised if any
+        self.deliver = deliver
+        self.end = end
+        self.priority_by_id: dict[str, int] = {}
+        self.readers: dict[str, asyncio.Task] = {}
+        self.latest_by_id: dict[str, Any] = {}
+        # Requests whose stream ended, with the error it raised if any
+        self.ended: dict[str, Exception | None] = {}
+        # IDs of requests with something to deliver, by priority class
+        self.ready: dict[int, deque[str]] = {}
+        self.queued: set[str] = set()
+        self.has_ready = asyncio.Event()
+        self.task: asyncio.Task | None = None
+
+    def __len__(self) -> int:
+        return len(self.priority_by_id)
+
+    def add(self, request_id: str, stream: AsyncIterable, priority: int = 0):
+        """Start reading a request's output stream. Must be called on the serving loop."""
+        self.priority_by_id[request_id] = priority
+        self.readers[request_id] = asyncio.create_task(self._read(request_id, stream))
+        self._start()
+
+    def discard(self, request_id: str):
+        """Stop reading a request's outputs and drop any not yet delivered."""
+        self.priority_by_id.pop(request_id, None)
+        self.latest_by_id.pop(request_id, None)
+        self.ended.pop(request_id, None)
+        reader = self.readers.pop(request_id, None)
+        if reader is not None:
+            reader.cancel()
+
+    def _start(self):
+        if self.task is not None and not self.task.done():
+            return
+        if self.task is not None and not self.task.cancelled():
+            logger.error(
+                "Output scheduling stopped, restarting it",
+                exc_info=self.task.exception(),
+            )
+        self.task = asyncio.create_task(self._run())
+
+    async def _read(self, request_id: str, stream: AsyncIterable):
+        error = None
+        try:
+            async for output in stream:
+                self.latest_by_id[request_id] = output
+                self._mark_ready(request_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.exception(f"Reading the outputs of request {request_id} failed")
+            error = e
+        if request_id in self.priority_by_id:
+            self.readers.pop(request_id, None)
+            self.ended[request_id] = error
+            self._mark_ready(request_id)
+
+    def _mark_ready(self, request_id: str):
+        if request_id in self.queued:
+            return
+        self.queued.add(request_id)
+        self.ready.setdefault(self.priority_by_id[request_id], deque()).append(
+            request_id
+        )
+        self.has_ready.set()
+
+    def _next_ready(self) -> str | None:
+        if not self.ready:
+            return None
+        priority = min(self.ready)
+        ready = self.ready[priority]
+        request_id = ready.popleft()
+        if not ready:
+            del self.ready[priority]
+        self.queued.discard(request_id)
+        return request_id
+
+    async def _run(self):
+        while True:
+            await self.has_ready.wait()
+            self.has_ready.clear()
+
+            while (request_id := self._next_ready()) is not None:
+                if request_id not in self.priority_by_id:
+                    # Discarded while waiting to be delivered
+                    continue
+
+                output = self.latest_by_id.pop(request_id, None)
+                if output is not None:
+                    await self.deliver(output)
+
+                if request_id in self.ended and request_id not in self.latest_by_id:
+                    error = self.ended.pop(request_id)
+                    self.priority_by_id.pop(request_id, None)
+                    self.end(request_id, error)
+
+                # Let the readers of delivered requests send their deltas, and newly
+                # ready requests of a higher class go first
+                await asyncio.sleep(0)
@@ -0,0 +1,146 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+from prometheus_client import Gauge
+
+from leapfrogai_sdk.llm import GenerationChunk
+
+if TYPE_CHECKING:
+    from vllm.outputs import RequestOutput
+
+logger = logging.getLogger(__name__)
+
+REQUEST_STATES = Gauge(
+    "leapfrogai_backend_request_states",
+    "Requests whose state the backend is holding, from creation until they finish or are aborted.",
+    ["model"],
+)
+
+
+@dataclass
+class RequestState:
+    """What the backend tracks for one request while the engine generates it."""
+
+    request_id: str
+    # Deltas for the generate() call reading the request; None once finished, or the
+    # error it should raise
+    deltas: asyncio.Queue = field(default_factory=asyncio.Queue)
+    created: float = field(default_factory=time.monotonic)
+    last_activity: float = field(default_factory=time.monotonic)
+    # Length of the text and number of tokens already delivered
+    text_index: int = 0
+    num_tokens: int = 0
+
+
+class RequestRegistry:
+    """Holds the state of in-flight requests through their lifecycle.
+
+    A request is created when generate() or generate_full() is called, streams deltas as the engine produces
+    outputs, and leaves the registry when it finishes or is aborted. Requests without
+    any activity for `ttl` seconds, e.g. whose engine stream ended without a finished
+    output, are evicted so their state can't accumulate over the life of the server.
+    """
+
+    def __init__(self, ttl: float, model: str):
+        self.ttl = ttl
+        self.live = REQUEST_STATES.labels(model)
+        # Ordered from least to most recently active, so expired states are at the front
+        self.states: OrderedDict[str, RequestState] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def __contains__(self, request_id: str) -> bool:
+        return request_id in self.states
+
+    def create(self, request_id: str) -> RequestState:
+        state = RequestState(request_id)
+        self.states[request_id] = state
+        self.live.set(len(self.states))
+        return state
+
+    def stream(self, request_output: "RequestOutput"):
+        """Deliver the delta between this output and what the request has already received."""
+        state = self.states.get(request_output.request_id)
+        if state is None:
+            # Aborted or evicted while the engine still had outputs queued
+            return
+
+        self.touch(state.request_id)
+
+        output = request_output.outputs[0]
+
+        # Hold back text ending in a partial multi-byte character until it completes
+        if not request_output.finished and output.text and "\ufffd" == output.text[-1]:
+            return
+
+        text_delta = output.text[state.text_index :]
+        state.text_index = len(output.text)
+        num_tokens = len(output.token_ids)
+        token_delta = num_tokens - state.num_tokens
+        state.num_tokens = num_tokens
+
+        # Deliver the delta with the token counts the engine already has, so the SDK
+        # doesn't need to re-tokenize for usage
+        if text_delta or token_delta:
+            state.deltas.put_nowait(
+                GenerationChunk(
+                    text_delta, token_delta, len(request_output.prompt_token_ids)
+                )
+            )
+
+        if request_output.finished:
+            self.finish(state.request_id)
+
+    def touch(self, request_id: str):
+        """Record activity on a request, postponing its eviction."""
+        state = self.states.get(request_id)
+        if state is not None:
+            state.last_activity = time.monotonic()
+            self.states.move_to_end(request_id)
+
+    def finish(self, request_id: str):
+        """Signal the end of the request's deltas and drop its state."""
+        state = self._remove(request_id)
+        if state is None:
+            return
+        logger.info(
+            f"Generated {state.num_tokens} tokens in {time.monotonic() - state.created:.2f}s"
+        )
+        state.deltas.put_nowait(None)
+
+    def fail(self, request_id: str, error: Exception):
+        """Make the request's reader raise `error` and drop its state."""
+        state = self._remove(request_id)
+        if state is not None:
+            state.deltas.put_nowait(error)
+
+    def abort(self, request_id: str) -> bool:
+        """Drop the state of a request its reader stopped early; True if it was still live."""
+        return self._remove(request_id) is not None
+
+    def evict_expired(self) -> list[str]:
+        """Fail and drop requests without activity for `ttl` seconds, returning their IDs."""
+        expired_before = time.monotonic() - self.ttl
+        evicted = []
+        while self.states:
+            state = next(iter(self.states.values()))
+            if state.last_activity > expired_before:
+                break
+            self.fail(
+                state.request_id,
+                TimeoutError(
+                    f"Request {state.request_id} had no output for {self.ttl:g}s"
+                ),
+            )
+            evicted.append(state.request_id)
+        return evicted
+
+    def _remove(self, request_id: str) -> RequestState | None:
+        state = self.states.pop(request_id, None)
+        self.live.set(len(self.states))
+        return state
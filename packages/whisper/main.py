@@ -63,37 +63,37 @@ def make_whisper_request(filename, task, language, temperature, prompt):
 def call_whisper(
     request_iterator: Iterator[lfai.AudioRequest], task: str
 ) -> lfai.AudioResponse:
-    data = bytearray()
     prompt = ""
     temperature = 0.0
     # By default, automatically detect the language
     input_language = None
 
-    for request in request_iterator:
-        metadata = request.metadata
-        updated = False
-
-        if metadata.prompt:
-            logger.info(f"Updated metadata: Prompt='{prompt}'")
-            prompt = metadata.prompt
-            updated = True
-
-        if metadata.temperature:
-            logger.info(f"Updated metadata: Temperature={temperature}")
-            temperature = metadata.temperature
-            updated = True
-
-        if metadata.inputlanguage:
-            logger.info(f"Updated metadata: Input Language='{input_language}'")
-            input_language = metadata.inputlanguage
-            updated = True
-
-        # Metadata updates are done separate from data updates
-        if not updated:
-            data.extend(request.chunk_data)
-
     with tempfile.NamedTemporaryFile("wb") as f:
-        f.write(data)
+        for request in request_iterator:
+            metadata = request.metadata
+            updated = False
+
+            if metadata.prompt:
+                logger.info(f"Updated metadata: Prompt='{prompt}'")
+                prompt = metadata.prompt
+                updated = True
+
+            if metadata.temperature:
+                logger.info(f"Updated metadata: Temperature={temperature}")
+                temperature = metadata.temperature
+                updated = True
+
+            if metadata.inputlanguage:
+                logger.info(f"Updated metadata: Input Language='{input_language}'")
+                input_language = metadata.inputlanguage
+                updated = True
+
+            # Metadata updates are done separate from data updates. Chunks are written
+            # straight to disk rather than buffering the whole recording in memory.
+            if not updated:
+                f.write(request.chunk_data)
+
+        f.flush()
         result = make_whisper_request(f.name, task, input_language, temperature, prompt)
         text = str(result["text"])
 
@@ -0,0 +1,112 @@
+"""Registry of in-progress run generations, so runs can be cancelled while they generate."""
+
+import asyncio
+from typing import Any, AsyncGenerator, AsyncIterator, Awaitable, TypeVar
+
+T = TypeVar("T")
+
+
+class RunCancelledError(Exception):
+    """Raised in place of a run's result when the run was cancelled."""
+
+
+class _Failed:
+    """Passed on in place of a chunk when reading a run's stream ended with an error."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+# Passed on once a run's stream has ended
+_END = object()
+
+
+class ActiveRuns:
+    """Tracks the task generating each run in this API process.
+
+    Each run's generation runs in a task of its own for the run's whole lifetime, so
+    `cancel` can stop it at any point without cancelling the HTTP request that is waiting
+    on it. Cancelling the generation closes its backend stream, which in turn stops
+    generation on the model backend.
+    """
+
+    def __init__(self):
+        self.tasks: dict[str, asyncio.Task] = {}
+        self.cancelled: set[str] = set()
+
+    def cancel(self, run_id: str) -> bool:
+        """Cancel a run's generation; returns False if the run isn't generating here."""
+        task = self.tasks.get(run_id)
+        if task is None or task.done():
+            return False
+        self.cancelled.add(run_id)
+        task.cancel()
+        return True
+
+    async def run(self, run_id: str, generation: Awaitable[T]) -> T:
+        """Await a run's generation, raising RunCancelledError if the run is cancelled."""
+        task = asyncio.ensure_future(generation)
+        self.tasks[run_id] = task
+        try:
+            return await task
+        except asyncio.CancelledError:
+            # Only turn the cancellation into a result if it came from cancel(), not from
+            # the caller itself being cancelled (e.g. the client disconnecting)
+            current = asyncio.current_task()
+            if run_id in self.cancelled and not (current and current.cancelling()):
+                raise RunCancelledError(run_id) from None
+            raise
+        finally:
+            self._forget(run_id)
+
+    async def stream(
+        self, run_id: str, chunks: AsyncIterator[T]
+    ) -> AsyncGenerator[T, Any]:
+        """Yield a run's streamed generation, raising RunCancelledError if the run is cancelled.
+
+        The stream is read by one task that hands chunks over as they arrive, so the run
+        can also be cancelled while the caller is still handling the previous chunk.
+        """
+        handoff: asyncio.Queue = asyncio.Queue()
+        reader = asyncio.create_task(self._read(chunks, handoff))
+        self.tasks[run_id] = reader
+        try:
+            while True:
+                item = await handoff.get()
+                if run_id in self.cancelled:
+                    raise RunCancelledError(run_id)
+                if item is _END:
+                    return
+                if isinstance(item, _Failed):
+                    raise item.error
+                yield item
+        finally:
+            # Stop generating if the caller stopped reading, e.g. the client disconnected,
+            # and wait for the backend stream to be closed before returning
+            reader.cancel()
+            await asyncio.gather(reader, return_exceptions=True)
+            self._forget(run_id)
+
+    @staticmethod
+    async def _read(chunks: AsyncIterator[T], handoff: asyncio.Queue):
+        try:
+            async for chunk in chunks:
+                handoff.put_nowait(chunk)
+        except asyncio.CancelledError as e:
+            handoff.put_nowait(_Failed(e))
+            raise
+        except Exception as e:
+            handoff.put_nowait(_Failed(e))
+        else:
+            handoff.put_nowait(_END)
+
+    def _forget(self, run_id: str):
+        self.tasks.pop(run_id, None)
+        self.cancelled.discard(run_id)
+
+
+active_runs = ActiveRuns()
+
+
+def get_active_runs() -> ActiveRuns:
+    return active_runs
@@ -0,0 +1,166 @@
+"""Per-model admission control for requests sent to model backends."""
+
+import asyncio
+import logging
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, TypeVar
+
+from fastapi import HTTPException, status
+from fastapi.responses import StreamingResponse
+from prometheus_client import Counter, Gauge, Histogram
+from starlette.background import BackgroundTask
+
+from leapfrogai_api.backend.constants import (
+    ADMISSION_RETRY_AFTER_SECONDS,
+    DEFAULT_MAX_QUEUED_REQUESTS,
+)
+from leapfrogai_api.typedef.models import Model
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+IN_FLIGHT = Gauge(
+    "leapfrogai_api_backend_requests_in_flight",
+    "Requests currently being served by a model backend.",
+    ["model"],
+)
+QUEUE_DEPTH = Gauge(
+    "leapfrogai_api_backend_queue_depth",
+    "Requests waiting for a free slot on a model backend.",
+    ["model"],
+)
+QUEUE_WAIT = Histogram(
+    "leapfrogai_api_backend_queue_wait_seconds",
+    "Time requests spent waiting for a free slot on a model backend.",
+    ["model"],
+)
+REJECTED = Counter(
+    "leapfrogai_api_backend_requests_rejected_total",
+    "Requests rejected because a model backend's wait queue was full.",
+    ["model"],
+)
+
+
+class AdmissionTicket:
+    """A granted slot; releasing it more than once is a no-op."""
+
+    def __init__(self, controller: "AdmissionController"):
+        self.controller = controller
+        self.released = False
+
+    def release(self):
+        if self.released:
+            return
+        self.released = True
+        self.controller.release()
+
+
+class AdmissionController:
+    """Limits concurrent requests to one model and bounds how many may wait for a slot."""
+
+    def __init__(self, model_name: str, max_concurrent: int, max_queued: int):
+        self.model_name = model_name
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self.waiting = 0
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def acquire(self) -> AdmissionTicket:
+        """Wait for a slot, or raise a 429 if the wait queue is already full."""
+        if self.semaphore.locked() and self.waiting >= self.max_queued:
+            REJECTED.labels(self.model_name).inc()
+            logger.warning(f"Rejecting request to {self.model_name}: queue is full")
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail=f"Model {self.model_name} is at capacity. Please retry later.",
+                headers={"Retry-After": str(ADMISSION_RETRY_AFTER_SECONDS)},
+            )
+
+        self.waiting += 1
+        QUEUE_DEPTH.labels(self.model_name).inc()
+        start = time.monotonic()
+        try:
+            await self.semaphore.acquire()
+        finally:
+            self.waiting -= 1
+            QUEUE_DEPTH.labels(self.model_name).dec()
+            QUEUE_WAIT.labels(self.model_name).observe(time.monotonic() - start)
+
+        IN_FLIGHT.labels(self.model_name).inc()
+        return AdmissionTicket(self)
+
+    def release(self):
+        IN_FLIGHT.labels(self.model_name).dec()
+        self.semaphore.release()
+
+
+class AdmissionRegistry:
+    """Holds one controller per model, rebuilt when the model's limits change."""
+
+    def __init__(self):
+        self.controllers: dict[str, AdmissionController] = {}
+
+    def get(self, model: Model) -> AdmissionController | None:
+        if model.max_concurrent_requests is None:
+            return None
+
+        max_queued = (
+            DEFAULT_MAX_QUEUED_REQUESTS
+            if model.max_queued_requests is None
+            else model.max_queued_requests
+        )
+        controller = self.controllers.get(model.name)
+        if (
+            controller is None
+            or controller.max_concurrent != model.max_concurrent_requests
+            or controller.max_queued != max_queued
+        ):
+            # Requests holding a slot on a replaced controller release it there
+            controller = AdmissionController(
+                model.name, model.max_concurrent_requests, max_queued
+            )
+            self.controllers[model.name] = controller
+        return controller
+
+
+admission_registry = AdmissionRegistry()
+
+
+def get_admission_registry() -> AdmissionRegistry:
+    return admission_registry
+
+
+async def with_admission(model: Model, call: Callable[[], Awaitable[T]]) -> T:
+    """Await a backend call once the model has a free slot.
+
+    Streaming responses keep the slot until the stream has been fully sent.
+    """
+    controller = get_admission_registry().get(model)
+    if controller is None:
+        return await call()
+
+    ticket = await controller.acquire()
+    try:
+        response = await call()
+    except BaseException:
+        ticket.release()
+        raise
+
+    if isinstance(response, StreamingResponse):
+        response.body_iterator = _release_after(response.body_iterator, ticket)
+        # Also release from a background task in case the stream is never started
+        response.background = BackgroundTask(ticket.release)
+    else:
+        ticket.release()
+    return response
+
+
+async def _release_after(
+    body: AsyncIterator[Any], ticket: AdmissionTicket
+) -> AsyncIterator[Any]:
+    try:
+        async for chunk in body:
+            yield chunk
+    finally:
+        ticket.release()
@@ -1,4 +1,5 @@
 from __future__ import annotations
+import hashlib
 import time
 import uuid
 from typing import cast, AsyncGenerator, Any
@@ -14,6 +15,7 @@ from openai.types.beta.assistant_stream_event import (
     ThreadMessageCreated,
     ThreadMessageInProgress,
     ThreadMessageCompleted,
+    ThreadRunCancelled,
 )
 from openai.types.beta.thread import (
     ToolResources as BetaThreadToolResources,
@@ -26,6 +28,7 @@ from openai.types.beta.threads import (
 from pydantic import BaseModel
 from starlette.responses import StreamingResponse
 
+from leapfrogai_api.backend.active_runs import RunCancelledError, get_active_runs
 from leapfrogai_api.backend.converters import (
     from_assistant_stream_event_to_str,
     from_text_to_message,
@@ -71,6 +74,23 @@ class Composer(BaseModel):
                 detail="Failed to list messages",
             ) from exc
 
+    @staticmethod
+    def prompt_cache_key(thread_id: str, chat_messages: list[ChatMessage]) -> str:
+        """Key under which backends may cache the prompt prefix a thread's runs share.
+
+        Every run of a thread re-sends its instructions and history, so the key names the
+        thread rather than hashing the whole history, which changes every turn. The
+        leading system messages are hashed in so runs with different instructions, whose
+        prompts diverge from the very start, don't share a key.
+        """
+        instructions = hashlib.sha256()
+        for message in chat_messages:
+            if message.role != "system":
+                break
+            instructions.update(message.content_as_str().encode())
+            instructions.update(b"\0")
+        return f"{thread_id}:{instructions.hexdigest()[:16]}"
+
     async def create_chat_messages(
         self,
         request: RunCreateParamsRequest,
@@ -209,6 +229,7 @@ class Composer(BaseModel):
                 stream=request.stream,
                 stop=None,
                 max_tokens=request.max_completion_tokens,
+                prompt_cache_key=self.prompt_cache_key(thread.id, chat_messages),
             ),
             model_config=get_model_config(),
             session=session,
@@ -278,6 +299,7 @@ class Composer(BaseModel):
                     stream=request.stream,
                     stop=None,
                     max_tokens=request.max_completion_tokens,
+                    prompt_cache_key=self.prompt_cache_key(thread.id, chat_messages),
                 ),
                 model_config=get_model_config(),
             )
@@ -390,14 +412,42 @@ class Composer(BaseModel):
                 additional_instructions=request.additional_instructions,
             )
 
-            return StreamingResponse(stream, media_type="text/event-stream")
-        else:
-            await self.generate_message_for_thread(
-                request=request,
-                session=session,
-                thread=new_thread,
-                run_id=new_run.id,
-                additional_instructions=request.additional_instructions,
+            return StreamingResponse(
+                self._cancellable_stream(new_run, stream),
+                media_type="text/event-stream",
             )
+        else:
+            try:
+                await get_active_runs().run(
+                    new_run.id,
+                    self.generate_message_for_thread(
+                        request=request,
+                        session=session,
+                        thread=new_thread,
+                        run_id=new_run.id,
+                        additional_instructions=request.additional_instructions,
+                    ),
+                )
+            except RunCancelledError:
+                new_run.status = "cancelled"
+                new_run.cancelled_at = int(time.time())
 
             return new_run
+
+    @staticmethod
+    async def _cancellable_stream(
+        run: Run, stream: AsyncGenerator[str, Any]
+    ) -> AsyncGenerator[str, Any]:
+        """Relay a run's event stream, ending it with a cancelled event if the run is cancelled."""
+        try:
+            async for chunk in get_active_runs().stream(run.id, stream):
+                yield chunk
+        except RunCancelledError:
+            cancelled_run = run.model_copy(
+                update={"status": "cancelled", "cancelled_at": int(time.time())}
+            )
+            yield from_assistant_stream_event_to_str(
+                ThreadRunCancelled(data=cancelled_run, event="thread.run.cancelled")
+            )
+            yield "\n\n"
+            yield "event: done\ndata: [DONE]"
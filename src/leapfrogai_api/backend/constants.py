@@ -4,3 +4,23 @@ THIRTY_DAYS_SECONDS = 60 * 60 * 24 * 30  # in seconds
 TOP_K = 5  # Number of results to retrieve for RAG
 DEFAULT_MAX_COMPLETION_TOKENS = 4096
 DEFAULT_MAX_PROMPT_TOKENS = 4096
+EMBEDDINGS_BATCH_SIZE = 500  # Number of inputs sent to an embeddings backend per RPC
+EMBEDDINGS_MAX_CONCURRENT_BATCHES = 4  # Number of embeddings RPCs in flight per request
+DEFAULT_MAX_QUEUED_REQUESTS = (
+    100  # Requests allowed to wait for a model that has a concurrency limit
+)
+ADMISSION_RETRY_AFTER_SECONDS = 1  # Retry-After sent when a model's wait queue is full
+AUDIO_UPLOAD_CHUNK_SIZE = (
+    256 * 1024
+)  # Bytes of audio sent to a backend per gRPC message
+BACKEND_RPC_TIMEOUT_SECONDS = 600.0  # Deadline of idempotent RPCs, e.g. embeddings
+MIN_REQUEST_TIMEOUT_SECONDS = (
+    1.0  # Shortest X-Request-Timeout honoured; shorter ones are raised to it
+)
+RETRY_MAX_ATTEMPTS = (
+    3  # Attempts for idempotent backend RPCs (embeddings, token counts)
+)
+RETRY_BACKOFF_SECONDS = (
+    0.1  # Backoff before the first retry, doubled for each further retry
+)
+HEDGE_MIN_SAMPLES = 20  # Latency samples needed before hedged requests are sent
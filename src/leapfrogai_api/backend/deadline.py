@@ -0,0 +1,62 @@
+"""Deadlines that clients set on their requests and backend RPCs inherit."""
+
+import contextvars
+import math
+import time
+
+from leapfrogai_api.backend.constants import (
+    BACKEND_RPC_TIMEOUT_SECONDS,
+    MIN_REQUEST_TIMEOUT_SECONDS,
+)
+
+_request_deadline: contextvars.ContextVar[float | None] = contextvars.ContextVar(
+    "request_deadline", default=None
+)
+
+
+def parse_request_timeout(value: str | bytes) -> float:
+    """Parse a client's request timeout in seconds, raised to the shortest one honoured.
+
+    Raises ValueError unless the value is a finite, positive number.
+    """
+    timeout = float(value)
+    if not math.isfinite(timeout) or timeout <= 0:
+        raise ValueError(
+            f"Request timeout must be a positive number of seconds: {value!r}"
+        )
+    return max(timeout, MIN_REQUEST_TIMEOUT_SECONDS)
+
+
+def set_request_deadline(timeout: float | None):
+    """Give the current request, and the RPCs it makes, `timeout` seconds from now."""
+    set_deadline(None if timeout is None else time.monotonic() + timeout)
+
+
+def set_deadline(deadline: float | None):
+    """Bound the RPCs made from the current context by `deadline` on the monotonic clock."""
+    _request_deadline.set(deadline)
+
+
+def request_deadline() -> float | None:
+    """The current request's deadline on the monotonic clock, if the client set one."""
+    return _request_deadline.get()
+
+
+def rpc_timeout() -> float | None:
+    """Seconds a backend RPC may take: what is left of the request's deadline, if any.
+
+    Without a client deadline there is no limit, as generation streams and transcriptions
+    legitimately run for as long as their input needs.
+    """
+    deadline = _request_deadline.get()
+    if deadline is None:
+        return None
+    return max(deadline - time.monotonic(), 0.0)
+
+
+def idempotent_rpc_timeout() -> float:
+    """Seconds an idempotent unary RPC may take, so a hung backend can't hold it forever."""
+    timeout = rpc_timeout()
+    if timeout is None:
+        return BACKEND_RPC_TIMEOUT_SECONDS
+    return min(timeout, BACKEND_RPC_TIMEOUT_SECONDS)
@@ -0,0 +1,114 @@
+"""Pool of long-lived gRPC channels to model backends."""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+
+import grpc
+
+logger = logging.getLogger(__name__)
+
+# Channels watch the backend's gRPC health service, so calls to a backend that reports
+# NOT_SERVING (still loading, warming up or overloaded) fail fast with UNAVAILABLE rather
+# than queueing on it. Client-side health checking needs the round_robin policy.
+SERVICE_CONFIG = {
+    "loadBalancingConfig": [{"round_robin": {}}],
+    "healthCheckConfig": {"serviceName": ""},
+}
+
+# Pooled channels ping the backend while calls are in flight so dead connections are detected
+# quickly, and stay connected between calls so requests don't pay for a new TCP/HTTP2 handshake.
+CHANNEL_OPTIONS: list[tuple[str, int | str]] = [
+    ("grpc.keepalive_time_ms", int(os.getenv("LFAI_GRPC_KEEPALIVE_TIME_MS", 30000))),
+    (
+        "grpc.keepalive_timeout_ms",
+        int(os.getenv("LFAI_GRPC_KEEPALIVE_TIMEOUT_MS", 10000)),
+    ),
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.max_pings_without_data", 0),
+    ("grpc.service_config", json.dumps(SERVICE_CONFIG)),
+]
+
+CHANNEL_CLOSE_GRACE_SECONDS = 5.0
+
+
+class ChannelPool:
+    """Keeps one warm gRPC channel per backend address.
+
+    A single HTTP/2 channel multiplexes any number of concurrent calls, so every request
+    to the same backend shares it. Channels are bound to the event loop that created them;
+    a request arriving on a different loop gets a fresh channel and the old one is closed.
+    """
+
+    def __init__(self, options: list[tuple[str, int | str]] | None = None):
+        self.options = CHANNEL_OPTIONS if options is None else options
+        self._channels: dict[
+            str, tuple[grpc.aio.Channel, asyncio.AbstractEventLoop]
+        ] = {}
+        # Config hot-reloads run on the watchdog observer thread, so guard the mapping
+        self._lock = threading.Lock()
+
+    def get(self, backend: str) -> grpc.aio.Channel:
+        """Return the pooled channel for a backend address, creating it if needed."""
+        loop = asyncio.get_running_loop()
+
+        with self._lock:
+            stale = self._channels.get(backend)
+            if stale is not None and stale[1] is loop:
+                return stale[0]
+
+            channel = grpc.aio.insecure_channel(backend, options=self.options)
+            self._channels[backend] = (channel, loop)
+
+        if stale is not None:
+            self._close_later(*stale)
+
+        logger.debug(f"Opened gRPC channel to {backend}")
+        return channel
+
+    def discard(self, backend: str):
+        """Drop the channel for a backend address, e.g. after its model config changed.
+
+        Safe to call from any thread; the channel is closed on its own event loop.
+        """
+        with self._lock:
+            entry = self._channels.pop(backend, None)
+
+        if entry is not None:
+            logger.info(f"Closing gRPC channel to {backend}")
+            self._close_later(*entry)
+
+    async def close(self):
+        """Close every pooled channel, used on API shutdown."""
+        with self._lock:
+            entries = list(self._channels.values())
+            self._channels.clear()
+
+        loop = asyncio.get_running_loop()
+        for channel, channel_loop in entries:
+            if channel_loop is loop:
+                await channel.close(CHANNEL_CLOSE_GRACE_SECONDS)
+            else:
+                self._close_later(channel, channel_loop)
+
+    @staticmethod
+    def _close_later(channel: grpc.aio.Channel, loop: asyncio.AbstractEventLoop):
+        # In-flight calls get a grace period before being cancelled
+        if loop.is_closed():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(
+                channel.close(CHANNEL_CLOSE_GRACE_SECONDS), loop
+            )
+        except RuntimeError:
+            # The loop shut down between the check and the scheduling
+            pass
+
+
+channel_pool = ChannelPool()
+
+
+def get_channel_pool() -> ChannelPool:
+    return channel_pool
@@ -1,12 +1,27 @@
 """gRPC client for OpenAI models."""
 
+import asyncio
 import time
-from typing import Iterator, AsyncGenerator, Any, List
+from typing import AsyncIterator, Callable, AsyncGenerator, Any, List, Literal
 import grpc
 from fastapi.responses import StreamingResponse
 
 import leapfrogai_sdk as lfai
-from leapfrogai_api.backend.helpers import recv_chat, recv_completion
+from leapfrogai_api.backend.constants import (
+    EMBEDDINGS_BATCH_SIZE,
+    EMBEDDINGS_MAX_CONCURRENT_BATCHES,
+)
+from leapfrogai_api.backend.grpc_channels import get_channel_pool
+from leapfrogai_api.backend.helpers import (
+    decode_embeddings,
+    format_embedding,
+    recv_chat,
+    recv_completion,
+)
+from leapfrogai_api.backend.load_balancer import EndpointLease, get_load_balancer
+from leapfrogai_api.backend.deadline import rpc_timeout
+from leapfrogai_api.backend.resilience import call_idempotent
+from leapfrogai_api.backend.single_flight import content_key, get_single_flight
 from leapfrogai_sdk.chat.chat_pb2 import (
     ChatCompletionResponse as ProtobufChatCompletionResponse,
 )
@@ -35,124 +50,291 @@ from leapfrogai_api.typedef.counting import (
 )
 
 
+class LeasedStream:
+    """Responses from a stream, holding its endpoint lease until the stream ends.
+
+    If the consumer stops early, e.g. because the HTTP client disconnected, the call is
+    cancelled so the backend stops generating instead of running to completion. The lease
+    is released once the stream ends, is closed, or is dropped, even if it was never read.
+    """
+
+    def __init__(self, lease: EndpointLease, stream: grpc.aio.UnaryStreamCall):
+        self.lease = lease
+        self.stream = stream
+        self.responses = stream.__aiter__()
+
+    def __aiter__(self) -> "LeasedStream":
+        return self
+
+    async def __anext__(self) -> Any:
+        try:
+            return await self.responses.__anext__()
+        except StopAsyncIteration:
+            self.close()
+            raise
+        except BaseException as e:
+            self.close(e)
+            raise
+
+    async def aclose(self):
+        self.close()
+
+    def close(self, error: BaseException | None = None):
+        if not self.stream.done():
+            self.stream.cancel()
+        self.lease.release(error)
+
+    def __del__(self):
+        self.close()
+
+
+async def open_stream(
+    model: Model,
+    call: Callable[[grpc.aio.Channel, float | None], grpc.aio.UnaryStreamCall],
+    timeout: float | None,
+) -> LeasedStream:
+    """Start a server-streaming call on a routed endpoint once the backend has accepted it.
+
+    `call` receives the channel to use and `timeout`, the seconds the whole stream may
+    take or None for no limit.
+    """
+    lease = get_load_balancer().acquire(model)
+    try:
+        stream = call(get_channel_pool().get(lease.endpoint), timeout)
+        await stream.wait_for_connection()
+    except BaseException as e:
+        lease.release(e)
+        raise
+
+    return LeasedStream(lease, stream)
+
+
 async def stream_completion(model: Model, request: lfai.CompletionRequest):
     """Stream completion using the specified model."""
-    async with grpc.aio.insecure_channel(model.backend) as channel:
-        stub = lfai.CompletionStreamServiceStub(channel)
-        stream = stub.CompleteStream(request)
+    stream = await open_stream(
+        model,
+        lambda channel, timeout: lfai.CompletionStreamServiceStub(
+            channel
+        ).CompleteStream(request, timeout=timeout),
+        rpc_timeout(),
+    )
 
-        await stream.wait_for_connection()
-        return StreamingResponse(
-            recv_completion(stream, model.name), media_type="text/event-stream"
-        )
+    return StreamingResponse(
+        recv_completion(stream, model.name), media_type="text/event-stream"
+    )
 
 
 async def completion(model: Model, request: lfai.CompletionRequest):
     """Complete using the specified model."""
-    async with grpc.aio.insecure_channel(model.backend) as channel:
-        stub = lfai.CompletionServiceStub(channel)
-        response: lfai.CompletionResponse = await stub.Complete(request)
-        finish_reason_enum = FinishReason(response.choices[0].finish_reason)
-
-        return CompletionResponse(
-            id=None,
-            object="text_completion",
-            model=model.name,
-            created=int(time.time()),
-            choices=[
-                CompletionChoice(
-                    index=0,
-                    text=response.choices[0].text,
-                    finish_reason=finish_reason_enum.to_finish_reason(),
-                    logprobs=None,
-                )
-            ],
-            usage=Usage(
-                prompt_tokens=response.usage.prompt_tokens,
-                completion_tokens=response.usage.completion_tokens,
-                total_tokens=response.usage.total_tokens,
-            ),
+    async with get_load_balancer().endpoint(model) as backend:
+        stub = lfai.CompletionServiceStub(get_channel_pool().get(backend))
+        response: lfai.CompletionResponse = await stub.Complete(
+            request, timeout=rpc_timeout()
         )
+    finish_reason_enum = FinishReason(response.choices[0].finish_reason)
+
+    return CompletionResponse(
+        id=None,
+        object="text_completion",
+        model=model.name,
+        created=int(time.time()),
+        choices=[
+            CompletionChoice(
+                index=0,
+                text=response.choices[0].text,
+                finish_reason=finish_reason_enum.to_finish_reason(),
+                logprobs=None,
+            )
+        ],
+        usage=Usage(
+            prompt_tokens=response.usage.prompt_tokens,
+            completion_tokens=response.usage.completion_tokens,
+            total_tokens=response.usage.total_tokens,
+        ),
+    )
 
 
 async def stream_chat_completion(model: Model, request: lfai.ChatCompletionRequest):
     """Stream chat completion using the specified model."""
-    async with grpc.aio.insecure_channel(model.backend) as channel:
-        stub = lfai.ChatCompletionStreamServiceStub(channel)
-        stream = stub.ChatCompleteStream(request)
+    stream = await open_stream(
+        model,
+        lambda channel, timeout: lfai.ChatCompletionStreamServiceStub(
+            channel
+        ).ChatCompleteStream(request, timeout=timeout),
+        rpc_timeout(),
+    )
 
-        await stream.wait_for_connection()
-        return StreamingResponse(
-            recv_chat(stream, model.name), media_type="text/event-stream"
-        )
+    return StreamingResponse(
+        recv_chat(stream, model.name), media_type="text/event-stream"
+    )
 
 
 async def stream_chat_completion_raw(
     model: Model, request: lfai.ChatCompletionRequest
 ) -> AsyncGenerator[ProtobufChatCompletionResponse, Any]:
     """Stream chat completion using the specified model."""
-    async with grpc.aio.insecure_channel(model.backend) as channel:
-        stub = lfai.ChatCompletionStreamServiceStub(channel)
-        stream: grpc.aio.UnaryStreamCall[
-            lfai.ChatCompletionRequest, lfai.ChatCompletionResponse
-        ] = stub.ChatCompleteStream(request)
-
-        await stream.wait_for_connection()
-
-        async for response in stream:
-            yield response
+    stream = await open_stream(
+        model,
+        lambda channel, timeout: lfai.ChatCompletionStreamServiceStub(
+            channel
+        ).ChatCompleteStream(request, timeout=timeout),
+        rpc_timeout(),
+    )
+
+    async for response in stream:
+        yield response
+
+
+async def batch_chat_completion_raw(
+    model: Model,
+    requests: List[lfai.ChatCompletionRequest],
+    timeout: float | None = None,
+) -> AsyncGenerator[lfai.BatchChatCompletionResponse, Any]:
+    """Complete many chat requests in one call, yielding each result tagged by its index.
+
+    Results arrive in the order the backend finishes them, not in request order. Offline
+    batches can run far longer than any interactive request, so the call has no deadline
+    unless `timeout` seconds are given.
+    """
+    batch = lfai.BatchChatCompletionRequest(requests=requests)
+    stream = await open_stream(
+        model,
+        lambda channel, timeout: lfai.BatchChatCompletionServiceStub(
+            channel
+        ).BatchChatComplete(batch, timeout=timeout),
+        timeout,
+    )
+
+    async for response in stream:
+        yield response
+
+
+async def batch_completion_raw(
+    model: Model,
+    requests: List[lfai.CompletionRequest],
+    timeout: float | None = None,
+) -> AsyncGenerator[lfai.BatchCompletionResponse, Any]:
+    """Complete many prompts in one call, yielding each result tagged by its index.
+
+    Results arrive in the order the backend finishes them, not in request order. Offline
+    batches can run far longer than any interactive request, so the call has no deadline
+    unless `timeout` seconds are given.
+    """
+    batch = lfai.BatchCompletionRequest(requests=requests)
+    stream = await open_stream(
+        model,
+        lambda channel, timeout: lfai.BatchCompletionServiceStub(channel).BatchComplete(
+            batch, timeout=timeout
+        ),
+        timeout,
+    )
+
+    async for response in stream:
+        yield response
 
 
 # TODO: Clean up completion() and stream_completion() to reduce code duplication
 async def chat_completion(model: Model, request: lfai.ChatCompletionRequest):
     """Complete chat using the specified model."""
-    async with grpc.aio.insecure_channel(model.backend) as channel:
-        stub = lfai.ChatCompletionServiceStub(channel)
-        response: lfai.ChatCompletionResponse = await stub.ChatComplete(request)
-        finish_reason_enum = FinishReason(response.choices[0].finish_reason)
-
-        return ChatCompletionResponse(
-            model=model.name,
-            choices=[
-                ChatChoice(
-                    index=0,
-                    message=ChatMessage(
-                        role=lfai.ChatRole.Name(
-                            response.choices[0].chat_item.role
-                        ).lower(),
-                        content=response.choices[0].chat_item.content,
-                    ),
-                    finish_reason=finish_reason_enum.to_finish_reason(),
-                )
-            ],
-            usage=Usage(
-                prompt_tokens=response.usage.prompt_tokens,
-                completion_tokens=response.usage.completion_tokens,
-                total_tokens=response.usage.total_tokens,
-            ),
+    async with get_load_balancer().endpoint(model) as backend:
+        stub = lfai.ChatCompletionServiceStub(get_channel_pool().get(backend))
+        response: lfai.ChatCompletionResponse = await stub.ChatComplete(
+            request, timeout=rpc_timeout()
         )
-
-
-async def create_embeddings(model: Model, request: lfai.EmbeddingRequest):
-    """Create embeddings using the specified model."""
-    async with grpc.aio.insecure_channel(model.backend) as channel:
-        stub = lfai.EmbeddingsServiceStub(channel)
+    finish_reason_enum = FinishReason(response.choices[0].finish_reason)
+
+    return ChatCompletionResponse(
+        model=model.name,
+        choices=[
+            ChatChoice(
+                index=0,
+                message=ChatMessage(
+                    role=lfai.ChatRole.Name(response.choices[0].chat_item.role).lower(),
+                    content=response.choices[0].chat_item.content,
+                ),
+                finish_reason=finish_reason_enum.to_finish_reason(),
+            )
+        ],
+        usage=Usage(
+            prompt_tokens=response.usage.prompt_tokens,
+            completion_tokens=response.usage.completion_tokens,
+            total_tokens=response.usage.total_tokens,
+        ),
+    )
+
+
+async def stream_embeddings(
+    model: Model,
+    request: lfai.EmbeddingRequest,
+    batch_size: int = EMBEDDINGS_BATCH_SIZE,
+    max_concurrent_batches: int = EMBEDDINGS_MAX_CONCURRENT_BATCHES,
+    encoding_format: Literal["float", "base64"] = "float",
+) -> AsyncGenerator[List[EmbeddingResponseData], Any]:
+    """Create embeddings in batches, yielding each batch in input order as soon as it is ready.
+
+    Up to `max_concurrent_batches` RPCs are in flight at once, each routed to the least
+    loaded replica of the model and retried or hedged like any idempotent RPC. Every
+    embedding is indexed by its position in the full request rather than within its batch.
+    Backends are asked for packed float32 vectors unless the request names an encoding.
+    """
+    semaphore = asyncio.Semaphore(max_concurrent_batches)
+    encoding = request.encoding or lfai.EmbeddingEncoding.FLOAT32
+
+    async def embed_batch(start: int) -> List[EmbeddingResponseData]:
+        batch_request = lfai.EmbeddingRequest(
+            inputs=request.inputs[start : start + batch_size], encoding=encoding
+        )
+        # Each batch is routed on its own so batches spread across the model's replicas
+        async with semaphore:
+            e: lfai.EmbeddingResponse = await call_idempotent(
+                model,
+                "CreateEmbedding",
+                lambda backend, timeout: lfai.EmbeddingsServiceStub(
+                    get_channel_pool().get(backend)
+                ).CreateEmbedding(batch_request, timeout=timeout),
+            )
+
+        if not e or e.embeddings is None:
+            return []
+
+        return [
+            EmbeddingResponseData(
+                embedding=format_embedding(vector, encoding_format), index=start + i
+            )
+            for i, vector in enumerate(decode_embeddings(e))
+        ]
+
+    tasks = [
+        asyncio.create_task(embed_batch(start))
+        for start in range(0, len(request.inputs), batch_size)
+    ]
+    try:
+        for task in tasks:
+            yield await task
+    finally:
+        # Stop outstanding RPCs if a batch failed or the caller stopped consuming, and
+        # wait for them so their leases are released before returning
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def create_embeddings(
+    model: Model,
+    request: lfai.EmbeddingRequest,
+    encoding_format: Literal["float", "base64"] = "float",
+):
+    """Create embeddings using the specified model.
+
+    Identical requests in flight at the same time share a single set of backend RPCs.
+    """
+
+    async def embed() -> CreateEmbeddingResponse:
         embeddings: List[EmbeddingResponseData] = []
-
-        # Loop through inputs - 500 at a time
-        for i in range(0, len(request.inputs), 500):
-            request_embeddings = request.inputs[i : i + 500]
-
-            range_request = lfai.EmbeddingRequest(inputs=request_embeddings)
-            e: lfai.EmbeddingResponse = await stub.CreateEmbedding(range_request)
-            if e and e.embeddings is not None:
-                data = [
-                    EmbeddingResponseData(
-                        embedding=list(e.embeddings[i].embedding), index=i
-                    )
-                    for i in range(len(e.embeddings))
-                ]
-                embeddings.extend(data)
+        async for batch in stream_embeddings(
+            model, request, encoding_format=encoding_format
+        ):
+            embeddings.extend(batch)
 
         return CreateEmbeddingResponse(
             data=embeddings,
@@ -160,31 +342,54 @@ async def create_embeddings(model: Model, request: lfai.EmbeddingRequest):
             usage=Usage(prompt_tokens=0, total_tokens=0),
         )
 
+    return await get_single_flight().do(
+        model.name,
+        "CreateEmbedding",
+        content_key(list(request.inputs), request.encoding, encoding_format),
+        embed,
+    )
+
 
-async def create_transcription(model: Model, request: Iterator[lfai.AudioRequest]):
+async def create_transcription(model: Model, request: AsyncIterator[lfai.AudioRequest]):
     """Transcribe audio using the specified model."""
-    async with grpc.aio.insecure_channel(model.backend) as channel:
-        stub = lfai.AudioStub(channel)
-        response: lfai.AudioResponse = await stub.Transcribe(request)
+    async with get_load_balancer().endpoint(model) as backend:
+        stub = lfai.AudioStub(get_channel_pool().get(backend))
+        response: lfai.AudioResponse = await stub.Transcribe(
+            request, timeout=rpc_timeout()
+        )
 
-        return CreateTranscriptionResponse(text=response.text)
+    return CreateTranscriptionResponse(text=response.text)
 
 
-async def create_translation(model: Model, request: Iterator[lfai.AudioRequest]):
+async def create_translation(model: Model, request: AsyncIterator[lfai.AudioRequest]):
     """Translate audio using the specified model."""
-    async with grpc.aio.insecure_channel(model.backend) as channel:
-        stub = lfai.AudioStub(channel)
-        response: lfai.AudioResponse = await stub.Translate(request)
+    async with get_load_balancer().endpoint(model) as backend:
+        stub = lfai.AudioStub(get_channel_pool().get(backend))
+        response: lfai.AudioResponse = await stub.Translate(
+            request, timeout=rpc_timeout()
+        )
 
-        return CreateTranslationResponse(text=response.text)
+    return CreateTranslationResponse(text=response.text)
 
 
 async def create_token_count(model: Model, request: lfai.TokenCountRequest):
-    """Count tokens using the specified model backend."""
-    async with grpc.aio.insecure_channel(model.backend) as channel:
-        stub = lfai.TokenCountServiceStub(channel)
-        response: lfai.TokenCountResponse = await stub.CountTokens(request)
-
-        return TokenCountResponse(
-            token_count=response.count,
-        )
+    """Count tokens using the specified model backend.
+
+    Identical requests in flight at the same time share a single backend RPC.
+    """
+    response: lfai.TokenCountResponse = await get_single_flight().do(
+        model.name,
+        "CountTokens",
+        content_key(request.text),
+        lambda: call_idempotent(
+            model,
+            "CountTokens",
+            lambda backend, timeout: lfai.TokenCountServiceStub(
+                get_channel_pool().get(backend)
+            ).CountTokens(request, timeout=timeout),
+        ),
+    )
+
+    return TokenCountResponse(
+        token_count=response.count,
+    )
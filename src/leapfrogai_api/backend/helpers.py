@@ -1,93 +1,127 @@
 """Helper functions for the OpenAI backend."""
 
+import base64
+import json
 import time
 import uuid
-import grpc
-from typing import BinaryIO, Iterator, AsyncGenerator, Any
+from typing import AsyncIterator, AsyncGenerator, Any, Literal
+import numpy as np
+from fastapi import UploadFile
+from prometheus_client import Counter, Histogram
 import leapfrogai_sdk as lfai
-from leapfrogai_api.typedef.chat import (
-    ChatCompletionResponse,
-    ChatDelta,
-    ChatStreamChoice,
-)
-from leapfrogai_api.typedef.completion import (
-    CompletionChoice,
-    CompletionResponse,
-    FinishReason,
+from leapfrogai_api.backend.constants import AUDIO_UPLOAD_CHUNK_SIZE
+from leapfrogai_api.typedef.completion import FinishReason
+
+AUDIO_UPLOAD_BYTES = Counter(
+    "leapfrogai_api_audio_upload_bytes_total",
+    "Audio bytes streamed to model backends.",
+    ["model"],
 )
-from leapfrogai_api.typedef import (
-    Usage,
+AUDIO_UPLOAD_THROUGHPUT = Histogram(
+    "leapfrogai_api_audio_upload_throughput_bytes_per_second",
+    "Throughput of audio uploads streamed to model backends.",
+    ["model"],
+    buckets=(2**18, 2**20, 2**22, 2**24, 2**26, 2**28, 2**30),
 )
 
 
+try:
+    import orjson
+
+    def _dump_json_str(value: str | None) -> str:
+        return orjson.dumps(value).decode()
+
+except ImportError:  # orjson is an optional speedup
+
+    def _dump_json_str(value: str | None) -> str:
+        return json.dumps(value, ensure_ascii=False)
+
+
+class ChunkEncoder:
+    """Encodes streamed chunks as Server-Sent Event frames.
+
+    The id, created timestamp and model are fixed for the whole stream, so everything up to
+    the first per-chunk field is serialized once. Each chunk then only encodes its text,
+    finish reason and usage. The output is byte-identical to the pydantic response models'
+    `model_dump_json()`.
+    """
+
+    def __init__(
+        self, object_: str, model: str, content_prefix: str, content_suffix: str
+    ):
+        header = json.dumps(
+            {
+                "id": str(uuid.uuid4()),
+                "object": object_,
+                "created": int(time.time()),
+                "model": model,
+            },
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        self.prefix = "data: " + header[:-1] + content_prefix
+        self.suffix = content_suffix
+        self.finish_reasons: dict[int, str] = {}
+
+    def encode(self, text: str, finish_reason: int, usage: lfai.CompletionUsage) -> str:
+        encoded_finish_reason = self.finish_reasons.get(finish_reason)
+        if encoded_finish_reason is None:
+            encoded_finish_reason = _dump_json_str(
+                FinishReason(finish_reason).to_finish_reason()
+            )
+            self.finish_reasons[finish_reason] = encoded_finish_reason
+
+        return (
+            f"{self.prefix}{_dump_json_str(text)}{self.suffix}"
+            f'"finish_reason":{encoded_finish_reason}}}],'
+            f'"usage":{{"prompt_tokens":{usage.prompt_tokens},'
+            f'"completion_tokens":{usage.completion_tokens},'
+            f'"total_tokens":{usage.total_tokens}}}}}\n\n'
+        )
+
+
+def chat_chunk_encoder(model: str) -> ChunkEncoder:
+    """Encoder for `chat.completion.chunk` frames of a single stream."""
+    return ChunkEncoder(
+        "chat.completion.chunk",
+        model,
+        content_prefix=',"choices":[{"index":0,"delta":{"role":"assistant","content":',
+        content_suffix="},",
+    )
+
+
+def completion_chunk_encoder(model: str) -> ChunkEncoder:
+    """Encoder for `text_completion` frames of a single stream."""
+    return ChunkEncoder(
+        "text_completion",
+        model,
+        content_prefix=',"choices":[{"index":0,"text":',
+        content_suffix=',"logprobs":null,',
+    )
+
+
 async def recv_completion(
-    stream: grpc.aio.UnaryStreamCall[lfai.CompletionRequest, lfai.CompletionResponse],
+    stream: AsyncIterator[lfai.CompletionResponse],
     model: str,
 ):
+    """Generator that yields completion responses as Server-Sent Events."""
+    encoder = completion_chunk_encoder(model)
     async for c in stream:
-        finish_reason_enum = FinishReason(c.choices[0].finish_reason)
-
-        yield (
-            "data: "
-            + CompletionResponse(
-                id=str(uuid.uuid4()),
-                object="text_completion",
-                created=int(time.time()),
-                model=model,
-                choices=[
-                    CompletionChoice(
-                        index=0,
-                        text=c.choices[0].text,
-                        logprobs=None,
-                        finish_reason=finish_reason_enum.to_finish_reason(),
-                    )
-                ],
-                usage=Usage(
-                    prompt_tokens=c.usage.prompt_tokens,
-                    completion_tokens=c.usage.completion_tokens,
-                    total_tokens=c.usage.total_tokens,
-                ),
-            ).model_dump_json()
-        )
-        yield "\n\n"
+        yield encoder.encode(c.choices[0].text, c.choices[0].finish_reason, c.usage)
 
     yield "data: [DONE]"
 
 
 async def recv_chat(
-    stream: grpc.aio.UnaryStreamCall[
-        lfai.ChatCompletionRequest, lfai.ChatCompletionResponse
-    ],
+    stream: AsyncIterator[lfai.ChatCompletionResponse],
     model: str,
 ) -> AsyncGenerator[str, Any]:
     """Generator that yields chat completion responses as Server-Sent Events."""
+    encoder = chat_chunk_encoder(model)
     async for c in stream:
-        finish_reason_enum = FinishReason(c.choices[0].finish_reason)
-
-        yield (
-            "data: "
-            + ChatCompletionResponse(
-                id=str(uuid.uuid4()),
-                object="chat.completion.chunk",
-                created=int(time.time()),
-                model=model,
-                choices=[
-                    ChatStreamChoice(
-                        index=0,
-                        delta=ChatDelta(
-                            role="assistant", content=c.choices[0].chat_item.content
-                        ),
-                        finish_reason=finish_reason_enum.to_finish_reason(),
-                    )
-                ],
-                usage=Usage(
-                    prompt_tokens=c.usage.prompt_tokens,
-                    completion_tokens=c.usage.completion_tokens,
-                    total_tokens=c.usage.total_tokens,
-                ),
-            ).model_dump_json()
+        yield encoder.encode(
+            c.choices[0].chat_item.content, c.choices[0].finish_reason, c.usage
         )
-        yield "\n\n"
 
     yield "data: [DONE]\n\n"
 
@@ -107,15 +141,38 @@ def grpc_chat_role(role: str) -> lfai.ChatRole:
             return None
 
 
-# read_chunks is a helper method that chunks the bytes of a file (audio file) into a iterator of AudioRequests
-def read_chunks(file: BinaryIO, chunk_size: int) -> Iterator[lfai.AudioRequest]:
-    """Reads a file in chunks and yields AudioRequests."""
-    while True:
-        chunk = file.read(chunk_size)
-        if not chunk:
-            break
+def grpc_priority(service_tier: str | None) -> int:
+    """Converts an OpenAI service tier to the scheduling priority of a backend request."""
+    # Flex processing accepts slower responses, like batch evals; everything else is
+    # interactive
+    return 1 if service_tier == "flex" else 0
+
+
+async def stream_audio_request(
+    metadata: lfai.AudioMetadata,
+    file: UploadFile,
+    model: str,
+    chunk_size: int = AUDIO_UPLOAD_CHUNK_SIZE,
+) -> AsyncGenerator[lfai.AudioRequest, Any]:
+    """Yields the audio metadata followed by the file's bytes as AudioRequests.
+
+    The file is read asynchronously in large chunks so uploads don't block the event loop
+    or split a recording into tens of thousands of tiny messages. Each read is handed to
+    the protobuf message as-is, without an intermediate buffer.
+    """
+    yield lfai.AudioRequest(metadata=metadata)
+
+    uploaded = 0
+    start = time.monotonic()
+    while chunk := await file.read(chunk_size):
+        uploaded += len(chunk)
         yield lfai.AudioRequest(chunk_data=chunk)
 
+    elapsed = time.monotonic() - start
+    AUDIO_UPLOAD_BYTES.labels(model).inc(uploaded)
+    if elapsed > 0:
+        AUDIO_UPLOAD_THROUGHPUT.labels(model).observe(uploaded / elapsed)
+
 
 # helper function used to modify objects unless certain fields are missing
 def object_or_default(obj: Any | None, _default: Any) -> Any:
@@ -124,3 +181,38 @@ def object_or_default(obj: Any | None, _default: Any) -> Any:
         return obj
     else:
         return _default
+
+
+# numpy dtypes of the packed embedding encodings, all little-endian
+PACKED_EMBEDDING_DTYPES = {
+    lfai.EmbeddingEncoding.FLOAT32: np.dtype("<f4"),
+    lfai.EmbeddingEncoding.FLOAT16: np.dtype("<f2"),
+}
+
+
+def decode_embeddings(response: lfai.EmbeddingResponse) -> list[np.ndarray]:
+    """Decode the vectors of an EmbeddingResponse into float32 arrays.
+
+    Packed vectors are read straight from the message bytes with `np.frombuffer`, so no
+    Python float is created per value. Responses from backends that don't support packed
+    encodings carry repeated floats and are converted from those.
+    """
+    dtype = PACKED_EMBEDDING_DTYPES.get(response.encoding)
+    if dtype is None:
+        return [
+            np.array(embedding.embedding, dtype=np.float32)
+            for embedding in response.embeddings
+        ]
+    return [
+        np.frombuffer(embedding.packed, dtype=dtype).astype(np.float32, copy=False)
+        for embedding in response.embeddings
+    ]
+
+
+def format_embedding(
+    vector: np.ndarray, encoding_format: Literal["float", "base64"] = "float"
+) -> list[float] | str:
+    """Format a vector as OpenAI does: a list of floats, or base64 of its float32 bytes."""
+    if encoding_format == "base64":
+        return base64.b64encode(vector.astype("<f4", copy=False).tobytes()).decode()
+    return vector.tolist()
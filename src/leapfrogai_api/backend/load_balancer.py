@@ -0,0 +1,211 @@
+"""Request-level load balancing and circuit breaking across the backend replicas of a model."""
+
+import asyncio
+import logging
+import random
+import time
+from contextlib import asynccontextmanager
+from enum import Enum
+from typing import AsyncGenerator, Any, Collection
+
+import grpc
+from fastapi import HTTPException, status
+from prometheus_client import Counter, Gauge
+
+from leapfrogai_api.typedef.models import Model
+
+logger = logging.getLogger(__name__)
+
+# Status codes that indicate the endpoint itself is unhealthy rather than the request being bad
+ENDPOINT_FAILURE_CODES = (grpc.StatusCode.UNAVAILABLE,)
+# Details of the UNAVAILABLE a channel fails calls with while its backend's health checks
+# report NOT_SERVING (loading, warming up or overloaded), unlike an unreachable backend
+HEALTH_GATED_DETAILS = "backend unhealthy"
+MAX_CONSECUTIVE_FAILURES = 3  # Failures in a row before an endpoint's circuit opens
+EJECTION_SECONDS = 30.0  # Time an open circuit rejects requests before probing again
+
+CIRCUIT_TRIPS = Counter(
+    "leapfrogai_api_backend_circuit_breaker_trips_total",
+    "Times a backend endpoint's circuit breaker opened after repeated failures.",
+    ["endpoint"],
+)
+CIRCUIT_OPEN = Gauge(
+    "leapfrogai_api_backend_circuit_breaker_open",
+    "Whether a backend endpoint's circuit breaker is currently open (1) or not (0).",
+    ["endpoint"],
+)
+
+
+class CircuitState(Enum):
+    CLOSED = "closed"  # Requests flow normally
+    OPEN = "open"  # Requests are not sent to the endpoint
+    HALF_OPEN = "half_open"  # A single probe request decides whether to close again
+
+
+class EndpointStats:
+    """Load and circuit breaker bookkeeping for a single backend endpoint."""
+
+    def __init__(self):
+        self.in_flight: int = 0
+        self.consecutive_failures: int = 0
+        self.state: CircuitState = CircuitState.CLOSED
+        self.ejected_until: float = 0.0
+
+    def allows_requests(self, now: float) -> bool:
+        if self.state == CircuitState.OPEN and self.ejected_until <= now:
+            # The cool-down is over, let one probe request through
+            self.state = CircuitState.HALF_OPEN
+            return True
+        if self.state == CircuitState.HALF_OPEN:
+            return self.in_flight == 0
+        return self.state == CircuitState.CLOSED
+
+
+class EndpointLease:
+    """A slot on an endpoint held for the lifetime of one request.
+
+    Releasing is idempotent so streaming responses can release from both their
+    error path and their cleanup path.
+    """
+
+    def __init__(self, balancer: "LoadBalancer", endpoint: str):
+        self.balancer = balancer
+        self.endpoint = endpoint
+        self.released = False
+
+    def release(self, error: BaseException | None = None):
+        if self.released:
+            return
+        self.released = True
+        self.balancer.report(self.endpoint, error)
+
+
+class LoadBalancer:
+    """Routes each request to the least-loaded of two randomly sampled endpoints.
+
+    Every endpoint has a circuit breaker: after repeated failures it stops receiving
+    requests for a while, then a single probe request decides whether it recovered.
+    Requests to a model whose endpoints are all open fail fast with a 503.
+    """
+
+    def __init__(
+        self,
+        max_consecutive_failures: int = MAX_CONSECUTIVE_FAILURES,
+        ejection_seconds: float = EJECTION_SECONDS,
+    ):
+        self.max_consecutive_failures = max_consecutive_failures
+        self.ejection_seconds = ejection_seconds
+        self.stats: dict[str, EndpointStats] = {}
+
+    def pick(self, model: Model, exclude: Collection[str] = ()) -> str:
+        """Choose an endpoint for the next request to the given model.
+
+        Endpoints in `exclude` (e.g. the one a hedged request is already waiting on) are
+        only used if no other endpoint is available.
+        """
+        now = time.monotonic()
+        available = [
+            endpoint
+            for endpoint in model.backends
+            if self._stats(endpoint).allows_requests(now)
+        ]
+        if not available:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Model {model.name} is temporarily unavailable. Please retry later.",
+                headers={"Retry-After": str(int(self.ejection_seconds))},
+            )
+
+        candidates = [
+            endpoint for endpoint in available if endpoint not in exclude
+        ] or available
+        if len(candidates) == 1:
+            return candidates[0]
+
+        first, second = random.sample(candidates, 2)
+        if self._stats(second).in_flight < self._stats(first).in_flight:
+            return second
+        return first
+
+    def acquire(self, model: Model, exclude: Collection[str] = ()) -> EndpointLease:
+        """Pick an endpoint and count the request against it until the lease is released."""
+        endpoint = self.pick(model, exclude)
+        self._stats(endpoint).in_flight += 1
+        return EndpointLease(self, endpoint)
+
+    @asynccontextmanager
+    async def endpoint(
+        self, model: Model, exclude: Collection[str] = ()
+    ) -> AsyncGenerator[str, Any]:
+        """Hold an endpoint for the duration of the block, reporting any failure."""
+        lease = self.acquire(model, exclude)
+        try:
+            yield lease.endpoint
+        except BaseException as e:
+            lease.release(e)
+            raise
+        finally:
+            lease.release()
+
+    def report(self, endpoint: str, error: BaseException | None = None):
+        """Record the outcome of a request and trip the circuit if the endpoint keeps failing."""
+        stats = self._stats(endpoint)
+        stats.in_flight = max(stats.in_flight - 1, 0)
+
+        if _says_nothing_about_health(error):
+            if stats.state == CircuitState.HALF_OPEN:
+                stats.state = CircuitState.OPEN
+            return
+
+        if not (
+            isinstance(error, grpc.aio.AioRpcError)
+            and error.code() in ENDPOINT_FAILURE_CODES
+        ):
+            stats.consecutive_failures = 0
+            if stats.state != CircuitState.CLOSED:
+                logger.info(f"Backend endpoint {endpoint} recovered")
+                stats.state = CircuitState.CLOSED
+                CIRCUIT_OPEN.labels(endpoint).set(0)
+            return
+
+        stats.consecutive_failures += 1
+        if (
+            stats.state == CircuitState.HALF_OPEN
+            or stats.consecutive_failures >= self.max_consecutive_failures
+        ):
+            stats.state = CircuitState.OPEN
+            stats.ejected_until = time.monotonic() + self.ejection_seconds
+            stats.consecutive_failures = 0
+            CIRCUIT_TRIPS.labels(endpoint).inc()
+            CIRCUIT_OPEN.labels(endpoint).set(1)
+            logger.warning(
+                f"Opened circuit for backend endpoint {endpoint} for {self.ejection_seconds}s after repeated failures"
+            )
+
+    def _stats(self, endpoint: str) -> EndpointStats:
+        stats = self.stats.get(endpoint)
+        if stats is None:
+            stats = self.stats[endpoint] = EndpointStats()
+        return stats
+
+
+def _says_nothing_about_health(error: BaseException | None) -> bool:
+    # Cancelled requests (e.g. the losing half of a hedge), requests that ran out of the
+    # time the client or the API gave them, e.g. behind a long queue, and requests refused
+    # by a backend that reported itself busy don't show whether the endpoint is healthy
+    if isinstance(error, asyncio.CancelledError):
+        return True
+    if not isinstance(error, grpc.aio.AioRpcError):
+        return False
+    if error.code() == grpc.StatusCode.DEADLINE_EXCEEDED:
+        return True
+    return error.code() == grpc.StatusCode.UNAVAILABLE and HEALTH_GATED_DETAILS in (
+        error.details() or ""
+    )
+
+
+load_balancer = LoadBalancer()
+
+
+def get_load_balancer() -> LoadBalancer:
+    return load_balancer
@@ -3,6 +3,7 @@
 import logging
 import tempfile
 import time
+from typing import Any, AsyncGenerator
 from fastapi import HTTPException, UploadFile, status, BackgroundTasks
 from langchain_core.documents import Document
 from langchain_core.embeddings import Embeddings
@@ -371,31 +372,44 @@ class IndexingService:
             Any exceptions that may occur during the execution of the method.
         """
         ids = []
-        embeddings = await self.embeddings.aembed_documents(
-            texts=[document.page_content for document in documents]
-        )
-
-        vectors: list[Vector] = []
-        for document, embedding in zip(documents, embeddings):
-            vector = Vector(
-                id="",
-                vector_store_id=vector_store_id,
-                file_id=file_id,
-                content=document.page_content,
-                metadata=document.metadata,
-                embedding=embedding,
-            )
-            vectors.append(vector)
-
+        texts = [document.page_content for document in documents]
         crud_vector_content = CRUDVectorContent(db=self.db)
 
-        for i in range(0, len(vectors), batch_size):
-            batch = vectors[i : i + batch_size]
+        # Write each batch of vectors as soon as it is embedded instead of waiting for the whole file
+        offset = 0
+        async for embeddings in self._aembed_documents_in_batches(texts):
+            vectors: list[Vector] = []
+            for document, embedding in zip(
+                documents[offset : offset + len(embeddings)], embeddings
+            ):
+                vector = Vector(
+                    id="",
+                    vector_store_id=vector_store_id,
+                    file_id=file_id,
+                    content=document.page_content,
+                    metadata=document.metadata,
+                    embedding=embedding,
+                )
+                vectors.append(vector)
+            offset += len(embeddings)
 
-            response = await crud_vector_content.add_vectors(batch)
-            ids.extend([item.id for item in response])
+            for i in range(0, len(vectors), batch_size):
+                batch = vectors[i : i + batch_size]
+
+                response = await crud_vector_content.add_vectors(batch)
+                ids.extend([item.id for item in response])
         return ids
 
+    async def _aembed_documents_in_batches(
+        self, texts: list[str]
+    ) -> AsyncGenerator[list[list[float]], Any]:
+        """Yields embeddings for the given texts in input order, batch by batch when supported."""
+        if isinstance(self.embeddings, LeapfrogAIEmbeddings):
+            async for embeddings in self.embeddings.astream_embed_documents(texts):
+                yield embeddings
+        else:
+            yield await self.embeddings.aembed_documents(texts=texts)
+
     async def _increment_vector_store_file_status(
         self, vector_store: VectorStore, file_response: VectorStoreFile
     ):
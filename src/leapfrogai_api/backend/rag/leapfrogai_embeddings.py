@@ -1,9 +1,10 @@
 """LeapfrogAI Embeddings via Langchain Embeddings Interface."""
 
 import os
+from typing import Any, AsyncGenerator
 import leapfrogai_sdk as lfai
 from leapfrogai_api.utils import get_model_config
-from leapfrogai_api.backend.grpc_client import create_embeddings
+from leapfrogai_api.backend.grpc_client import create_embeddings, stream_embeddings
 import logging
 
 logger = logging.getLogger(__name__)
@@ -33,6 +34,25 @@ class LeapfrogAIEmbeddings:
 
         return list_of_embeddings
 
+    async def astream_embed_documents(
+        self, texts: list[str]
+    ) -> AsyncGenerator[list[list[float]], Any]:
+        """Asynchronously embeds a list of documents, yielding the vectors batch by batch.
+
+        Batches are embedded concurrently but yielded in input order, so callers can start
+        processing the first vectors before the whole list has been embedded.
+
+        Args:
+            texts (list[str]): The list of documents to be embedded.
+
+        Yields:
+            list[list[float]]: The embedding vectors for the next batch of documents.
+        """
+        model = await self._get_model()
+        request = lfai.EmbeddingRequest(inputs=texts)
+        async for batch in stream_embeddings(model=model, request=request):
+            yield [data.embedding for data in batch]
+
     async def aembed_query(self, text: str) -> list[float]:
         """Asynchronously embeds a query text.
 
@@ -0,0 +1,177 @@
+"""Deadlines, retries and hedged requests for backend RPCs."""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, TypeVar
+
+import grpc
+from prometheus_client import Counter
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from leapfrogai_api.backend.constants import (
+    HEDGE_MIN_SAMPLES,
+    RETRY_BACKOFF_SECONDS,
+    RETRY_MAX_ATTEMPTS,
+)
+from leapfrogai_api.backend.deadline import (
+    idempotent_rpc_timeout,
+    parse_request_timeout,
+    set_request_deadline,
+)
+from leapfrogai_api.backend.load_balancer import get_load_balancer
+from leapfrogai_api.typedef.models import Model
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Clients may bound how long the API spends on their request, e.g. `X-Request-Timeout: 30`
+REQUEST_TIMEOUT_HEADER = b"x-request-timeout"
+
+# Status codes after which an idempotent RPC is worth sending again
+RETRYABLE_CODES = (
+    grpc.StatusCode.UNAVAILABLE,
+    grpc.StatusCode.RESOURCE_EXHAUSTED,
+)
+# ...except the RESOURCE_EXHAUSTED of a message over gRPC's size limit, which fails the
+# same way however often it's sent
+MESSAGE_TOO_LARGE_DETAILS = "larger than max"
+
+RETRIES = Counter(
+    "leapfrogai_api_backend_retries_total",
+    "Idempotent backend RPCs that were retried after a transient failure.",
+    ["model", "method"],
+)
+HEDGES = Counter(
+    "leapfrogai_api_backend_hedged_requests_total",
+    "Idempotent backend RPCs for which a hedged request was sent to a second replica.",
+    ["model", "method"],
+)
+
+
+class RequestDeadlineMiddleware:
+    """Records the deadline of each HTTP request so backend RPCs inherit it.
+
+    Timeouts that aren't a finite, positive number of seconds are rejected with a 400, so
+    a client can't send RPCs that are bound to time out.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http":
+            header = dict(scope["headers"]).get(REQUEST_TIMEOUT_HEADER)
+            try:
+                timeout = parse_request_timeout(header) if header else None
+            except ValueError:
+                response = JSONResponse(
+                    {
+                        "detail": "X-Request-Timeout must be a positive number of seconds"
+                    },
+                    status_code=400,
+                )
+                await response(scope, receive, send)
+                return
+            set_request_deadline(timeout)
+
+        await self.app(scope, receive, send)
+
+
+class LatencyTracker:
+    """Rolling window of recent latencies used to decide when to hedge."""
+
+    def __init__(self, size: int = 200):
+        self.samples: deque[float] = deque(maxlen=size)
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+
+    def p95(self) -> float | None:
+        if len(self.samples) < HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[int(len(ordered) * 0.95) - 1]
+
+
+_latencies: dict[tuple[str, str], LatencyTracker] = {}
+
+
+async def call_idempotent(
+    model: Model,
+    method: str,
+    invoke: Callable[[str, float], Awaitable[T]],
+    hedge: bool = True,
+) -> T:
+    """Call an idempotent RPC with retries and, for replicated models, hedging.
+
+    `invoke` receives the endpoint to call and the timeout to use. Transient failures are
+    retried with exponential backoff on another replica while the request's deadline
+    allows. If a call runs longer than the model's recent p95 latency for this method, a
+    second copy is sent to a different replica and whichever answers first wins.
+    """
+    latency = _latencies.setdefault((model.name, method), LatencyTracker())
+
+    async def attempt(exclude: set[str]) -> T:
+        async with get_load_balancer().endpoint(model, exclude) as endpoint:
+            exclude.add(endpoint)
+            start = time.monotonic()
+            result = await invoke(endpoint, idempotent_rpc_timeout())
+            latency.record(time.monotonic() - start)
+            return result
+
+    async def hedged(tried: set[str]) -> T:
+        primary = asyncio.create_task(attempt(tried))
+        tasks = {primary}
+        try:
+            delay = latency.p95()
+            if not hedge or delay is None or len(model.backends) < 2:
+                return await primary
+
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                HEDGES.labels(model.name, method).inc()
+                tasks.add(asyncio.create_task(attempt(tried)))
+
+            while True:
+                done, tasks = await asyncio.wait(
+                    tasks, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    # Prefer a successful answer; only fail once every copy has failed
+                    if task.exception() is None or not tasks:
+                        return task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    # Endpoints already tried are avoided by hedges and retries when another replica exists
+    tried: set[str] = set()
+    attempt_number = 1
+    while True:
+        try:
+            return await hedged(tried)
+        except grpc.aio.AioRpcError as e:
+            backoff = RETRY_BACKOFF_SECONDS * 2 ** (attempt_number - 1)
+            if (
+                not _retryable(e)
+                or attempt_number >= RETRY_MAX_ATTEMPTS
+                or idempotent_rpc_timeout() <= backoff
+            ):
+                raise
+
+            logger.warning(
+                f"Retrying {method} for {model.name} after {e.code().name} (attempt {attempt_number})"
+            )
+            RETRIES.labels(model.name, method).inc()
+            await asyncio.sleep(backoff)
+            attempt_number += 1
+
+
+def _retryable(error: grpc.aio.AioRpcError) -> bool:
+    return error.code() in RETRYABLE_CODES and MESSAGE_TOO_LARGE_DETAILS not in (
+        error.details() or ""
+    )
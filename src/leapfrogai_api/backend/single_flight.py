@@ -0,0 +1,109 @@
+"""Coalescing of identical concurrent backend calls into a single RPC."""
+
+import asyncio
+import contextvars
+import hashlib
+from typing import Any, Callable, Coroutine, Hashable, TypeVar
+
+from prometheus_client import Counter
+
+from leapfrogai_api.backend.deadline import request_deadline, set_deadline
+
+T = TypeVar("T")
+
+COALESCED_HITS = Counter(
+    "leapfrogai_api_backend_coalesced_hits_total",
+    "Backend calls that joined an identical call already in flight instead of sending an RPC.",
+    ["model", "method"],
+)
+COALESCED_MISSES = Counter(
+    "leapfrogai_api_backend_coalesced_misses_total",
+    "Backend calls that found no identical call in flight and sent their own RPC.",
+    ["model", "method"],
+)
+
+
+def content_key(*parts: Any) -> str:
+    """Hash request content into a compact key, so large inputs aren't kept as dict keys."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(repr(part).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class _Flight:
+    def __init__(self, deadline: float | None):
+        # The shared call runs in a context of its own rather than the first caller's, so
+        # its RPCs are bounded by the latest deadline of everyone waiting for it
+        self.context = contextvars.Context()
+        self.deadline = deadline
+        self.context.run(set_deadline, deadline)
+        self.task: asyncio.Task | None = None
+        self.waiters = 0
+
+    def join(self, deadline: float | None):
+        self.waiters += 1
+        if (
+            self.deadline is not None
+            and deadline is not None
+            and deadline > self.deadline
+        ):
+            self.deadline = deadline
+            self.context.run(set_deadline, deadline)
+
+
+class SingleFlight:
+    """Shares the result of one in-flight call among every caller asking for the same key.
+
+    Only calls that overlap in time are coalesced; nothing is cached once a call finishes.
+    A caller that is cancelled stops waiting without affecting the others, and the shared
+    call is only cancelled once nobody is waiting for it any more.
+
+    Callers whose request has a deadline only share calls with each other, and the shared
+    call's RPCs get the latest of their deadlines; callers without one share calls bounded
+    by the backend's default timeout.
+    """
+
+    def __init__(self):
+        self.flights: dict[Hashable, _Flight] = {}
+
+    async def do(
+        self,
+        model: str,
+        method: str,
+        key: Hashable,
+        call: Callable[[], Coroutine[Any, Any, T]],
+    ) -> T:
+        deadline = request_deadline()
+        flight_key = (model, method, key, deadline is not None)
+        flight = self.flights.get(flight_key)
+        if flight is None:
+            COALESCED_MISSES.labels(model, method).inc()
+            flight = _Flight(deadline)
+            flight.task = asyncio.create_task(call(), context=flight.context)
+            self.flights[flight_key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(flight_key, flight))
+        else:
+            COALESCED_HITS.labels(model, method).inc()
+
+        flight.join(deadline)
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                self._forget(flight_key, flight)
+                flight.task.cancel()
+
+    def _forget(self, flight_key: Hashable, flight: _Flight):
+        # A later flight may already have replaced a cancelled one under the same key
+        if self.flights.get(flight_key) is flight:
+            del self.flights[flight_key]
+
+
+single_flight = SingleFlight()
+
+
+def get_single_flight() -> SingleFlight:
+    return single_flight
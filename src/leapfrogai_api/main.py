@@ -9,6 +9,8 @@ from fastapi import FastAPI
 from fastapi.exception_handlers import request_validation_exception_handler
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import RedirectResponse
+from leapfrogai_api.backend.grpc_channels import get_channel_pool
+from leapfrogai_api.backend.resilience import RequestDeadlineMiddleware
 from leapfrogai_api.routers.base import router as base_router
 from leapfrogai_api.routers.leapfrogai import auth
 from leapfrogai_api.routers.leapfrogai import models as lfai_models
@@ -51,16 +53,20 @@ async def lifespan(app: FastAPI):
         yield
     finally:
         # Shutdown
-        logger.info("Stopping config watcher and clearing model configs.")
+        logger.info(
+            "Stopping config watcher, clearing model configs and closing backend channels."
+        )
         config_task.cancel()
         try:
             await config_task
         except asyncio.CancelledError:
             pass  # Task was cancelled, which is expected during shutdown
         await config.clear_all_models()
+        await get_channel_pool().close()
 
 
 app = FastAPI(lifespan=lifespan)
+app.add_middleware(RequestDeadlineMiddleware)
 
 
 @app.get("/", include_in_schema=False)
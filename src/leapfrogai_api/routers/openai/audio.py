@@ -1,11 +1,10 @@
 """This module contains the audio router for the OpenAI API."""
 
-from itertools import chain
 from typing import Annotated
 from fastapi import HTTPException, APIRouter, Depends
 
 from leapfrogai_api.backend.grpc_client import create_transcription, create_translation
-from leapfrogai_api.backend.helpers import read_chunks
+from leapfrogai_api.backend.helpers import stream_audio_request
 from leapfrogai_api.typedef.audio import (
     CreateTranscriptionRequest,
     CreateTranscriptionResponse,
@@ -37,13 +36,9 @@ async def transcribe(
     audio_metadata = lfai.AudioMetadata(
         prompt=req.prompt, temperature=req.temperature, inputlanguage=req.language
     )
-    audio_metadata_request = lfai.AudioRequest(metadata=audio_metadata)
 
-    # Read the file and get an iterator of all the data chunks
-    chunk_iterator = read_chunks(req.file.file, 1024)
-
-    # combine our metadata and chunk_data iterators
-    request_iterator = chain((audio_metadata_request,), chunk_iterator)
+    # Stream the metadata followed by the file's data chunks
+    request_iterator = stream_audio_request(audio_metadata, req.file, model.name)
 
     return await create_transcription(model, request_iterator)
 
@@ -64,12 +59,8 @@ async def translate(
 
     # Create a request that contains the metadata for the AudioRequest
     audio_metadata = lfai.AudioMetadata(prompt=req.prompt, temperature=req.temperature)
-    audio_metadata_request = lfai.AudioRequest(metadata=audio_metadata)
-
-    # Read the file and get an iterator of all the data chunks
-    chunk_iterator = read_chunks(req.file.file, 1024)
 
-    # combine our metadata and chunk_data iterators
-    request_iterator = chain((audio_metadata_request,), chunk_iterator)
+    # Stream the metadata followed by the file's data chunks
+    request_iterator = stream_audio_request(audio_metadata, req.file, model.name)
 
     return await create_translation(model, request_iterator)
@@ -3,12 +3,13 @@
 from typing import Annotated, AsyncGenerator, Any
 from fastapi import HTTPException, APIRouter, Depends
 import leapfrogai_sdk as lfai
+from leapfrogai_api.backend.admission import with_admission
 from leapfrogai_api.backend.grpc_client import (
     chat_completion,
     stream_chat_completion,
     stream_chat_completion_raw,
 )
-from leapfrogai_api.backend.helpers import grpc_chat_role
+from leapfrogai_api.backend.helpers import grpc_chat_role, grpc_priority
 from leapfrogai_api.typedef.chat import ChatCompletionRequest
 from leapfrogai_api.routers.supabase_session import Session
 from leapfrogai_api.utils import get_model_config
@@ -44,12 +45,16 @@ async def chat_complete(
         chat_items=chat_items,
         max_new_tokens=req.max_tokens,
         temperature=req.temperature,
+        cache_key=req.prompt_cache_key,
+        priority=grpc_priority(req.service_tier),
     )
 
     if req.stream:
-        return await stream_chat_completion(model, request)
+        return await with_admission(
+            model, lambda: stream_chat_completion(model, request)
+        )
     else:
-        return await chat_completion(model, request)
+        return await with_admission(model, lambda: chat_completion(model, request))
 
 
 async def chat_complete_stream_raw(
@@ -74,6 +79,8 @@ async def chat_complete_stream_raw(
         chat_items=chat_items,
         max_new_tokens=req.max_tokens,
         temperature=req.temperature,
+        cache_key=req.prompt_cache_key,
+        priority=grpc_priority(req.service_tier),
     )
 
     async for response in stream_chat_completion_raw(model, request):
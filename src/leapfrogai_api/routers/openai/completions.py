@@ -2,6 +2,8 @@
 
 from typing import Annotated
 from fastapi import HTTPException, APIRouter, Depends
+from leapfrogai_api.backend.admission import with_admission
+from leapfrogai_api.backend.helpers import grpc_priority
 from leapfrogai_api.backend.grpc_client import (
     completion,
     stream_completion,
@@ -34,9 +36,10 @@ async def complete(
         prompt=req.prompt,  # type: ignore
         max_new_tokens=req.max_tokens,
         temperature=req.temperature,
+        priority=grpc_priority(req.service_tier),
     )
 
     if req.stream:
-        return await stream_completion(model, request)
+        return await with_admission(model, lambda: stream_completion(model, request))
     else:
-        return await completion(model, request)
+        return await with_admission(model, lambda: completion(model, request))
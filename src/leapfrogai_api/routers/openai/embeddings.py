@@ -4,6 +4,7 @@ from typing import Annotated
 from fastapi import APIRouter, Depends, HTTPException, status
 
 import leapfrogai_sdk as lfai
+from leapfrogai_api.backend.admission import with_admission
 from leapfrogai_api.backend.grpc_client import create_embeddings
 from leapfrogai_api.typedef.embeddings import (
     CreateEmbeddingRequest,
@@ -40,7 +41,9 @@ async def embeddings(
             detail=f"Invalid input type {type(req.input)}. Currently supported types are str and list[str]",
         )
 
-    return await create_embeddings(model, request)
+    return await with_admission(
+        model, lambda: create_embeddings(model, request, req.encoding_format)
+    )
 
 
 def _to_list_of_strs(v: list) -> list[str]:
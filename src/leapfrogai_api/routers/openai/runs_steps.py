@@ -1,8 +1,12 @@
 """OpenAI Compliant Threads API Router."""
 
-from fastapi import HTTPException, APIRouter
+import time
+
+from fastapi import HTTPException, APIRouter, status
 from openai.types.beta.threads import Run
 from openai.types.beta.threads.runs import RunStep
+from leapfrogai_api.backend.active_runs import get_active_runs
+from leapfrogai_api.data.crud_run import CRUDRun
 from leapfrogai_api.routers.supabase_session import Session
 
 router = APIRouter(prefix="/openai/v1/threads", tags=["openai/threads/run-steps"])
@@ -17,9 +21,31 @@ async def submit_tool_outputs(thread_id: str, run_id: str, session: Session) ->
 
 @router.post("/{thread_id}/runs/{run_id}/cancel")
 async def cancel_run(thread_id: str, run_id: str, session: Session) -> Run:
-    """Cancel a run."""
-    # TODO: Implement this function
-    raise HTTPException(status_code=501, detail="Not implemented")
+    """Cancel a run that is still generating, stopping generation on the model backend."""
+    crud_run = CRUDRun(db=session)
+
+    if not (run := await crud_run.get(filters={"id": run_id, "thread_id": thread_id})):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Run {run_id} not found for thread {thread_id}.",
+        )
+
+    if not get_active_runs().cancel(run_id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Run {run_id} is not in progress and cannot be cancelled.",
+        )
+
+    run.status = "cancelled"
+    run.cancelled_at = int(time.time())
+
+    if not (response := await crud_run.update(id_=run_id, object_=run)):
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to update run",
+        )
+
+    return response
 
 
 @router.get("/{thread_id}/runs/{run_id}/steps")
@@ -126,6 +126,16 @@ class ChatCompletionRequest(BaseModel):
         description="The maximum number of tokens to generate in the chat completion.",
         gt=0,
     )
+    prompt_cache_key: str | None = Field(
+        default=None,
+        description="Identifies the conversation this request continues, so backends that support it can reuse work done for the prompt prefix it shares with earlier requests of the same key.",
+        examples=["thread_abc123"],
+    )
+    service_tier: Literal["auto", "default", "flex"] | None = Field(
+        default=None,
+        description="The processing tier of the request. 'flex' requests, such as batch evaluations, accept slower responses and are scheduled after interactive ones on backends that support it.",
+        examples=["flex"],
+    )
 
 
 class ChatCompletionResponse(BaseModel):
@@ -90,6 +90,11 @@ class CompletionRequest(BaseModel):
         description="Sampling temperature to use. Higher values mean more random completions. Use lower values for more deterministic completions. The upper limit may vary depending on the backend used.",
         ge=0.0,
     )
+    service_tier: Literal["auto", "default", "flex"] | None = Field(
+        default=None,
+        description="The processing tier of the request. 'flex' requests, such as batch evaluations, accept slower responses and are scheduled after interactive ones on backends that support it.",
+        examples=["flex"],
+    )
 
 
 class CompletionResponse(BaseModel):
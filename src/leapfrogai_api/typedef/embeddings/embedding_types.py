@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
 from ..common import Usage
@@ -6,9 +8,9 @@ from ..common import Usage
 class EmbeddingResponseData(BaseModel):
     """Response object for embeddings."""
 
-    embedding: list[float] = Field(
+    embedding: list[float] | str = Field(
         default=[],
-        description="The embedding vector representing the input text.",
+        description="The embedding vector representing the input text, base64 encoded if requested with encoding_format.",
     )
     index: int = Field(
         default=0,
@@ -31,6 +33,11 @@ class CreateEmbeddingRequest(BaseModel):
         description="The text to generate embeddings for. Can be a string, array of strings, array of tokens, or array of token arrays.",
         examples=["The quick brown fox jumps over the lazy dog", ["Hello", "World"]],
     )
+    encoding_format: Literal["float", "base64"] = Field(
+        default="float",
+        description="The format to return the embeddings in: a list of floats, or the base64 encoded bytes of little-endian float32 values.",
+        examples=["float", "base64"],
+    )
 
 
 class CreateEmbeddingResponse(BaseModel):
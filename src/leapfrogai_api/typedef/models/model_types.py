@@ -5,10 +5,25 @@ from pydantic import BaseModel, Field
 class Model:
     name: str
     backend: str
-
-    def __init__(self, name: str, backend: str, capabilities: List[str] | None = None):
+    backends: List[str]
+    max_concurrent_requests: int | None
+    max_queued_requests: int | None
+
+    def __init__(
+        self,
+        name: str,
+        backend: str | List[str],
+        capabilities: List[str] | None = None,
+        max_concurrent_requests: int | None = None,
+        max_queued_requests: int | None = None,
+    ):
         self.name = name
-        self.backend = backend
+        # A model may be served by several replicas; `backend` remains the primary address
+        self.backends = [backend] if isinstance(backend, str) else list(backend)
+        self.backend = self.backends[0]
+        # Admission limits; no limit is applied when max_concurrent_requests is unset
+        self.max_concurrent_requests = max_concurrent_requests
+        self.max_queued_requests = max_queued_requests
 
 
 class ModelResponseModel(BaseModel):
@@ -8,6 +8,7 @@ import yaml
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
+from leapfrogai_api.backend.grpc_channels import get_channel_pool
 from leapfrogai_api.typedef.models import Model
 
 logger = logging.getLogger(__name__)
@@ -146,9 +147,20 @@ class Config:
 
     def parse_models(self, loaded_artifact, config_file):
         for m in loaded_artifact["models"]:
-            model_config = Model(name=m["name"], backend=m["backend"])
-
+            model_config = Model(
+                name=m["name"],
+                backend=m["backend"],
+                max_concurrent_requests=m.get("max_concurrent_requests"),
+                max_queued_requests=m.get("max_queued_requests"),
+            )
+
+            previous_config = self.models.get(m["name"])
             self.models[m["name"]] = model_config
+            if previous_config is not None:
+                for backend in set(previous_config.backends) - set(
+                    model_config.backends
+                ):
+                    self.release_backend(backend)
             try:
                 self.config_sources[config_file].append(m["name"])
             except KeyError:
@@ -157,8 +169,15 @@ class Config:
 
     def remove_model_by_config(self, config_file):
         for model_name in self.config_sources[config_file]:
-            self.models.pop(model_name)
+            model_config = self.models.pop(model_name)
+            for backend in model_config.backends:
+                self.release_backend(backend)
             logger.info("removed {} from model config".format(model_name))
 
         # clear config once all corresponding models are deleted
         self.config_sources.pop(config_file)
+
+    def release_backend(self, backend: str):
+        # Close the pooled channel once no configured model points at this address anymore
+        if not any(backend in model.backends for model in self.models.values()):
+            get_channel_pool().discard(backend)
@@ -1,71 +1,119 @@
 # __init__.py
-# ruff: noqa: F401
+#
+# Exports are imported lazily on first access, so a backend only loads the generated
+# protobuf and gRPC modules for the services it actually uses.
 
-from grpc import ServicerContext as GrpcContext
+import importlib
 
-from leapfrogai_sdk.counting.counting_pb2 import (
-    TokenCountRequest,
-    TokenCountResponse,
-)
-from leapfrogai_sdk.counting.counting_pb2_grpc import (
-    TokenCountService,
-    TokenCountServiceServicer,
-    TokenCountServiceStub,
-)
-from leapfrogai_sdk.audio.audio_pb2 import (
-    AudioMetadata,
-    AudioRequest,
-    AudioResponse,
-)
-from leapfrogai_sdk.audio.audio_pb2_grpc import Audio, AudioServicer, AudioStub
-from leapfrogai_sdk.chat.chat_pb2 import (
-    ChatCompletionChoice,
-    ChatCompletionFinishReason,
-    ChatCompletionRequest,
-    ChatCompletionResponse,
-    ChatItem,
-    ChatRole,
-)
-from leapfrogai_sdk.chat.chat_pb2_grpc import (
-    ChatCompletionService,
-    ChatCompletionServiceServicer,
-    ChatCompletionServiceStub,
-    ChatCompletionStreamService,
-    ChatCompletionStreamServiceServicer,
-    ChatCompletionStreamServiceStub,
-)
-from leapfrogai_sdk.completion.completion_pb2 import (
-    CompletionChoice,
-    CompletionFinishReason,
-    CompletionRequest,
-    CompletionResponse,
-    CompletionUsage,
-)
-from leapfrogai_sdk.completion.completion_pb2_grpc import (
-    CompletionService,
-    CompletionServiceServicer,
-    CompletionServiceStub,
-    CompletionStreamService,
-    CompletionStreamServiceServicer,
-    CompletionStreamServiceStub,
-)
-from leapfrogai_sdk.config import BackendConfig
-from leapfrogai_sdk.embeddings.embeddings_pb2 import (
-    Embedding,
-    EmbeddingRequest,
-    EmbeddingResponse,
-)
-from leapfrogai_sdk.embeddings.embeddings_pb2_grpc import (
-    EmbeddingsService,
-    EmbeddingsServiceServicer,
-    EmbeddingsServiceStub,
-)
-from leapfrogai_sdk.name.name_pb2 import NameResponse
-from leapfrogai_sdk.name.name_pb2_grpc import (
-    NameService,
-    NameServiceServicer,
-    NameServiceStub,
+_EXPORTS = {
+    "grpc": ("ServicerContext",),
+    "leapfrogai_sdk.counting.counting_pb2": (
+        "BatchTokenCountRequest",
+        "BatchTokenCountResponse",
+        "TokenCountRequest",
+        "TokenCountResponse",
+    ),
+    "leapfrogai_sdk.counting.counting_pb2_grpc": (
+        "TokenCountService",
+        "TokenCountServiceServicer",
+        "TokenCountServiceStub",
+    ),
+    "leapfrogai_sdk.audio.audio_pb2": (
+        "AudioMetadata",
+        "AudioRequest",
+        "AudioResponse",
+    ),
+    "leapfrogai_sdk.audio.audio_pb2_grpc": ("Audio", "AudioServicer", "AudioStub"),
+    "leapfrogai_sdk.chat.chat_pb2": (
+        "BatchChatCompletionRequest",
+        "BatchChatCompletionResponse",
+        "ChatCompletionChoice",
+        "ChatCompletionFinishReason",
+        "ChatCompletionRequest",
+        "ChatCompletionResponse",
+        "ChatItem",
+        "ChatRole",
+    ),
+    "leapfrogai_sdk.chat.chat_pb2_grpc": (
+        "BatchChatCompletionService",
+        "BatchChatCompletionServiceServicer",
+        "BatchChatCompletionServiceStub",
+        "ChatCompletionService",
+        "ChatCompletionServiceServicer",
+        "ChatCompletionServiceStub",
+        "ChatCompletionStreamService",
+        "ChatCompletionStreamServiceServicer",
+        "ChatCompletionStreamServiceStub",
+    ),
+    "leapfrogai_sdk.completion.completion_pb2": (
+        "BatchCompletionRequest",
+        "BatchCompletionResponse",
+        "CompletionChoice",
+        "CompletionFinishReason",
+        "CompletionRequest",
+        "CompletionResponse",
+        "CompletionUsage",
+    ),
+    "leapfrogai_sdk.completion.completion_pb2_grpc": (
+        "BatchCompletionService",
+        "BatchCompletionServiceServicer",
+        "BatchCompletionServiceStub",
+        "CompletionService",
+        "CompletionServiceServicer",
+        "CompletionServiceStub",
+        "CompletionStreamService",
+        "CompletionStreamServiceServicer",
+        "CompletionStreamServiceStub",
+    ),
+    "leapfrogai_sdk.config": ("BackendConfig",),
+    "leapfrogai_sdk.embeddings.embeddings_pb2": (
+        "Embedding",
+        "EmbeddingEncoding",
+        "EmbeddingRequest",
+        "EmbeddingResponse",
+    ),
+    "leapfrogai_sdk.embeddings.embeddings_pb2_grpc": (
+        "EmbeddingsService",
+        "EmbeddingsServiceServicer",
+        "EmbeddingsServiceStub",
+    ),
+    "leapfrogai_sdk.packing": ("embedding_response",),
+    "leapfrogai_sdk.name.name_pb2": ("NameResponse",),
+    "leapfrogai_sdk.name.name_pb2_grpc": (
+        "NameService",
+        "NameServiceServicer",
+        "NameServiceStub",
+    ),
+}
+
+# Exports whose name differs from the attribute of the module they come from
+_ALIASES = {"GrpcContext": "ServicerContext"}
+
+_MODULE_BY_NAME = {name: module for module, names in _EXPORTS.items() for name in names}
+_MODULE_BY_NAME.update(
+    {alias: _MODULE_BY_NAME.pop(name) for alias, name in _ALIASES.items()}
 )
-from leapfrogai_sdk.serve import serve
+
+__all__ = sorted([*_MODULE_BY_NAME, "serve"])
+
+
+def __getattr__(name: str):
+    module = _MODULE_BY_NAME.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module), _ALIASES.get(name, name))
+    # Cache the export so later lookups don't go through __getattr__ again
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
+# Imported eagerly so the function, rather than the module of the same name, is the
+# package's `serve`; the module defers its own imports until a server is started
+from leapfrogai_sdk.serve import serve  # noqa: E402, F401
 
 print("Initializing LeapfrogAI")
@@ -66,8 +66,9 @@ class ChatCompletionRequest(_message.Message):
         "watermark",
         "seed",
         "user",
+        "cache_key",
+        "priority",
     )
-
     class LogitBiasEntry(_message.Message):
         __slots__ = ("key", "value")
         KEY_FIELD_NUMBER: _ClassVar[int]
@@ -97,6 +98,8 @@ class ChatCompletionRequest(_message.Message):
     WATERMARK_FIELD_NUMBER: _ClassVar[int]
     SEED_FIELD_NUMBER: _ClassVar[int]
     USER_FIELD_NUMBER: _ClassVar[int]
+    CACHE_KEY_FIELD_NUMBER: _ClassVar[int]
+    PRIORITY_FIELD_NUMBER: _ClassVar[int]
     chat_items: _containers.RepeatedCompositeFieldContainer[ChatItem]
     max_new_tokens: int
     temperature: float
@@ -116,6 +119,8 @@ class ChatCompletionRequest(_message.Message):
     watermark: bool
     seed: int
     user: str
+    cache_key: str
+    priority: int
     def __init__(
         self,
         chat_items: _Optional[_Iterable[_Union[ChatItem, _Mapping]]] = ...,
@@ -137,6 +142,8 @@ class ChatCompletionRequest(_message.Message):
         watermark: bool = ...,
         seed: _Optional[int] = ...,
         user: _Optional[str] = ...,
+        cache_key: _Optional[str] = ...,
+        priority: _Optional[int] = ...,
     ) -> None: ...
 
 class ChatCompletionChoice(_message.Message):
@@ -189,3 +196,27 @@ class ChatCompletionResponse(_message.Message):
         choices: _Optional[_Iterable[_Union[ChatCompletionChoice, _Mapping]]] = ...,
         usage: _Optional[_Union[Usage, _Mapping]] = ...,
     ) -> None: ...
+
+class BatchChatCompletionRequest(_message.Message):
+    __slots__ = ("requests",)
+    REQUESTS_FIELD_NUMBER: _ClassVar[int]
+    requests: _containers.RepeatedCompositeFieldContainer[ChatCompletionRequest]
+    def __init__(
+        self,
+        requests: _Optional[_Iterable[_Union[ChatCompletionRequest, _Mapping]]] = ...,
+    ) -> None: ...
+
+class BatchChatCompletionResponse(_message.Message):
+    __slots__ = ("index", "response", "error")
+    INDEX_FIELD_NUMBER: _ClassVar[int]
+    RESPONSE_FIELD_NUMBER: _ClassVar[int]
+    ERROR_FIELD_NUMBER: _ClassVar[int]
+    index: int
+    response: ChatCompletionResponse
+    error: str
+    def __init__(
+        self,
+        index: _Optional[int] = ...,
+        response: _Optional[_Union[ChatCompletionResponse, _Mapping]] = ...,
+        error: _Optional[str] = ...,
+    ) -> None: ...
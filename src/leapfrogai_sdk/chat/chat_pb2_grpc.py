@@ -1,5 +1,6 @@
 # Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
 """Client and server classes corresponding to protobuf-defined services."""
+
 import grpc
 
 from leapfrogai_sdk.chat import chat_pb2 as leapfrogai__sdk_dot_chat_dot_chat__pb2
@@ -151,3 +152,77 @@ class ChatCompletionStreamService(object):
             timeout,
             metadata,
         )
+
+
+class BatchChatCompletionServiceStub(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.BatchChatComplete = channel.unary_stream(
+            "/chat.BatchChatCompletionService/BatchChatComplete",
+            request_serializer=leapfrogai__sdk_dot_chat_dot_chat__pb2.BatchChatCompletionRequest.SerializeToString,
+            response_deserializer=leapfrogai__sdk_dot_chat_dot_chat__pb2.BatchChatCompletionResponse.FromString,
+        )
+
+
+class BatchChatCompletionServiceServicer(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def BatchChatComplete(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+
+def add_BatchChatCompletionServiceServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+        "BatchChatComplete": grpc.unary_stream_rpc_method_handler(
+            servicer.BatchChatComplete,
+            request_deserializer=leapfrogai__sdk_dot_chat_dot_chat__pb2.BatchChatCompletionRequest.FromString,
+            response_serializer=leapfrogai__sdk_dot_chat_dot_chat__pb2.BatchChatCompletionResponse.SerializeToString,
+        ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+        "chat.BatchChatCompletionService", rpc_method_handlers
+    )
+    server.add_generic_rpc_handlers((generic_handler,))
+
+
+# This class is part of an EXPERIMENTAL API.
+class BatchChatCompletionService(object):
+    """Missing associated documentation comment in .proto file."""
+
+    @staticmethod
+    def BatchChatComplete(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            "/chat.BatchChatCompletionService/BatchChatComplete",
+            leapfrogai__sdk_dot_chat_dot_chat__pb2.BatchChatCompletionRequest.SerializeToString,
+            leapfrogai__sdk_dot_chat_dot_chat__pb2.BatchChatCompletionResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+        )
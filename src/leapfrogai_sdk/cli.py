@@ -3,6 +3,7 @@ import sys
 
 import click
 
+from leapfrogai_sdk.config import BackendConfig
 from leapfrogai_sdk.serve import serve
 from leapfrogai_sdk.utils import import_app
 
@@ -22,6 +23,34 @@ from leapfrogai_sdk.utils import import_app
     help="Bind socket to this port. If 0, an available port will be picked.",
     show_default=True,
 )
+@click.option(
+    "--uds",
+    type=str,
+    envvar="LEAPFROGAI_UDS",
+    default=None,
+    help="Also bind to this Unix domain socket path, for clients in the same pod or host.",
+)
+@click.option(
+    "--max-concurrent-rpcs",
+    type=int,
+    envvar="LEAPFROGAI_MAX_CONCURRENT_RPCS",
+    default=None,
+    help="Reject RPCs beyond this many in flight with RESOURCE_EXHAUSTED. Overrides server.max_concurrent_rpcs in the config file.",
+)
+@click.option(
+    "--max-workers",
+    type=int,
+    envvar="LEAPFROGAI_MAX_WORKERS",
+    default=None,
+    help="Threads for synchronous servicer methods. Overrides server.max_workers in the config file.",
+)
+@click.option(
+    "--metrics-port",
+    type=int,
+    envvar="LEAPFROGAI_METRICS_PORT",
+    default=None,
+    help="Serve Prometheus metrics on this port. Overrides server.metrics_port in the config file.",
+)
 @click.option(
     "--app-dir",
     type=str,
@@ -30,11 +59,30 @@ from leapfrogai_sdk.utils import import_app
     show_default=True,
 )
 @click.command()
-def cli(app: str, host: str, port: str, app_dir: str):
+def cli(
+    app: str,
+    host: str,
+    port: str,
+    uds: str | None,
+    max_concurrent_rpcs: int | None,
+    max_workers: int | None,
+    metrics_port: int | None,
+    app_dir: str,
+):
     sys.path.insert(0, app_dir)
     """LeapfrogAI CLI"""
     app = import_app(app)
-    asyncio.run(serve(app(), host, port))
+
+    config = BackendConfig().server
+    overrides = {
+        "max_concurrent_rpcs": max_concurrent_rpcs,
+        "max_workers": max_workers,
+        "metrics_port": metrics_port,
+    }
+    config = config.model_copy(
+        update={key: value for key, value in overrides.items() if value is not None}
+    )
+    asyncio.run(serve(app(), host, port, uds, config))
 
 
 if __name__ == "__main__":
@@ -46,8 +46,8 @@ class CompletionRequest(_message.Message):
         "watermark",
         "seed",
         "user",
+        "priority",
     )
-
     class LogitBiasEntry(_message.Message):
         __slots__ = ("key", "value")
         KEY_FIELD_NUMBER: _ClassVar[int]
@@ -80,6 +80,7 @@ class CompletionRequest(_message.Message):
     WATERMARK_FIELD_NUMBER: _ClassVar[int]
     SEED_FIELD_NUMBER: _ClassVar[int]
     USER_FIELD_NUMBER: _ClassVar[int]
+    PRIORITY_FIELD_NUMBER: _ClassVar[int]
     prompt: str
     suffix: str
     max_new_tokens: int
@@ -102,6 +103,7 @@ class CompletionRequest(_message.Message):
     watermark: bool
     seed: int
     user: str
+    priority: int
     def __init__(
         self,
         prompt: _Optional[str] = ...,
@@ -126,6 +128,7 @@ class CompletionRequest(_message.Message):
         watermark: bool = ...,
         seed: _Optional[int] = ...,
         user: _Optional[str] = ...,
+        priority: _Optional[int] = ...,
     ) -> None: ...
 
 class CompletionChoice(_message.Message):
@@ -169,3 +172,26 @@ class CompletionResponse(_message.Message):
         choices: _Optional[_Iterable[_Union[CompletionChoice, _Mapping]]] = ...,
         usage: _Optional[_Union[CompletionUsage, _Mapping]] = ...,
     ) -> None: ...
+
+class BatchCompletionRequest(_message.Message):
+    __slots__ = ("requests",)
+    REQUESTS_FIELD_NUMBER: _ClassVar[int]
+    requests: _containers.RepeatedCompositeFieldContainer[CompletionRequest]
+    def __init__(
+        self, requests: _Optional[_Iterable[_Union[CompletionRequest, _Mapping]]] = ...
+    ) -> None: ...
+
+class BatchCompletionResponse(_message.Message):
+    __slots__ = ("index", "response", "error")
+    INDEX_FIELD_NUMBER: _ClassVar[int]
+    RESPONSE_FIELD_NUMBER: _ClassVar[int]
+    ERROR_FIELD_NUMBER: _ClassVar[int]
+    index: int
+    response: CompletionResponse
+    error: str
+    def __init__(
+        self,
+        index: _Optional[int] = ...,
+        response: _Optional[_Union[CompletionResponse, _Mapping]] = ...,
+        error: _Optional[str] = ...,
+    ) -> None: ...
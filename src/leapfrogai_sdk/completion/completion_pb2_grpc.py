@@ -1,5 +1,6 @@
 # Generated by the gRPC Python protocol compiler plugin. DO NOT EDIT!
 """Client and server classes corresponding to protobuf-defined services."""
+
 import grpc
 
 from leapfrogai_sdk.completion import (
@@ -153,3 +154,77 @@ class CompletionStreamService(object):
             timeout,
             metadata,
         )
+
+
+class BatchCompletionServiceStub(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def __init__(self, channel):
+        """Constructor.
+
+        Args:
+            channel: A grpc.Channel.
+        """
+        self.BatchComplete = channel.unary_stream(
+            "/completion.BatchCompletionService/BatchComplete",
+            request_serializer=leapfrogai__sdk_dot_completion_dot_completion__pb2.BatchCompletionRequest.SerializeToString,
+            response_deserializer=leapfrogai__sdk_dot_completion_dot_completion__pb2.BatchCompletionResponse.FromString,
+        )
+
+
+class BatchCompletionServiceServicer(object):
+    """Missing associated documentation comment in .proto file."""
+
+    def BatchComplete(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
+
+def add_BatchCompletionServiceServicer_to_server(servicer, server):
+    rpc_method_handlers = {
+        "BatchComplete": grpc.unary_stream_rpc_method_handler(
+            servicer.BatchComplete,
+            request_deserializer=leapfrogai__sdk_dot_completion_dot_completion__pb2.BatchCompletionRequest.FromString,
+            response_serializer=leapfrogai__sdk_dot_completion_dot_completion__pb2.BatchCompletionResponse.SerializeToString,
+        ),
+    }
+    generic_handler = grpc.method_handlers_generic_handler(
+        "completion.BatchCompletionService", rpc_method_handlers
+    )
+    server.add_generic_rpc_handlers((generic_handler,))
+
+
+# This class is part of an EXPERIMENTAL API.
+class BatchCompletionService(object):
+    """Missing associated documentation comment in .proto file."""
+
+    @staticmethod
+    def BatchComplete(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            "/completion.BatchCompletionService/BatchComplete",
+            leapfrogai__sdk_dot_completion_dot_completion__pb2.BatchCompletionRequest.SerializeToString,
+            leapfrogai__sdk_dot_completion_dot_completion__pb2.BatchCompletionResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+        )
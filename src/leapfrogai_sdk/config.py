@@ -1,10 +1,13 @@
 import logging
 import os
+from typing import TYPE_CHECKING
 
 from confz import BaseConfig, FileSource
-from google.protobuf.internal.containers import RepeatedCompositeFieldContainer
 
-from leapfrogai_sdk import ChatItem, ChatRole
+if TYPE_CHECKING:
+    from google.protobuf.internal.containers import RepeatedCompositeFieldContainer
+
+    from leapfrogai_sdk import ChatItem
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +38,51 @@ class ModelConfig(BaseConfig):
     trust_remote_code: bool = False
 
 
+class ServerConfig(BaseConfig):
+    # RPCs beyond this many in flight are rejected with RESOURCE_EXHAUSTED; None is unbounded
+    max_concurrent_rpcs: int | None = None
+    # Threads available to synchronous servicer methods; async methods run on the event loop
+    max_workers: int = 40
+    # Requests of a single batch RPC that are generated at the same time
+    max_batch_concurrency: int = 32
+    max_receive_message_length: int = 4 * 1024 * 1024
+    max_send_message_length: int = 4 * 1024 * 1024
+    # Server-initiated keepalive pings; None leaves gRPC's default of pinging every 2 hours
+    keepalive_time_ms: int | None = None
+    keepalive_timeout_ms: int = 20000
+    # Accept keepalive pings from the API's long-lived channels this often, even when idle
+    min_recv_ping_interval_without_data_ms: int = 10000
+    # Health checks report NOT_SERVING once this many RPCs are in flight; None never sheds
+    overload_threshold: int | None = None
+    # ...and SERVING again once in-flight RPCs drop to this; defaults to 3/4 of the threshold
+    overload_recovery: int | None = None
+    # Serve Prometheus metrics over HTTP on this port; None doesn't start the endpoint
+    metrics_port: int | None = None
+
+    def grpc_options(self) -> list[tuple[str, int]]:
+        options = [
+            ("grpc.max_receive_message_length", self.max_receive_message_length),
+            ("grpc.max_send_message_length", self.max_send_message_length),
+            ("grpc.keepalive_timeout_ms", self.keepalive_timeout_ms),
+            ("grpc.keepalive_permit_without_calls", 1),
+            (
+                "grpc.http2.min_recv_ping_interval_without_data_ms",
+                self.min_recv_ping_interval_without_data_ms,
+            ),
+            ("grpc.http2.max_ping_strikes", 0),
+        ]
+        if self.keepalive_time_ms is not None:
+            options.append(("grpc.keepalive_time_ms", self.keepalive_time_ms))
+        return options
+
+
+class StreamingConfig(BaseConfig):
+    # Streamed text deltas are batched for up to this long before being sent; 0 sends each one
+    flush_interval_ms: int = 20
+    # A batch is sent as soon as it holds this many bytes of text
+    max_bytes: int = 1024
+
+
 class BackendConfig(BaseConfig):
     name: str | None = None
     model: ModelConfig | None = ModelConfig
@@ -42,14 +90,19 @@ class BackendConfig(BaseConfig):
     stop_tokens: list[str] | None = None
     prompt_format: PromptFormat | None = None
     defaults: LLMDefaults = LLMDefaults()
+    server: ServerConfig = ServerConfig()
+    streaming: StreamingConfig = StreamingConfig()
 
     CONFIG_SOURCES = FileSource(
         file=os.getenv("LEAPFROGAI_CONFIG_FILE", "config.yaml"), optional=True
     )
 
     def apply_chat_template(
-        self, chat_items: RepeatedCompositeFieldContainer[ChatItem]
+        self, chat_items: "RepeatedCompositeFieldContainer[ChatItem]"
     ) -> str:
+        # Only backends that format chat prompts need the chat protos
+        from leapfrogai_sdk import ChatRole
+
         response_prefix = self.prompt_format.chat.assistant.split("{}")[0]
         prompt = ""
         for item in chat_items:
@@ -14,7 +14,7 @@ _sym_db = _symbol_database.Default()
 
 
 DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(
-    b'\n&leapfrogai_sdk/counting/counting.proto\x12\x08\x63ounting"!\n\x11TokenCountRequest\x12\x0c\n\x04text\x18\x01 \x01(\t"#\n\x12TokenCountResponse\x12\r\n\x05\x63ount\x18\x01 \x01(\x05\x32]\n\x11TokenCountService\x12H\n\x0b\x43ountTokens\x12\x1b.counting.TokenCountRequest\x1a\x1c.counting.TokenCountResponseB;Z9github.com/defenseunicorns/leapfrogai/pkg/client/countingb\x06proto3'
+    b'\n&leapfrogai_sdk/counting/counting.proto\x12\x08\x63ounting"!\n\x11TokenCountRequest\x12\x0c\n\x04text\x18\x01 \x01(\t"#\n\x12TokenCountResponse\x12\r\n\x05\x63ount\x18\x01 \x01(\x05"\'\n\x16\x42\x61tchTokenCountRequest\x12\r\n\x05texts\x18\x01 \x03(\t")\n\x17\x42\x61tchTokenCountResponse\x12\x0e\n\x06\x63ounts\x18\x01 \x03(\x05\x32\xb6\x01\n\x11TokenCountService\x12H\n\x0b\x43ountTokens\x12\x1b.counting.TokenCountRequest\x1a\x1c.counting.TokenCountResponse\x12W\n\x10\x42\x61tchCountTokens\x12 .counting.BatchTokenCountRequest\x1a!.counting.BatchTokenCountResponseB;Z9github.com/defenseunicorns/leapfrogai/pkg/client/countingb\x06proto3'
 )
 
 _globals = globals()
@@ -33,6 +33,10 @@ if not _descriptor._USE_C_DESCRIPTORS:
     _globals["_TOKENCOUNTREQUEST"]._serialized_end = 85
     _globals["_TOKENCOUNTRESPONSE"]._serialized_start = 87
     _globals["_TOKENCOUNTRESPONSE"]._serialized_end = 122
-    _globals["_TOKENCOUNTSERVICE"]._serialized_start = 124
-    _globals["_TOKENCOUNTSERVICE"]._serialized_end = 217
+    _globals["_BATCHTOKENCOUNTREQUEST"]._serialized_start = 124
+    _globals["_BATCHTOKENCOUNTREQUEST"]._serialized_end = 163
+    _globals["_BATCHTOKENCOUNTRESPONSE"]._serialized_start = 165
+    _globals["_BATCHTOKENCOUNTRESPONSE"]._serialized_end = 206
+    _globals["_TOKENCOUNTSERVICE"]._serialized_start = 209
+    _globals["_TOKENCOUNTSERVICE"]._serialized_end = 391
 # @@protoc_insertion_point(module_scope)
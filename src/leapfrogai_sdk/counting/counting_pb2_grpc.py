@@ -22,6 +22,11 @@ class TokenCountServiceStub(object):
             request_serializer=leapfrogai__sdk_dot_counting_dot_counting__pb2.TokenCountRequest.SerializeToString,
             response_deserializer=leapfrogai__sdk_dot_counting_dot_counting__pb2.TokenCountResponse.FromString,
         )
+        self.BatchCountTokens = channel.unary_unary(
+            "/counting.TokenCountService/BatchCountTokens",
+            request_serializer=leapfrogai__sdk_dot_counting_dot_counting__pb2.BatchTokenCountRequest.SerializeToString,
+            response_deserializer=leapfrogai__sdk_dot_counting_dot_counting__pb2.BatchTokenCountResponse.FromString,
+        )
 
 
 class TokenCountServiceServicer(object):
@@ -33,6 +38,12 @@ class TokenCountServiceServicer(object):
         context.set_details("Method not implemented!")
         raise NotImplementedError("Method not implemented!")
 
+    def BatchCountTokens(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details("Method not implemented!")
+        raise NotImplementedError("Method not implemented!")
+
 
 def add_TokenCountServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -41,6 +52,11 @@ def add_TokenCountServiceServicer_to_server(servicer, server):
             request_deserializer=leapfrogai__sdk_dot_counting_dot_counting__pb2.TokenCountRequest.FromString,
             response_serializer=leapfrogai__sdk_dot_counting_dot_counting__pb2.TokenCountResponse.SerializeToString,
         ),
+        "BatchCountTokens": grpc.unary_unary_rpc_method_handler(
+            servicer.BatchCountTokens,
+            request_deserializer=leapfrogai__sdk_dot_counting_dot_counting__pb2.BatchTokenCountRequest.FromString,
+            response_serializer=leapfrogai__sdk_dot_counting_dot_counting__pb2.BatchTokenCountResponse.SerializeToString,
+        ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
         "counting.TokenCountService", rpc_method_handlers
@@ -80,3 +96,32 @@ class TokenCountService(object):
             timeout,
             metadata,
         )
+
+    @staticmethod
+    def BatchCountTokens(
+        request,
+        target,
+        options=(),
+        channel_credentials=None,
+        call_credentials=None,
+        insecure=False,
+        compression=None,
+        wait_for_ready=None,
+        timeout=None,
+        metadata=None,
+    ):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            "/counting.TokenCountService/BatchCountTokens",
+            leapfrogai__sdk_dot_counting_dot_counting__pb2.BatchTokenCountRequest.SerializeToString,
+            leapfrogai__sdk_dot_counting_dot_counting__pb2.BatchTokenCountResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+        )
@@ -14,7 +14,7 @@ _sym_db = _symbol_database.Default()
 
 
 DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(
-    b'\n*leapfrogai_sdk/embeddings/embeddings.proto\x12\nembeddings""\n\x10\x45mbeddingRequest\x12\x0e\n\x06inputs\x18\x01 \x03(\t"\x1e\n\tEmbedding\x12\x11\n\tembedding\x18\x01 \x03(\x02">\n\x11\x45mbeddingResponse\x12)\n\nembeddings\x18\x01 \x03(\x0b\x32\x15.embeddings.Embedding2c\n\x11\x45mbeddingsService\x12N\n\x0f\x43reateEmbedding\x12\x1c.embeddings.EmbeddingRequest\x1a\x1d.embeddings.EmbeddingResponseB=Z;github.com/defenseunicorns/leapfrogai/pkg/client/embeddingsb\x06proto3'
+    b'\n*leapfrogai_sdk/embeddings/embeddings.proto\x12\nembeddings"S\n\x10\x45mbeddingRequest\x12\x0e\n\x06inputs\x18\x01 \x03(\t\x12/\n\x08\x65ncoding\x18\x02 \x01(\x0e\x32\x1d.embeddings.EmbeddingEncoding".\n\tEmbedding\x12\x11\n\tembedding\x18\x01 \x03(\x02\x12\x0e\n\x06packed\x18\x02 \x01(\x0c"o\n\x11\x45mbeddingResponse\x12)\n\nembeddings\x18\x01 \x03(\x0b\x32\x15.embeddings.Embedding\x12/\n\x08\x65ncoding\x18\x02 \x01(\x0e\x32\x1d.embeddings.EmbeddingEncoding*=\n\x11\x45mbeddingEncoding\x12\x0e\n\nFLOAT_LIST\x10\x00\x12\x0b\n\x07\x46LOAT32\x10\x01\x12\x0b\n\x07\x46LOAT16\x10\x02\x32\x63\n\x11\x45mbeddingsService\x12N\n\x0f\x43reateEmbedding\x12\x1c.embeddings.EmbeddingRequest\x1a\x1d.embeddings.EmbeddingResponseB=Z;github.com/defenseunicorns/leapfrogai/pkg/client/embeddingsb\x06proto3'
 )
 
 _globals = globals()
@@ -29,12 +29,14 @@ if _descriptor._USE_C_DESCRIPTORS == False:
     ]._serialized_options = (
         b"Z;github.com/defenseunicorns/leapfrogai/pkg/client/embeddings"
     )
+    _globals["_EMBEDDINGENCODING"]._serialized_start = 304
+    _globals["_EMBEDDINGENCODING"]._serialized_end = 365
     _globals["_EMBEDDINGREQUEST"]._serialized_start = 58
-    _globals["_EMBEDDINGREQUEST"]._serialized_end = 92
-    _globals["_EMBEDDING"]._serialized_start = 94
-    _globals["_EMBEDDING"]._serialized_end = 124
-    _globals["_EMBEDDINGRESPONSE"]._serialized_start = 126
-    _globals["_EMBEDDINGRESPONSE"]._serialized_end = 188
-    _globals["_EMBEDDINGSSERVICE"]._serialized_start = 190
-    _globals["_EMBEDDINGSSERVICE"]._serialized_end = 289
+    _globals["_EMBEDDINGREQUEST"]._serialized_end = 141
+    _globals["_EMBEDDING"]._serialized_start = 143
+    _globals["_EMBEDDING"]._serialized_end = 189
+    _globals["_EMBEDDINGRESPONSE"]._serialized_start = 191
+    _globals["_EMBEDDINGRESPONSE"]._serialized_end = 302
+    _globals["_EMBEDDINGSSERVICE"]._serialized_start = 367
+    _globals["_EMBEDDINGSSERVICE"]._serialized_end = 466
 # @@protoc_insertion_point(module_scope)
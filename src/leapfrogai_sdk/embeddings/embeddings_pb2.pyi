@@ -1,4 +1,5 @@
 from google.protobuf.internal import containers as _containers
+from google.protobuf.internal import enum_type_wrapper as _enum_type_wrapper
 from google.protobuf import descriptor as _descriptor
 from google.protobuf import message as _message
 from typing import (
@@ -11,22 +12,48 @@ from typing import (
 
 DESCRIPTOR: _descriptor.FileDescriptor
 
+class EmbeddingEncoding(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
+    __slots__ = ()
+    FLOAT_LIST: _ClassVar[EmbeddingEncoding]
+    FLOAT32: _ClassVar[EmbeddingEncoding]
+    FLOAT16: _ClassVar[EmbeddingEncoding]
+
+FLOAT_LIST: EmbeddingEncoding
+FLOAT32: EmbeddingEncoding
+FLOAT16: EmbeddingEncoding
+
 class EmbeddingRequest(_message.Message):
-    __slots__ = ("inputs",)
+    __slots__ = ("inputs", "encoding")
     INPUTS_FIELD_NUMBER: _ClassVar[int]
+    ENCODING_FIELD_NUMBER: _ClassVar[int]
     inputs: _containers.RepeatedScalarFieldContainer[str]
-    def __init__(self, inputs: _Optional[_Iterable[str]] = ...) -> None: ...
+    encoding: EmbeddingEncoding
+    def __init__(
+        self,
+        inputs: _Optional[_Iterable[str]] = ...,
+        encoding: _Optional[_Union[EmbeddingEncoding, str]] = ...,
+    ) -> None: ...
 
 class Embedding(_message.Message):
-    __slots__ = ("embedding",)
+    __slots__ = ("embedding", "packed")
     EMBEDDING_FIELD_NUMBER: _ClassVar[int]
+    PACKED_FIELD_NUMBER: _ClassVar[int]
     embedding: _containers.RepeatedScalarFieldContainer[float]
-    def __init__(self, embedding: _Optional[_Iterable[float]] = ...) -> None: ...
+    packed: bytes
+    def __init__(
+        self,
+        embedding: _Optional[_Iterable[float]] = ...,
+        packed: _Optional[bytes] = ...,
+    ) -> None: ...
 
 class EmbeddingResponse(_message.Message):
-    __slots__ = ("embeddings",)
+    __slots__ = ("embeddings", "encoding")
     EMBEDDINGS_FIELD_NUMBER: _ClassVar[int]
+    ENCODING_FIELD_NUMBER: _ClassVar[int]
     embeddings: _containers.RepeatedCompositeFieldContainer[Embedding]
+    encoding: EmbeddingEncoding
     def __init__(
-        self, embeddings: _Optional[_Iterable[_Union[Embedding, _Mapping]]] = ...
+        self,
+        embeddings: _Optional[_Iterable[_Union[Embedding, _Mapping]]] = ...,
+        encoding: _Optional[_Union[EmbeddingEncoding, str]] = ...,
     ) -> None: ...
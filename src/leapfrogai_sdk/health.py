@@ -0,0 +1,253 @@
+"""Readiness reporting and load shedding through the gRPC health service."""
+
+import asyncio
+import inspect
+import logging
+import threading
+from typing import Any, AsyncGenerator, Callable, Iterable
+
+import grpc
+from grpc_health.v1 import health_pb2, health_pb2_grpc
+
+logger = logging.getLogger(__name__)
+
+# RPCs of these services are not counted as load, so they keep answering under overload
+UNCOUNTED_SERVICE_PREFIXES = ("/grpc.health.", "/grpc.reflection.")
+
+CONCURRENCY_LIMIT_DETAILS = "Concurrent RPC limit exceeded"
+
+
+class HealthServicer(health_pb2_grpc.HealthServicer):
+    """Implements the gRPC health service from the backend's readiness and load.
+
+    Every service, and the server as a whole (""), is NOT_SERVING until the backend has
+    loaded and warmed up. Once ready, the server reports NOT_SERVING whenever
+    `overload_threshold` or more RPCs are in flight, and SERVING again once they drain to
+    `overload_recovery`, so the API and Kubernetes route requests to other replicas.
+    RPCs beyond `max_concurrent_rpcs` in flight are rejected with RESOURCE_EXHAUSTED.
+    Health and reflection RPCs count toward neither limit, so the Watch stream each API
+    channel keeps open never takes the place of a real RPC.
+
+    Watch streams wait on the event loop rather than holding a worker thread each, as
+    every API channel to the backend keeps one open.
+    """
+
+    def __init__(
+        self,
+        overload_threshold: int | None = None,
+        overload_recovery: int | None = None,
+        max_concurrent_rpcs: int | None = None,
+    ):
+        self.max_concurrent_rpcs = max_concurrent_rpcs
+        self.overload_threshold = overload_threshold
+        if overload_recovery is None and overload_threshold is not None:
+            overload_recovery = overload_threshold * 3 // 4
+        self.overload_recovery = overload_recovery
+        self.services: set[str] = {""}
+        self.in_flight = 0
+        self.ready = False
+        self.overloaded = False
+        self.shutting_down = False
+        # Synchronous servicer methods finish on the server's worker threads
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._changed = asyncio.Event()
+
+    def watch(self, services: Iterable[str]):
+        """Report on these services in addition to the server as a whole.
+
+        Must be called from the event loop the server runs on.
+        """
+        self._loop = asyncio.get_running_loop()
+        self.services.update(services)
+
+    def status(self) -> "health_pb2.HealthCheckResponse.ServingStatus":
+        if self.ready and not self.overloaded and not self.shutting_down:
+            return health_pb2.HealthCheckResponse.SERVING
+        return health_pb2.HealthCheckResponse.NOT_SERVING
+
+    def set_ready(self, ready: bool):
+        with self._lock:
+            self.ready = ready
+        self._notify()
+
+    def enter_graceful_shutdown(self):
+        """Report NOT_SERVING from now on, so clients move away before the server stops."""
+        with self._lock:
+            self.shutting_down = True
+        self._notify()
+
+    def started(self) -> bool:
+        """Count an RPC as in flight, unless that would exceed `max_concurrent_rpcs`."""
+        with self._lock:
+            if (
+                self.max_concurrent_rpcs is not None
+                and self.in_flight >= self.max_concurrent_rpcs
+            ):
+                return False
+            self.in_flight += 1
+            if (
+                self.overload_threshold is None
+                or self.overloaded
+                or self.in_flight < self.overload_threshold
+            ):
+                return True
+            self.overloaded = True
+        logger.warning(
+            f"{self.overload_threshold} RPCs in flight, reporting NOT_SERVING until load drops"
+        )
+        self._notify()
+        return True
+
+    def finished(self):
+        with self._lock:
+            self.in_flight -= 1
+            if not self.overloaded or self.in_flight > self.overload_recovery:
+                return
+            self.overloaded = False
+        logger.info(f"{self.overload_recovery} RPCs in flight, reporting SERVING")
+        self._notify()
+
+    async def Check(
+        self, request: health_pb2.HealthCheckRequest, context
+    ) -> health_pb2.HealthCheckResponse:
+        if request.service not in self.services:
+            await context.abort(grpc.StatusCode.NOT_FOUND)
+        return health_pb2.HealthCheckResponse(status=self.status())
+
+    async def Watch(
+        self, request: health_pb2.HealthCheckRequest, context
+    ) -> AsyncGenerator[health_pb2.HealthCheckResponse, Any]:
+        last_status = None
+        while True:
+            changed = self._changed
+            status = (
+                self.status()
+                if request.service in self.services
+                else health_pb2.HealthCheckResponse.SERVICE_UNKNOWN
+            )
+            if status != last_status:
+                yield health_pb2.HealthCheckResponse(status=status)
+                last_status = status
+            await changed.wait()
+
+    def _notify(self):
+        loop = self._loop
+        if loop is None:
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._wake_watchers()
+        elif not loop.is_closed():
+            loop.call_soon_threadsafe(self._wake_watchers)
+
+    def _wake_watchers(self):
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def interceptor(self) -> grpc.aio.ServerInterceptor:
+        return _InFlightInterceptor(self)
+
+
+class _InFlightInterceptor(grpc.aio.ServerInterceptor):
+    """Counts the RPCs in flight on the server for a HealthServicer, rejecting those over
+    its concurrency limit."""
+
+    def __init__(self, health: HealthServicer):
+        self.health = health
+
+    async def intercept_service(
+        self,
+        continuation: Callable,
+        handler_call_details: grpc.HandlerCallDetails,
+    ) -> grpc.RpcMethodHandler:
+        handler = await continuation(handler_call_details)
+        if handler is None or handler_call_details.method.startswith(
+            UNCOUNTED_SERVICE_PREFIXES
+        ):
+            return handler
+
+        if handler.unary_unary:
+            return grpc.unary_unary_rpc_method_handler(
+                self._count(handler.unary_unary),
+                request_deserializer=handler.request_deserializer,
+                response_serializer=handler.response_serializer,
+            )
+        if handler.unary_stream:
+            return grpc.unary_stream_rpc_method_handler(
+                self._count(handler.unary_stream),
+                request_deserializer=handler.request_deserializer,
+                response_serializer=handler.response_serializer,
+            )
+        if handler.stream_unary:
+            return grpc.stream_unary_rpc_method_handler(
+                self._count(handler.stream_unary),
+                request_deserializer=handler.request_deserializer,
+                response_serializer=handler.response_serializer,
+            )
+        return grpc.stream_stream_rpc_method_handler(
+            self._count(handler.stream_stream),
+            request_deserializer=handler.request_deserializer,
+            response_serializer=handler.response_serializer,
+        )
+
+    def _count(self, behavior: Callable) -> Callable:
+        health = self.health
+
+        if inspect.isasyncgenfunction(behavior):
+
+            async def count_async_stream(request, context):
+                if not health.started():
+                    await context.abort(
+                        grpc.StatusCode.RESOURCE_EXHAUSTED, CONCURRENCY_LIMIT_DETAILS
+                    )
+                try:
+                    async for response in behavior(request, context):
+                        yield response
+                finally:
+                    health.finished()
+
+            return count_async_stream
+
+        if inspect.iscoroutinefunction(behavior):
+
+            async def count_async(request, context):
+                if not health.started():
+                    await context.abort(
+                        grpc.StatusCode.RESOURCE_EXHAUSTED, CONCURRENCY_LIMIT_DETAILS
+                    )
+                try:
+                    return await behavior(request, context)
+                finally:
+                    health.finished()
+
+            return count_async
+
+        if inspect.isgeneratorfunction(behavior):
+
+            def count_stream(request, context):
+                if not health.started():
+                    context.abort(
+                        grpc.StatusCode.RESOURCE_EXHAUSTED, CONCURRENCY_LIMIT_DETAILS
+                    )
+                try:
+                    yield from behavior(request, context)
+                finally:
+                    health.finished()
+
+            return count_stream
+
+        def count(request, context):
+            if not health.started():
+                context.abort(
+                    grpc.StatusCode.RESOURCE_EXHAUSTED, CONCURRENCY_LIMIT_DETAILS
+                )
+            try:
+                return behavior(request, context)
+            finally:
+                health.finished()
+
+        return count
@@ -1,9 +1,29 @@
-from typing import Any, List, Optional, AsyncGenerator
+import asyncio
+import hashlib
+from collections import OrderedDict
+from contextlib import aclosing
+import logging
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    TypeVar,
+)
 
 from pydantic import BaseModel
 
 from leapfrogai_sdk import (
     BackendConfig,
+    BatchChatCompletionRequest,
+    BatchChatCompletionResponse,
+    BatchCompletionRequest,
+    BatchCompletionResponse,
     ChatCompletionChoice,
     ChatCompletionRequest,
     ChatCompletionResponse,
@@ -14,12 +34,20 @@ from leapfrogai_sdk import (
     CompletionResponse,
     GrpcContext,
     CompletionUsage,
+    BatchTokenCountRequest,
+    BatchTokenCountResponse,
     TokenCountRequest,
     TokenCountResponse,
 )
 from leapfrogai_sdk.chat.chat_pb2 import Usage
+from leapfrogai_sdk.metrics import RequestMetrics, track_request
 from enum import Enum
 
+logger = logging.getLogger(__name__)
+
+RequestT = TypeVar("RequestT")
+ResponseT = TypeVar("ResponseT")
+
 
 class FinishReason(Enum):
     NONE = 0
@@ -45,6 +73,149 @@ class GenerationConfig(BaseModel):
     typical_p: float
     watermark: bool
     seed: int
+    # Identifies the conversation a chat request continues, so backends can reuse state
+    # for its shared prefix; None when the client gave no key
+    cache_key: str | None = None
+    # Scheduling class; lower values are served first (0 interactive, 1 batch)
+    priority: int = 0
+
+
+class GenerationChunk(NamedTuple):
+    """A piece of generated text, with token counts when the backend knows them.
+
+    `generate` may yield these instead of plain strings so usage is accumulated as text is
+    produced, rather than by re-tokenizing the prompt and completion once generation ends.
+    """
+
+    text: str
+    # Tokens generated for this text; None falls back to counting the whole completion
+    token_count: int | None = None
+    # Tokens in the prompt; only needs to be set on one chunk of the stream
+    prompt_token_count: int | None = None
+
+
+TOKEN_COUNT_CACHE_SIZE = 1024  # Texts whose token counts are remembered
+
+
+class TokenUsage:
+    """Token counts accumulated over one generation stream."""
+
+    def __init__(self):
+        self.prompt_tokens: int | None = None
+        self.completion_tokens: int = 0
+        # False once any chunk arrives without a token count
+        self.counted: bool = True
+
+    def add(self, chunk: str | GenerationChunk) -> str:
+        if isinstance(chunk, str):
+            self.counted = False
+            return chunk
+
+        if chunk.token_count is None:
+            self.counted = False
+        else:
+            self.completion_tokens += chunk.token_count
+        if chunk.prompt_token_count is not None:
+            self.prompt_tokens = chunk.prompt_token_count
+        return chunk.text
+
+
+async def coalesce_deltas(
+    deltas: AsyncIterator[str], flush_interval: float, max_bytes: int
+) -> AsyncGenerator[str, Any]:
+    """Batch streamed text deltas so fewer, larger messages are sent.
+
+    The first delta is sent straight away to keep time to first token low. After that,
+    deltas are joined until `flush_interval` seconds have passed since the batch started
+    or it holds `max_bytes` bytes, so no text is held back longer than the interval even
+    while the generator is slow to produce the next delta.
+    """
+    iterator = deltas.__aiter__()
+    pending: asyncio.Future | None = None
+    try:
+        if flush_interval <= 0:
+            async for delta in iterator:
+                yield delta
+            return
+
+        loop = asyncio.get_running_loop()
+        batch: list[str] = []
+        batch_bytes = 0
+        deadline: float | None = None
+        first = True
+
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(iterator.__anext__())
+
+            timeout = None if deadline is None else max(deadline - loop.time(), 0)
+            done, _ = await asyncio.wait({pending}, timeout=timeout)
+            if done:
+                try:
+                    delta = pending.result()
+                except StopAsyncIteration:
+                    pending = None
+                    break
+                pending = None
+
+                if not delta:
+                    continue
+                batch.append(delta)
+                batch_bytes += len(delta.encode())
+                if deadline is None:
+                    deadline = loop.time() + flush_interval
+
+            if done and not first and batch_bytes < max_bytes:
+                continue
+
+            if batch:
+                yield "".join(batch)
+            batch, batch_bytes, deadline, first = [], 0, None, False
+
+        if batch:
+            yield "".join(batch)
+    finally:
+        if pending is not None:
+            pending.cancel()
+            # The read has to unwind before the generator it was advancing can be closed
+            await asyncio.wait({pending})
+        await _aclose(iterator)
+
+
+async def _aclose(iterator: AsyncIterator[Any]):
+    aclose = getattr(iterator, "aclose", None)
+    if aclose is not None:
+        await aclose()
+
+
+async def run_batch(
+    requests: Sequence[RequestT],
+    complete: Callable[[RequestT], Awaitable[ResponseT]],
+    max_concurrency: int,
+) -> AsyncGenerator[tuple[int, ResponseT | None, str], Any]:
+    """Complete every request of a batch concurrently, yielding results as they finish.
+
+    Yields `(index, response, error)` tuples. A failed request yields its error message
+    instead of a response without affecting the rest of the batch. Requests that haven't
+    finished are cancelled if the caller stops consuming, e.g. because the RPC was cancelled.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def complete_one(index: int) -> tuple[int, ResponseT | None, str]:
+        async with semaphore:
+            try:
+                return index, await complete(requests[index]), ""
+            except Exception as e:
+                logger.exception(f"Request {index} of batch failed")
+                return index, None, str(e) or type(e).__name__
+
+    tasks = [asyncio.create_task(complete_one(i)) for i in range(len(requests))]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        for task in tasks:
+            task.cancel()
 
 
 def LLM(_cls):
@@ -54,6 +225,11 @@ def LLM(_cls):
     if not hasattr(_cls, "count_tokens"):
         raise ValueError("LLM class requires a count_tokens method")
 
+    # Classes may also define `async def generate_full(prompt, config)`, returning the
+    # whole completion as a str or GenerationChunk, to serve non-streaming RPCs in one call,
+    # and `async def count_tokens_batch(texts)`, returning the token count of each text, to
+    # tokenize many texts in one call
+
     def create_chat_completion_response(
         text: str,
         finish_reason: FinishReason = FinishReason.NONE,
@@ -107,11 +283,14 @@ def LLM(_cls):
         def __init__(self, *args, **kwargs):
             super().__init__(*args, **kwargs)
             self.config = BackendConfig()
-
-        def _build_gen_stream(
-            self, prompt: str, request: ChatCompletionRequest | CompletionRequest
-        ) -> AsyncGenerator[str, Any]:
-            config = GenerationConfig(
+            self._token_counts: OrderedDict[bytes, int] = OrderedDict()
+            # Label for this backend's metrics
+            self._model_name: str = self.config.name or _cls.__name__
+
+        def _generation_config(
+            self, request: ChatCompletionRequest | CompletionRequest
+        ) -> GenerationConfig:
+            return GenerationConfig(
                 max_new_tokens=request.max_new_tokens,
                 temperature=request.temperature,
                 top_k=request.top_k,
@@ -128,138 +307,370 @@ def LLM(_cls):
                 typical_p=request.typical_p,
                 watermark=request.watermark,
                 seed=request.seed,
+                cache_key=getattr(request, "cache_key", None) or None,
+                priority=request.priority,
             )
-            return self.generate(prompt, config)
-
-        async def ChatComplete(
-            self, request: ChatCompletionRequest, context: GrpcContext
-        ) -> ChatCompletionResponse:
-            prompt = self.config.apply_chat_template(request.chat_items)
 
+        def _build_gen_stream(
+            self, prompt: str, request: ChatCompletionRequest | CompletionRequest
+        ) -> AsyncGenerator[str | GenerationChunk, Any]:
+            return self.generate(prompt, self._generation_config(request))
+
+        async def _generate_text(
+            self,
+            prompt: str,
+            request: ChatCompletionRequest | CompletionRequest,
+            usage: TokenUsage,
+            context: GrpcContext | None,
+            metrics: RequestMetrics,
+        ) -> AsyncGenerator[str, Any]:
             gen_stream = self._build_gen_stream(prompt, request)
+            try:
+                async for chunk in gen_stream:
+                    # Stop as soon as the client has gone away rather than generating
+                    # up to max_new_tokens for nobody
+                    if context is not None and context.cancelled():
+                        break
+                    text = usage.add(chunk)
+                    if text:
+                        metrics.text(
+                            chunk.token_count
+                            if isinstance(chunk, GenerationChunk)
+                            else None
+                        )
+                    yield text
+            finally:
+                # Closing the generator lets backends release the request, e.g. vLLM aborts it
+                await _aclose(gen_stream)
+
+        async def _complete_text(
+            self,
+            prompt: str,
+            request: ChatCompletionRequest | CompletionRequest,
+            usage: TokenUsage,
+            context: GrpcContext | None,
+            metrics: RequestMetrics,
+        ) -> str:
+            """Generate the whole completion for a non-streaming RPC.
+
+            Backends with a `generate_full` method produce it in one call, skipping the
+            per-chunk overhead of the streaming path; others have their stream joined.
+            """
+            if hasattr(self, "generate_full"):
+                # The RPC is cancelled if the client goes away while generating, but
+                # don't start for a client that already has
+                if context is not None and context.cancelled():
+                    return ""
+                chunk: str | GenerationChunk = await self.generate_full(
+                    prompt, self._generation_config(request)
+                )
+                text = usage.add(chunk)
+                if text:
+                    # All of the text arrives at once, so time to first token is the
+                    # time to the whole completion
+                    metrics.text(usage.completion_tokens if usage.counted else None)
+                return text
+
+            parts: list[str] = []
+            async with aclosing(
+                self._generate_text(prompt, request, usage, context, metrics)
+            ) as gen_stream:
+                async for text_chunk in gen_stream:
+                    parts.append(text_chunk)
+            return "".join(parts)
+
+        def _generate_deltas(
+            self,
+            prompt: str,
+            request: ChatCompletionRequest | CompletionRequest,
+            usage: TokenUsage,
+            context: GrpcContext | None,
+            metrics: RequestMetrics,
+        ) -> AsyncGenerator[str, Any]:
+            streaming = self.config.streaming
+            return coalesce_deltas(
+                self._generate_text(prompt, request, usage, context, metrics),
+                streaming.flush_interval_ms / 1000,
+                streaming.max_bytes,
+            )
 
-            content = ""
-            async for text_chunk in gen_stream:
-                content += text_chunk
-
-            completion_token_count: int = await self.count_tokens(content)
+        async def _finish_usage(
+            self,
+            prompt: str,
+            completion: str,
+            usage: TokenUsage,
+            max_new_tokens: int,
+            metrics: RequestMetrics,
+        ) -> tuple[FinishReason, int, int]:
+            """Resolve the finish reason and token counts once generation has ended.
+
+            Counts reported by `generate` are used as-is; the tokenizer is only run for
+            what the backend didn't count, and prompt counts are cached by prompt hash.
+            """
+            if usage.counted:
+                completion_token_count = usage.completion_tokens
+            else:
+                completion_token_count = await self.count_tokens(completion)
 
-            if completion_token_count < request.max_new_tokens:
+            if completion_token_count < max_new_tokens:
                 finish_reason: FinishReason = FinishReason.STOP
             else:
                 finish_reason: FinishReason = FinishReason.LENGTH
 
-            prompt_token_count: int = await self.count_tokens(prompt)
+            prompt_token_count = usage.prompt_tokens
+            if prompt_token_count is None:
+                prompt_token_count = await self._count_tokens_cached(prompt)
+
+            metrics.tokens(prompt_token_count, completion_token_count)
+            return finish_reason, prompt_token_count, completion_token_count
+
+        def _cached_token_count(self, key: bytes) -> int | None:
+            count = self._token_counts.get(key)
+            if count is not None:
+                self._token_counts.move_to_end(key)
+            return count
+
+        def _remember_token_count(self, key: bytes, count: int):
+            self._token_counts[key] = count
+            if len(self._token_counts) > TOKEN_COUNT_CACHE_SIZE:
+                self._token_counts.popitem(last=False)
+
+        async def _count_tokens_cached(self, text: str) -> int:
+            """Count the text's tokens, remembering recent counts by the text's hash."""
+            key = hashlib.sha256(text.encode()).digest()
+            count = self._cached_token_count(key)
+            if count is None:
+                count = await self.count_tokens(text)
+                self._remember_token_count(key, count)
+            return count
+
+        async def _count_tokens_batch(self, texts: Sequence[str]) -> list[int]:
+            """Count the tokens of each text, tokenizing each distinct uncached text once.
+
+            Backends with a `count_tokens_batch` method tokenize all of them in one call.
+            """
+            keys = [hashlib.sha256(text.encode()).digest() for text in texts]
+            counts: dict[bytes, int] = {}
+            uncounted: dict[bytes, str] = {}
+            for key, text in zip(keys, texts):
+                count = self._cached_token_count(key)
+                if count is None:
+                    uncounted[key] = text
+                else:
+                    counts[key] = count
+
+            if uncounted:
+                if hasattr(self, "count_tokens_batch"):
+                    new_counts = await self.count_tokens_batch(list(uncounted.values()))
+                else:
+                    new_counts = [
+                        await self.count_tokens(text) for text in uncounted.values()
+                    ]
+                for key, count in zip(uncounted, new_counts):
+                    counts[key] = count
+                    self._remember_token_count(key, count)
+
+            return [counts[key] for key in keys]
 
-            response = create_chat_completion_response(
-                content, finish_reason, prompt_token_count, completion_token_count
-            )
+        async def ChatComplete(
+            self, request: ChatCompletionRequest, context: GrpcContext
+        ) -> ChatCompletionResponse:
+            with track_request(self._model_name, "ChatComplete") as metrics:
+                prompt = self.config.apply_chat_template(request.chat_items)
+
+                usage = TokenUsage()
+                content = await self._complete_text(
+                    prompt, request, usage, context, metrics
+                )
 
-            return response
+                (
+                    finish_reason,
+                    prompt_token_count,
+                    completion_token_count,
+                ) = await self._finish_usage(
+                    prompt, content, usage, request.max_new_tokens, metrics
+                )
+
+                response = create_chat_completion_response(
+                    content, finish_reason, prompt_token_count, completion_token_count
+                )
+
+                return response
 
         async def ChatCompleteStream(
             self, request: ChatCompletionRequest, context: GrpcContext
         ) -> AsyncGenerator[ChatCompletionResponse, Any]:
-            prompt = self.config.apply_chat_template(request.chat_items)
-
-            gen_stream = self._build_gen_stream(prompt, request)
+            with track_request(self._model_name, "ChatCompleteStream") as metrics:
+                prompt = self.config.apply_chat_template(request.chat_items)
 
-            last_delta: str | None = None
-            response_str: str = ""
-
-            async for text_chunk in gen_stream:
-                if last_delta:
-                    last_response: ChatCompletionResponse = (
-                        create_chat_completion_response(last_delta, FinishReason.NONE)
-                    )
-                    response_str += last_delta
+                usage = TokenUsage()
 
-                    yield last_response
+                last_delta: str | None = None
+                response_str: str = ""
 
-                last_delta = text_chunk
+                async with aclosing(
+                    self._generate_deltas(prompt, request, usage, context, metrics)
+                ) as gen_stream:
+                    async for text_chunk in gen_stream:
+                        if last_delta:
+                            last_response: ChatCompletionResponse = (
+                                create_chat_completion_response(
+                                    last_delta, FinishReason.NONE
+                                )
+                            )
+                            response_str += last_delta
 
-            if last_delta:
-                response_str += last_delta
+                            yield last_response
 
-            completion_token_count: int = await self.count_tokens(response_str)
+                        last_delta = text_chunk
 
-            if completion_token_count < request.max_new_tokens:
-                finish_reason: FinishReason = FinishReason.STOP
-            else:
-                finish_reason: FinishReason = FinishReason.LENGTH
+                if last_delta:
+                    response_str += last_delta
 
-            prompt_token_count: int = await self.count_tokens(prompt)
+                (
+                    finish_reason,
+                    prompt_token_count,
+                    completion_token_count,
+                ) = await self._finish_usage(
+                    prompt, response_str, usage, request.max_new_tokens, metrics
+                )
 
-            last_response: ChatCompletionResponse = create_chat_completion_response(
-                last_delta, finish_reason, prompt_token_count, completion_token_count
-            )
+                last_response: ChatCompletionResponse = create_chat_completion_response(
+                    last_delta,
+                    finish_reason,
+                    prompt_token_count,
+                    completion_token_count,
+                )
 
-            yield last_response
+                yield last_response
 
         async def Complete(
             self, request: CompletionRequest, context: GrpcContext
         ) -> CompletionResponse:
-            gen_stream = self._build_gen_stream(request.prompt, request)
-
-            content = ""
-            async for text_chunk in gen_stream:
-                content += text_chunk
-
-            completion_token_count: int = await self.count_tokens(content)
-
-            if completion_token_count < request.max_new_tokens:
-                finish_reason: FinishReason = FinishReason.STOP
-            else:
-                finish_reason: FinishReason = FinishReason.LENGTH
-
-            prompt_token_count: int = await self.count_tokens(request.prompt)
-
-            return create_completion_response(
-                content, finish_reason, prompt_token_count, completion_token_count
-            )
+            with track_request(self._model_name, "Complete") as metrics:
+                usage = TokenUsage()
+                content = await self._complete_text(
+                    request.prompt, request, usage, context, metrics
+                )
+
+                (
+                    finish_reason,
+                    prompt_token_count,
+                    completion_token_count,
+                ) = await self._finish_usage(
+                    request.prompt, content, usage, request.max_new_tokens, metrics
+                )
+
+                return create_completion_response(
+                    content, finish_reason, prompt_token_count, completion_token_count
+                )
 
         async def CompleteStream(
             self, request: CompletionRequest, context: GrpcContext
         ) -> AsyncGenerator[CompletionResponse, Any]:
-            gen_stream = self._build_gen_stream(request.prompt, request)
-            last_delta: str | None = None
-            response_str: str = ""
-
-            async for text_chunk in gen_stream:
-                if last_delta:
-                    last_response = create_completion_response(
-                        text=last_delta, finish_reason=FinishReason.NONE
+            with track_request(self._model_name, "CompleteStream") as metrics:
+                usage = TokenUsage()
+                last_delta: str | None = None
+                response_str: str = ""
+
+                async with aclosing(
+                    self._generate_deltas(
+                        request.prompt, request, usage, context, metrics
                     )
-                    response_str += last_delta
-
-                    yield last_response
+                ) as gen_stream:
+                    async for text_chunk in gen_stream:
+                        if last_delta:
+                            last_response = create_completion_response(
+                                text=last_delta, finish_reason=FinishReason.NONE
+                            )
+                            response_str += last_delta
 
-                last_delta = text_chunk
+                            yield last_response
 
-            if last_delta:
-                response_str += last_delta
+                        last_delta = text_chunk
 
-            completion_token_count: int = await self.count_tokens(response_str)
-
-            if completion_token_count < request.max_new_tokens:
-                finish_reason: FinishReason = FinishReason.STOP
-            else:
-                finish_reason: FinishReason = FinishReason.LENGTH
-
-            prompt_token_count: int = await self.count_tokens(request.prompt)
+                if last_delta:
+                    response_str += last_delta
 
-            last_response = create_completion_response(
-                last_delta, finish_reason, prompt_token_count, completion_token_count
-            )
+                (
+                    finish_reason,
+                    prompt_token_count,
+                    completion_token_count,
+                ) = await self._finish_usage(
+                    request.prompt,
+                    response_str,
+                    usage,
+                    request.max_new_tokens,
+                    metrics,
+                )
+
+                last_response = create_completion_response(
+                    last_delta,
+                    finish_reason,
+                    prompt_token_count,
+                    completion_token_count,
+                )
+
+                yield last_response
+
+        async def BatchChatComplete(
+            self, request: BatchChatCompletionRequest, context: GrpcContext
+        ) -> AsyncGenerator[BatchChatCompletionResponse, Any]:
+            # Each request of the batch is also recorded as a ChatComplete of its own
+            with track_request(self._model_name, "BatchChatComplete"):
+                async for index, response, error in run_batch(
+                    request.requests,
+                    lambda item: self.ChatComplete(item, context),
+                    self.config.server.max_batch_concurrency,
+                ):
+                    yield BatchChatCompletionResponse(
+                        index=index, response=response, error=error
+                    )
 
-            yield last_response
+        async def BatchComplete(
+            self, request: BatchCompletionRequest, context: GrpcContext
+        ) -> AsyncGenerator[BatchCompletionResponse, Any]:
+            # Each request of the batch is also recorded as a Complete of its own
+            with track_request(self._model_name, "BatchComplete"):
+                async for index, response, error in run_batch(
+                    request.requests,
+                    lambda item: self.Complete(item, context),
+                    self.config.server.max_batch_concurrency,
+                ):
+                    yield BatchCompletionResponse(
+                        index=index, response=response, error=error
+                    )
 
         async def CountTokens(
             self, request: TokenCountRequest, context: GrpcContext
         ) -> TokenCountResponse:
-            token_count: int = await self.count_tokens(request.text)
-
-            return TokenCountResponse(count=token_count)
+            with track_request(self._model_name, "CountTokens"):
+                token_count: int = await self._count_tokens_cached(request.text)
+
+                return TokenCountResponse(count=token_count)
+
+        async def BatchCountTokens(
+            self, request: BatchTokenCountRequest, context: GrpcContext
+        ) -> BatchTokenCountResponse:
+            with track_request(self._model_name, "BatchCountTokens"):
+                counts = await self._count_tokens_batch(request.texts)
+
+                return BatchTokenCountResponse(counts=counts)
+
+    async def warmup(self):
+        """Generate a token before reporting SERVING, so lazy initialization in the backend
+        (CUDA graphs, tokenizer loading, first allocations) isn't paid by a real request."""
+        request = CompletionRequest(prompt="Hello", max_new_tokens=1)
+        async with aclosing(
+            self._build_gen_stream(request.prompt, request)
+        ) as gen_stream:
+            async for _ in gen_stream:
+                pass
+        await self.count_tokens(request.prompt)
+
+    # serve() runs the warm-up before reporting SERVING; backends may bring their own
+    if not hasattr(_cls, "warmup"):
+        NewClass.warmup = warmup
 
     NewClass.__name__ = _cls.__name__
     return NewClass
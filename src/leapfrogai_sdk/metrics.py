@@ -0,0 +1,93 @@
+"""Prometheus metrics recorded by backends built on the SDK."""
+
+import asyncio
+import time
+from contextlib import contextmanager
+from typing import Generator
+
+from prometheus_client import Counter, Gauge, Histogram, start_http_server
+
+# Labels shared by every backend metric: the model's name and the RPC method
+LABELS = ["model", "rpc"]
+
+TIME_TO_FIRST_TOKEN = Histogram(
+    "leapfrogai_backend_time_to_first_token_seconds",
+    "Time from receiving a generation RPC to producing its first text.",
+    LABELS,
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+INTER_TOKEN_LATENCY = Histogram(
+    "leapfrogai_backend_inter_token_latency_seconds",
+    "Time between generated tokens after the first one.",
+    LABELS,
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+GENERATED_TOKENS = Counter(
+    "leapfrogai_backend_generated_tokens_total",
+    "Completion tokens generated.",
+    LABELS,
+)
+PROMPT_TOKENS = Counter(
+    "leapfrogai_backend_prompt_tokens_total",
+    "Prompt tokens processed.",
+    LABELS,
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "leapfrogai_backend_requests_in_flight",
+    "RPCs currently being handled.",
+    LABELS,
+)
+REQUEST_ERRORS = Counter(
+    "leapfrogai_backend_request_errors_total",
+    "RPCs that failed with an exception.",
+    LABELS,
+)
+
+
+class RequestMetrics:
+    """Latency and token bookkeeping for a single generation RPC."""
+
+    def __init__(self, model: str, rpc: str):
+        self.labels = (model, rpc)
+        self.started = time.perf_counter()
+        self.last_text: float | None = None
+
+    def text(self, token_count: int | None = None):
+        """Record that generated text arrived, covering `token_count` tokens if known."""
+        now = time.perf_counter()
+        if self.last_text is None:
+            TIME_TO_FIRST_TOKEN.labels(*self.labels).observe(now - self.started)
+        else:
+            # Spread the gap over the tokens it produced so chunked output isn't over-counted
+            tokens = token_count if token_count else 1
+            INTER_TOKEN_LATENCY.labels(*self.labels).observe(
+                (now - self.last_text) / tokens
+            )
+        self.last_text = now
+
+    def tokens(self, prompt_tokens: int, completion_tokens: int):
+        PROMPT_TOKENS.labels(*self.labels).inc(max(prompt_tokens, 0))
+        GENERATED_TOKENS.labels(*self.labels).inc(max(completion_tokens, 0))
+
+
+@contextmanager
+def track_request(model: str, rpc: str) -> Generator[RequestMetrics, None, None]:
+    """Count an RPC as in flight for the duration of the block, recording any error."""
+    in_flight = REQUESTS_IN_FLIGHT.labels(model, rpc)
+    in_flight.inc()
+    try:
+        yield RequestMetrics(model, rpc)
+    except (asyncio.CancelledError, GeneratorExit):
+        # The client going away is not a backend error
+        raise
+    except Exception:
+        REQUEST_ERRORS.labels(model, rpc).inc()
+        raise
+    finally:
+        in_flight.dec()
+
+
+def start_metrics_server(port: int, host: str = "0.0.0.0"):
+    """Serve /metrics over HTTP on a background thread; returns the HTTP server."""
+    server, _ = start_http_server(port, host)
+    return server
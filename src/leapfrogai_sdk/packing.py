@@ -0,0 +1,44 @@
+"""Encoding of embedding vectors for EmbeddingResponse messages."""
+
+import struct
+from typing import Iterable, Sequence
+
+from leapfrogai_sdk.embeddings.embeddings_pb2 import (
+    Embedding,
+    EmbeddingEncoding,
+    EmbeddingResponse,
+)
+
+# struct format characters for the little-endian packed encodings
+_PACKED_FORMATS = {
+    EmbeddingEncoding.FLOAT32: ("f", "<f4"),
+    EmbeddingEncoding.FLOAT16: ("e", "<f2"),
+}
+
+
+def embedding_response(
+    vectors: Iterable[Sequence[float]],
+    encoding: EmbeddingEncoding = EmbeddingEncoding.FLOAT_LIST,
+) -> EmbeddingResponse:
+    """Build an EmbeddingResponse in the encoding a request asked for.
+
+    Backends can pass `request.encoding` straight through. Packed encodings store each
+    vector as little-endian bytes, which is far smaller and cheaper to decode than a
+    repeated float field. Vectors may be lists or numpy arrays.
+    """
+    if encoding not in _PACKED_FORMATS:
+        return EmbeddingResponse(
+            embeddings=[Embedding(embedding=vector) for vector in vectors],
+            encoding=EmbeddingEncoding.FLOAT_LIST,
+        )
+
+    char, dtype = _PACKED_FORMATS[encoding]
+    embeddings = []
+    for vector in vectors:
+        if hasattr(vector, "astype"):
+            # numpy arrays convert without going through Python floats
+            packed = vector.astype(dtype, copy=False).tobytes()
+        else:
+            packed = struct.pack(f"<{len(vector)}{char}", *vector)
+        embeddings.append(Embedding(packed=packed))
+    return EmbeddingResponse(embeddings=embeddings, encoding=encoding)
@@ -1,73 +1,161 @@
 import asyncio
+import importlib
+import inspect
 import signal
-from concurrent import futures
+from types import SimpleNamespace
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from leapfrogai_sdk.config import ServerConfig
+
+# Services registered for a backend implementing all of their required methods, as
+# (required methods, module, registration function, service name). The service's other
+# RPCs answer UNIMPLEMENTED if the backend lacks them. Modules are only imported for
+# services the backend implements.
+SERVICES = (
+    (
+        ("ChatComplete",),
+        "leapfrogai_sdk.chat.chat_pb2_grpc",
+        "add_ChatCompletionServiceServicer_to_server",
+        "chat.ChatCompletionService",
+    ),
+    (
+        ("ChatCompleteStream",),
+        "leapfrogai_sdk.chat.chat_pb2_grpc",
+        "add_ChatCompletionStreamServiceServicer_to_server",
+        "chat.ChatCompletionStreamService",
+    ),
+    (
+        ("BatchChatComplete",),
+        "leapfrogai_sdk.chat.chat_pb2_grpc",
+        "add_BatchChatCompletionServiceServicer_to_server",
+        "chat.BatchChatCompletionService",
+    ),
+    (
+        ("Complete",),
+        "leapfrogai_sdk.completion.completion_pb2_grpc",
+        "add_CompletionServiceServicer_to_server",
+        "completion.CompletionService",
+    ),
+    (
+        ("CompleteStream",),
+        "leapfrogai_sdk.completion.completion_pb2_grpc",
+        "add_CompletionStreamServiceServicer_to_server",
+        "completion.CompletionStreamService",
+    ),
+    (
+        ("BatchComplete",),
+        "leapfrogai_sdk.completion.completion_pb2_grpc",
+        "add_BatchCompletionServiceServicer_to_server",
+        "completion.BatchCompletionService",
+    ),
+    (
+        ("CreateEmbedding",),
+        "leapfrogai_sdk.embeddings.embeddings_pb2_grpc",
+        "add_EmbeddingsServiceServicer_to_server",
+        "embeddings.EmbeddingsService",
+    ),
+    (
+        ("Name",),
+        "leapfrogai_sdk.name.name_pb2_grpc",
+        "add_NameServiceServicer_to_server",
+        "name.NameService",
+    ),
+    (
+        ("Transcribe", "Translate"),
+        "leapfrogai_sdk.audio.audio_pb2_grpc",
+        "add_AudioServicer_to_server",
+        "audio.Audio",
+    ),
+    (
+        ("CountTokens",),
+        "leapfrogai_sdk.counting.counting_pb2_grpc",
+        "add_TokenCountServiceServicer_to_server",
+        "counting.TokenCountService",
+    ),
+)
+
+
+# Optional backend methods run after the server starts listening and before it reports
+# SERVING, e.g. to load weights and run a warm-up inference; either may be sync or async.
+# Health checks are answered meanwhile, reporting NOT_SERVING until both have finished,
+# so backends should load their models here rather than in __init__
+LIFECYCLE_HOOKS = ("load", "warmup")
+
+
+async def serve(
+    o,
+    host="0.0.0.0",
+    port=50051,
+    uds: str | None = None,
+    config: "ServerConfig | None" = None,
+):
+    # gRPC and the server's own modules are imported here rather than at module level so
+    # `import leapfrogai_sdk` stays cheap for code that never starts a server
+    from concurrent import futures
+
+    import grpc
+    from grpc_health.v1 import health, health_pb2_grpc
+    from grpc_reflection.v1alpha import reflection
+
+    from leapfrogai_sdk.config import BackendConfig
+    from leapfrogai_sdk.health import HealthServicer
+    from leapfrogai_sdk.metrics import start_metrics_server
+
+    # Server limits come from the `server` section of the backend's config.yaml by default
+    if config is None:
+        config = BackendConfig().server
 
-import grpc
-from grpc_health.v1 import health, health_pb2, health_pb2_grpc
-from grpc_reflection.v1alpha import reflection
-
-from leapfrogai_sdk.audio import audio_pb2_grpc
-from leapfrogai_sdk.chat import chat_pb2_grpc
-from leapfrogai_sdk.completion import completion_pb2_grpc
-from leapfrogai_sdk.counting import counting_pb2_grpc
-from leapfrogai_sdk.embeddings import embeddings_pb2_grpc
-from leapfrogai_sdk.name import name_pb2_grpc
-
-
-async def serve(o, host="0.0.0.0", port=50051):
     # Create a tuple of all of the services we want to export via reflection.
     services = (reflection.SERVICE_NAME, health.SERVICE_NAME)
 
-    # Create a gRPC server
-    server = grpc.aio.server(futures.ThreadPoolExecutor(max_workers=40))
-
-    if hasattr(o, "ChatComplete"):
-        chat_pb2_grpc.add_ChatCompletionServiceServicer_to_server(o, server)
-        services += ("chat.ChatCompletionService",)
-
-    if hasattr(o, "ChatCompleteStream"):
-        chat_pb2_grpc.add_ChatCompletionStreamServiceServicer_to_server(o, server)
-        services += ("chat.ChatCompletionStreamService",)
-
-    if hasattr(o, "Complete"):
-        completion_pb2_grpc.add_CompletionServiceServicer_to_server(o, server)
-        services += ("completion.CompletionService",)
-
-    if hasattr(o, "CompleteStream"):
-        completion_pb2_grpc.add_CompletionStreamServiceServicer_to_server(o, server)
-        services += ("completion.CompletionStreamService",)
-
-    if hasattr(o, "CreateEmbedding"):
-        embeddings_pb2_grpc.add_EmbeddingsServiceServicer_to_server(o, server)
-        services += ("embeddings.EmbeddingsService",)
-
-    if hasattr(o, "Name"):
-        name_pb2_grpc.add_NameServiceServicer_to_server(o, server)
-        services += ("name.NameService",)
-
-    if hasattr(o, "Transcribe") and hasattr(o, "Translate"):
-        audio_pb2_grpc.add_AudioServicer_to_server(o, server)
-        services += ("audio.Audio",)
-
-    if hasattr(o, "CountTokens"):
-        counting_pb2_grpc.add_TokenCountServiceServicer_to_server(o, server)
-        services += ("counting.TokenCountService",)
+    # Health checks report NOT_SERVING until the backend is ready and while it's overloaded
+    # NOTE: Health checks can be validated via `grpcurl --plaintext -d {"service": "SERVICE_NAME"}' localhost:50051 grpc.health.v1.Health/Check`
+    # RPCs over the concurrency limit are rejected there too, rather than through gRPC's
+    # own limit, which would also count the Health/Watch stream each API channel holds
+    health_servicer = HealthServicer(
+        config.overload_threshold,
+        config.overload_recovery,
+        config.max_concurrent_rpcs,
+    )
+
+    # Create a gRPC server that accepts keepalive pings from the API's long-lived channels
+    server = grpc.aio.server(
+        futures.ThreadPoolExecutor(max_workers=config.max_workers),
+        interceptors=[health_servicer.interceptor()],
+        options=config.grpc_options(),
+    )
+
+    for methods, module, register, service in SERVICES:
+        if all(hasattr(o, method) for method in methods):
+            module = importlib.import_module(module)
+            getattr(module, register)(_servicer(o, module, register), server)
+            services += (service,)
 
     # Do reflection things to list all the gRPC services (allows for `grpcurl --plaintext localhost:50051 list`)
     reflection.enable_server_reflection(services, server)
 
-    # Create a health_servicer and list all services as 'healthy'
-    # NOTE: Health checks can be validated via `grpcurl --plaintext -d {"service": "SERVICE_NAME"}' localhost:50051 grpc.health.v1.Health/Check`
-    health_servicer = health.HealthServicer(experimental_non_blocking=True)
     health_pb2_grpc.add_HealthServicer_to_server(health_servicer, server)
-    for service in services:
-        # TODO: I still need to modify the protos for the services to add a 'check' endpoint
-        health_servicer.set(service, health_pb2.HealthCheckResponse.SERVING)
+    health_servicer.watch(services)
 
     # Listen on port 50051
     server.add_insecure_port("{}:{}".format(host, port))
     print("Starting server. Listening on {}:{}.".format(host, port))
-    await server.start()
+
+    # Optionally also listen on a Unix domain socket so a co-located API can skip TCP
+    if uds:
+        server.add_insecure_port("unix:{}".format(uds))
+        print("Listening on unix:{}.".format(uds))
+
+    # Optionally expose the backend's metrics for Prometheus to scrape
+    metrics_server = None
+    if config.metrics_port is not None:
+        metrics_server = start_metrics_server(config.metrics_port, host)
+        print(
+            "Serving metrics on http://{}:{}/metrics.".format(
+                host, metrics_server.server_port
+            )
+        )
 
     # Setup graceful shutdown
     shutdown_event = asyncio.Event()
@@ -80,9 +168,56 @@ async def serve(o, host="0.0.0.0", port=50051):
     for sig in (signal.SIGINT, signal.SIGTERM):
         loop.add_signal_handler(sig, signal_handler)
 
-    # Wait for shutdown signal
-    await shutdown_event.wait()
-
-    # Properly shutdown the server
-    await server.stop(5)
-    print("Server has been shut down")
+    try:
+        await server.start()
+
+        # Health checks can already be answered while the backend loads and warms up
+        for hook in LIFECYCLE_HOOKS:
+            if hasattr(o, hook):
+                print("Running {}.".format(hook))
+                await _run_hook(getattr(o, hook))
+        health_servicer.set_ready(True)
+        print("Ready to serve requests.")
+
+        # Wait for shutdown signal
+        await shutdown_event.wait()
+    finally:
+        # Properly shutdown the server, also when serving is cancelled
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.remove_signal_handler(sig)
+        # Report NOT_SERVING so clients move away before in-flight RPCs are drained
+        health_servicer.enter_graceful_shutdown()
+        await server.stop(5)
+        if metrics_server is not None:
+            metrics_server.shutdown()
+            metrics_server.server_close()
+        print("Server has been shut down")
+
+
+async def _run_hook(hook):
+    if inspect.iscoroutinefunction(hook):
+        await hook()
+    else:
+        # Synchronous hooks, e.g. loading weights, must not block health checks
+        await asyncio.to_thread(hook)
+
+
+def _servicer(o, module, register: str) -> SimpleNamespace:
+    """The backend's handlers for a service's RPCs, answering UNIMPLEMENTED where it lacks one."""
+    # Generated modules name the servicer base class after its registration function
+    base = getattr(module, register.removeprefix("add_").removesuffix("_to_server"))
+    rpcs = [name for name in vars(base) if not name.startswith("_")]
+    return SimpleNamespace(
+        **{rpc: getattr(o, rpc, None) or _unimplemented(rpc) for rpc in rpcs}
+    )
+
+
+def _unimplemented(rpc: str):
+    import grpc
+
+    async def handler(request, context):
+        await context.abort(
+            grpc.StatusCode.UNIMPLEMENTED, "{} is not implemented".format(rpc)
+        )
+
+    return handler
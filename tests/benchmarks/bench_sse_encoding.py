@@ -0,0 +1,69 @@
+"""Microbenchmark of the per-chunk cost of encoding streamed chat responses as SSE frames.
+
+Compares building a pydantic ChatCompletionResponse per token (the previous approach)
+against the precompiled ChunkEncoder used by `recv_chat`.
+
+Usage (from the root of the repository):
+    PYTHONPATH=src python tests/benchmarks/bench_sse_encoding.py
+"""
+
+import time
+import timeit
+import uuid
+
+import leapfrogai_sdk as lfai
+from leapfrogai_api.backend.helpers import chat_chunk_encoder
+from leapfrogai_api.typedef import Usage
+from leapfrogai_api.typedef.chat import (
+    ChatCompletionResponse,
+    ChatDelta,
+    ChatStreamChoice,
+)
+from leapfrogai_api.typedef.completion import FinishReason
+
+CHUNKS = 20_000
+TOKEN = " token"
+USAGE = lfai.CompletionUsage()
+
+
+def pydantic_frame() -> str:
+    return (
+        "data: "
+        + ChatCompletionResponse(
+            id=str(uuid.uuid4()),
+            object="chat.completion.chunk",
+            created=int(time.time()),
+            model="vllm",
+            choices=[
+                ChatStreamChoice(
+                    index=0,
+                    delta=ChatDelta(role="assistant", content=TOKEN),
+                    finish_reason=FinishReason(0).to_finish_reason(),
+                )
+            ],
+            usage=Usage(
+                prompt_tokens=USAGE.prompt_tokens,
+                completion_tokens=USAGE.completion_tokens,
+                total_tokens=USAGE.total_tokens,
+            ),
+        ).model_dump_json()
+        + "\n\n"
+    )
+
+
+def main():
+    encoder = chat_chunk_encoder("vllm")
+
+    results = {
+        "pydantic model_dump_json": timeit.timeit(pydantic_frame, number=CHUNKS),
+        "ChunkEncoder.encode": timeit.timeit(
+            lambda: encoder.encode(TOKEN, 0, USAGE), number=CHUNKS
+        ),
+    }
+
+    for name, seconds in results.items():
+        print(f"{name:<28} {seconds / CHUNKS * 1e6:8.2f} us/chunk")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark of import time and memory at startup for the API, the SDK and each backend.
+
+Every target is imported in a fresh interpreter, which reports how long the import took
+and its peak resident set size. Backends are imported from their package directory, as
+`lfai-cli` does; backends whose dependencies aren't installed are reported as skipped.
+
+Usage (from the root of the repository):
+    PYTHONPATH=src python tests/benchmarks/bench_startup.py
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+RUNS = 5
+PACKAGES = os.path.join(os.path.dirname(__file__), "..", "..", "packages")
+
+# (name, directory to import from, import statement)
+TARGETS = [
+    ("python (baseline)", None, "pass"),
+    ("leapfrogai_sdk", None, "import leapfrogai_sdk"),
+    (
+        "leapfrogai_sdk (embeddings servicer)",
+        None,
+        "from leapfrogai_sdk import EmbeddingsServiceServicer",
+    ),
+    ("leapfrogai_sdk.llm", None, "import leapfrogai_sdk.llm"),
+    ("leapfrogai_api", None, "import leapfrogai_api.main"),
+    ("repeater", os.path.join(PACKAGES, "repeater"), "import main"),
+    ("text-embeddings", os.path.join(PACKAGES, "text-embeddings"), "import main"),
+    ("whisper", os.path.join(PACKAGES, "whisper"), "import main"),
+    ("llama-cpp-python", os.path.join(PACKAGES, "llama-cpp-python"), "import main"),
+    ("vllm", os.path.join(PACKAGES, "vllm", "src"), "import main"),
+]
+
+PROBE = """
+import json, resource, sys, time
+sys.path.insert(0, ".")
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    "modules": len(sys.modules),
+}}))
+"""
+
+
+def measure(directory: str | None, statement: str) -> dict | str:
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(statement=statement)],
+        cwd=directory,
+        capture_output=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": os.path.abspath("src")},
+    )
+    if result.returncode != 0:
+        lines = result.stderr.strip().splitlines()
+        return lines[-1] if lines else f"exit code {result.returncode}"
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    print(f"{'target':40} {'import ms':>10} {'max RSS MiB':>12} {'modules':>8}")
+    for name, directory, statement in TARGETS:
+        samples = []
+        for _ in range(RUNS):
+            sample = measure(directory, statement)
+            if isinstance(sample, str):
+                print(f"{name:40} skipped: {sample[:60]}")
+                break
+            samples.append(sample)
+        else:
+            seconds = statistics.median(s["seconds"] for s in samples)
+            rss = statistics.median(s["max_rss_kb"] for s in samples) / 1024
+            print(
+                f"{name:40} {seconds * 1e3:10.1f} {rss:12.1f} {samples[-1]['modules']:8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
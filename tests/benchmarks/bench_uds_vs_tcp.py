@@ -0,0 +1,68 @@
+"""Benchmark of small embedding call latency over TCP versus a Unix domain socket.
+
+Starts an in-process gRPC server exposing a trivial EmbeddingsService on both a TCP port
+and a Unix domain socket, then times sequential CreateEmbedding calls over a warm channel
+to each, the way the API reaches a co-located backend.
+
+Usage (from the root of the repository):
+    PYTHONPATH=src python tests/benchmarks/bench_uds_vs_tcp.py
+"""
+
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+import grpc
+
+import leapfrogai_sdk as lfai
+from leapfrogai_sdk.embeddings import embeddings_pb2_grpc
+
+CALLS = 2_000
+EMBEDDING = lfai.Embedding(embedding=[0.0] * 768)
+
+
+class Embeddings(lfai.EmbeddingsServiceServicer):
+    async def CreateEmbedding(self, request, context):
+        return lfai.EmbeddingResponse(embeddings=[EMBEDDING] * len(request.inputs))
+
+
+async def time_calls(target: str) -> list[float]:
+    async with grpc.aio.insecure_channel(target) as channel:
+        stub = lfai.EmbeddingsServiceStub(channel)
+        request = lfai.EmbeddingRequest(inputs=["What is LeapfrogAI?"])
+        await stub.CreateEmbedding(request)  # warm up the connection
+
+        latencies = []
+        for _ in range(CALLS):
+            start = time.perf_counter()
+            await stub.CreateEmbedding(request)
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        uds = os.path.join(tmp, "embeddings.sock")
+
+        server = grpc.aio.server()
+        embeddings_pb2_grpc.add_EmbeddingsServiceServicer_to_server(
+            Embeddings(), server
+        )
+        port = server.add_insecure_port("127.0.0.1:0")
+        server.add_insecure_port(f"unix:{uds}")
+        await server.start()
+
+        for name, target in (("TCP", f"127.0.0.1:{port}"), ("UDS", f"unix://{uds}")):
+            latencies = sorted(await time_calls(target))
+            print(
+                f"{name}: p50 {statistics.median(latencies) * 1e6:7.1f} us, "
+                f"p99 {latencies[int(len(latencies) * 0.99)] * 1e6:7.1f} us"
+            )
+
+        await server.stop(None)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,195 @@
+"""Benchmark of how the vLLM backend delivers generated tokens, using a fake engine.
+
+Replaces the `vllm` package with a fake engine that emits one token per request every
+`TOKEN_INTERVAL` seconds, then runs the backend's real `Model.generate` for concurrent
+requests. Reports time to first token, inter-token latency, chunks without text sent
+upstream, the peak number of threads, and the CPU time the process burns both while
+generating and while idle.
+
+Usage (from the root of the repository, no GPU or vLLM install needed):
+    PYTHONPATH=src python tests/benchmarks/bench_vllm_output_delivery.py
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import threading
+import time
+import types
+from dataclasses import dataclass, field
+
+CONCURRENT_REQUESTS = 16
+TOKENS_PER_REQUEST = 64
+TOKEN_INTERVAL = 0.01  # Seconds between tokens of a request, like a decode step
+IDLE_SECONDS = 1.0
+
+VLLM_PACKAGE = os.path.join(os.path.dirname(__file__), "..", "..", "packages", "vllm")
+
+
+@dataclass
+class FakeCompletion:
+    text: str
+    token_ids: list[int]
+
+
+@dataclass
+class FakeRequestOutput:
+    request_id: str
+    outputs: list[FakeCompletion]
+    prompt_token_ids: list[int]
+    finished: bool = False
+
+
+@dataclass
+class FakeEngine:
+    aborted: list[str] = field(default_factory=list)
+
+    async def generate(self, prompt, sampling_params, request_id):
+        text = ""
+        for i in range(TOKENS_PER_REQUEST):
+            await asyncio.sleep(TOKEN_INTERVAL)
+            text += "tok "
+            yield FakeRequestOutput(
+                request_id,
+                [FakeCompletion(text, list(range(i + 1)))],
+                prompt_token_ids=[0] * 8,
+                finished=i == TOKENS_PER_REQUEST - 1,
+            )
+
+    async def abort(self, request_id):
+        self.aborted.append(request_id)
+
+    async def get_tokenizer(self):
+        return types.SimpleNamespace(tokenize=str.split)
+
+
+def install_fake_vllm():
+    """Register a fake `vllm` package exposing the names the backend imports."""
+    counter = iter(range(sys.maxsize))
+    modules = {
+        "vllm": {"SamplingParams": lambda **params: params},
+        "vllm.engine": {},
+        "vllm.engine.arg_utils": {"AsyncEngineArgs": lambda **args: args},
+        "vllm.engine.async_llm_engine": {
+            "AsyncLLMEngine": types.SimpleNamespace(
+                from_engine_args=lambda args: FakeEngine()
+            )
+        },
+        "vllm.outputs": {"RequestOutput": FakeRequestOutput},
+        "vllm.utils": {"random_uuid": lambda: f"request-{next(counter)}"},
+    }
+    for name, attributes in modules.items():
+        module = types.ModuleType(name)
+        module.__dict__.update(attributes)
+        sys.modules[name] = module
+
+    for option, value in {
+        "QUANTIZATION": "None",
+        "LOAD_FORMAT": "auto",
+        "ENFORCE_EAGER": "False",
+        "GPU_MEMORY_UTILIZATION": "0.9",
+        "ENGINE_USE_RAY": "False",
+        "WORKER_USE_RAY": "False",
+        "TRUST_REMOTE_CODE": "False",
+        "TENSOR_PARALLEL_SIZE": "1",
+    }.items():
+        os.environ.setdefault(f"VLLM_{option}", value)
+    os.environ.setdefault(
+        "LEAPFROGAI_CONFIG_FILE", os.path.join(VLLM_PACKAGE, "config.yaml")
+    )
+
+
+def generation_config():
+    from leapfrogai_sdk.llm import GenerationConfig
+
+    return GenerationConfig(
+        max_new_tokens=TOKENS_PER_REQUEST,
+        temperature=0.1,
+        top_k=0,
+        top_p=1.0,
+        do_sample=True,
+        n=1,
+        stop=[],
+        repetition_penalty=1.0,
+        presence_penalty=0.0,
+        best_of="",
+        logit_bias={},
+        return_full_text=False,
+        truncate=0,
+        typical_p=1.0,
+        watermark=False,
+        seed=0,
+    )
+
+
+async def timed_request(model, config) -> tuple[float, list[float], int]:
+    start = time.perf_counter()
+    arrivals: list[float] = []
+    empty = 0
+    async for chunk in model.generate("What is LeapfrogAI?", config):
+        if chunk.text:
+            arrivals.append(time.perf_counter())
+        else:
+            empty += 1
+    gaps = [later - earlier for earlier, later in zip(arrivals, arrivals[1:])]
+    return arrivals[0] - start, gaps, empty
+
+
+async def peak_threads(stop: asyncio.Event) -> int:
+    peak = threading.active_count()
+    while not stop.is_set():
+        peak = max(peak, threading.active_count())
+        await asyncio.sleep(0.001)
+    return peak
+
+
+async def main():
+    install_fake_vllm()
+    sys.path.insert(0, os.path.abspath(os.path.join(VLLM_PACKAGE, "src")))
+    from main import Model
+
+    model = Model()
+    model.load()
+    config = generation_config()
+
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(peak_threads(stop))
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    results = await asyncio.gather(
+        *(timed_request(model, config) for _ in range(CONCURRENT_REQUESTS))
+    )
+    stop.set()
+    threads = await sampler
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    idle_start = time.process_time()
+    await asyncio.sleep(IDLE_SECONDS)
+    idle_cpu = time.process_time() - idle_start
+
+    ttfts = sorted(ttft for ttft, _, _ in results)
+    gaps = sorted(gap for _, request_gaps, _ in results for gap in request_gaps)
+    empty = sum(count for _, _, count in results)
+
+    print(
+        f"{CONCURRENT_REQUESTS} requests x {TOKENS_PER_REQUEST} tokens, "
+        f"one token per {TOKEN_INTERVAL * 1e3:.0f} ms"
+    )
+    print(
+        f"TTFT:        p50 {statistics.median(ttfts) * 1e3:7.2f} ms, "
+        f"max {ttfts[-1] * 1e3:7.2f} ms"
+    )
+    print(
+        f"Inter-token: p50 {statistics.median(gaps) * 1e3:7.2f} ms, "
+        f"p99 {gaps[int(len(gaps) * 0.99)] * 1e3:7.2f} ms"
+    )
+    print(f"Empty chunks sent upstream: {empty}")
+    print(f"Peak threads: {threads}")
+    print(f"CPU while generating: {cpu:.2f}s over {wall:.2f}s wall")
+    print(f"CPU while idle:       {idle_cpu:.2f}s over {IDLE_SECONDS:.2f}s wall")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -10,11 +10,15 @@ from fastapi.security import HTTPBearer
 from fastapi.testclient import TestClient
 from starlette.middleware.base import _CachedRequest
 from supabase import ClientOptions
+
+import leapfrogai_sdk as lfai
+from leapfrogai_api.backend.grpc_client import batch_completion_raw
 from leapfrogai_api.typedef.chat import ChatCompletionRequest, ChatMessage
 from leapfrogai_api.typedef.completion import CompletionRequest
 from leapfrogai_api.typedef.embeddings import CreateEmbeddingRequest
 from leapfrogai_api.main import app
 from leapfrogai_api.routers.supabase_session import init_supabase_client
+from leapfrogai_api.typedef.models import Model
 from tests.utils.data_path import data_path, WAV_FILE, WAV_FILE_ARABIC
 
 security = HTTPBearer()
@@ -84,7 +88,15 @@ def test_config_load():
         assert response.status_code == 200
         expected_response = {
             "config_sources": {"repeater-test-config.yaml": [MODEL]},
-            "models": {MODEL: {"backend": "localhost:50051", "name": MODEL}},
+            "models": {
+                MODEL: {
+                    "backend": "localhost:50051",
+                    "backends": ["localhost:50051"],
+                    "max_concurrent_requests": None,
+                    "max_queued_requests": None,
+                    "name": MODEL,
+                }
+            },
             "directory": LFAI_CONFIG_PATH,
             "filename": LFAI_CONFIG_FILENAME,
         }
@@ -106,7 +118,15 @@ def test_config_delete(tmp_path):
 
         expected_response = {
             "config_sources": {"repeater-test-config.yaml": [MODEL]},
-            "models": {MODEL: {"backend": "localhost:50051", "name": MODEL}},
+            "models": {
+                MODEL: {
+                    "backend": "localhost:50051",
+                    "backends": ["localhost:50051"],
+                    "max_concurrent_requests": None,
+                    "max_queued_requests": None,
+                    "name": MODEL,
+                }
+            },
             "directory": os.environ["LFAI_CONFIG_PATH"],
             "filename": LFAI_CONFIG_FILENAME,
         }
@@ -541,6 +561,32 @@ def test_token_count(dummy_auth_middleware):
         assert response_data["token_count"] == len(input_text)
 
 
+@pytest.mark.skipif(
+    os.environ.get("LFAI_RUN_REPEATER_TESTS") != "true",
+    reason="LFAI_RUN_REPEATER_TESTS envvar was not set to true",
+)
+@pytest.mark.asyncio
+async def test_batch_completion():
+    """Test completing a batch of prompts in one backend call."""
+    prompts = ["first prompt", "second", "the third prompt of the batch"]
+    requests = [
+        lfai.CompletionRequest(prompt=prompt, max_new_tokens=100) for prompt in prompts
+    ]
+
+    results = [
+        result
+        async for result in batch_completion_raw(
+            Model(name=MODEL, backend="localhost:50051"), requests
+        )
+    ]
+
+    assert sorted(result.index for result in results) == [0, 1, 2]
+    for result in results:
+        assert result.error == ""
+        assert result.response.choices[0].text == prompts[result.index]
+        assert result.response.usage.completion_tokens == len(prompts[result.index])
+
+
 @pytest.mark.skipif(
     os.environ.get("LFAI_RUN_REPEATER_TESTS") != "true"
     or os.environ.get("DEV") != "true",
@@ -0,0 +1,116 @@
+import asyncio
+
+import pytest
+
+from leapfrogai_api.backend.active_runs import ActiveRuns, RunCancelledError
+
+
+@pytest.mark.asyncio
+async def test_cancel_stops_generation():
+    active_runs = ActiveRuns()
+    started = asyncio.Event()
+    stopped = asyncio.Event()
+
+    async def generation():
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        finally:
+            stopped.set()
+
+    waiter = asyncio.create_task(active_runs.run("run-1", generation()))
+    await started.wait()
+
+    assert active_runs.cancel("run-1")
+    with pytest.raises(RunCancelledError):
+        await waiter
+    assert stopped.is_set()
+    assert not active_runs.cancel("run-1")
+    assert not active_runs.tasks
+
+
+@pytest.mark.asyncio
+async def test_cancel_stream():
+    active_runs = ActiveRuns()
+
+    async def chunks():
+        yield "first"
+        await asyncio.sleep(10)
+        yield "never"
+
+    received = []
+    with pytest.raises(RunCancelledError):
+        async for chunk in active_runs.stream("run-1", chunks()):
+            received.append(chunk)
+            asyncio.get_running_loop().call_soon(active_runs.cancel, "run-1")
+
+    assert received == ["first"]
+
+
+@pytest.mark.asyncio
+async def test_cancel_between_chunks():
+    active_runs = ActiveRuns()
+    stopped = asyncio.Event()
+
+    async def chunks():
+        try:
+            for i in range(100):
+                await asyncio.sleep(0)
+                yield i
+        finally:
+            stopped.set()
+
+    received = []
+    with pytest.raises(RunCancelledError):
+        async for chunk in active_runs.stream("run-1", chunks()):
+            received.append(chunk)
+            # e.g. while the previous chunk is being written to the client
+            await asyncio.sleep(0)
+            assert active_runs.cancel("run-1")
+
+    assert received == [0]
+    assert stopped.is_set()
+    assert not active_runs.tasks
+
+
+@pytest.mark.asyncio
+async def test_stream_errors_reach_the_caller():
+    active_runs = ActiveRuns()
+
+    async def chunks():
+        yield "first"
+        raise ValueError("backend failed")
+
+    received = []
+    with pytest.raises(ValueError):
+        async for chunk in active_runs.stream("run-1", chunks()):
+            received.append(chunk)
+
+    assert received == ["first"]
+
+
+@pytest.mark.asyncio
+async def test_stream_completes():
+    active_runs = ActiveRuns()
+
+    async def chunks():
+        for chunk in ["a", "b"]:
+            yield chunk
+
+    assert [chunk async for chunk in active_runs.stream("run-1", chunks())] == [
+        "a",
+        "b",
+    ]
+    assert not active_runs.tasks
+
+
+@pytest.mark.asyncio
+async def test_caller_cancellation_is_not_a_cancelled_run():
+    active_runs = ActiveRuns()
+
+    waiter = asyncio.create_task(active_runs.run("run-1", asyncio.sleep(10)))
+    await asyncio.sleep(0)
+    waiter.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException, status
+
+from leapfrogai_api.backend.admission import AdmissionRegistry
+from leapfrogai_api.typedef.models import Model
+
+
+@pytest.mark.asyncio
+async def test_rejects_with_retry_after_once_queue_is_full():
+    model = Model(
+        name="vllm",
+        backend="localhost:50051",
+        max_concurrent_requests=1,
+        max_queued_requests=1,
+    )
+    controller = AdmissionRegistry().get(model)
+
+    running = await controller.acquire()
+    queued = asyncio.create_task(controller.acquire())
+    await asyncio.sleep(0)
+
+    with pytest.raises(HTTPException) as exc:
+        await controller.acquire()
+    assert exc.value.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert exc.value.headers["Retry-After"] == "1"
+
+    running.release()
+    (await queued).release()
+    assert controller.waiting == 0
+
+
+def test_models_without_limits_are_not_controlled():
+    model = Model(name="repeater", backend="localhost:50051")
+
+    assert AdmissionRegistry().get(model) is None
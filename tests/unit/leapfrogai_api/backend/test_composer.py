@@ -0,0 +1,27 @@
+from leapfrogai_api.backend.composer import Composer
+from leapfrogai_api.typedef.chat import ChatMessage
+
+
+def test_prompt_cache_key_is_stable_across_turns():
+    first_turn = [
+        ChatMessage(role="system", content="You are a helpful assistant."),
+        ChatMessage(role="user", content="What is LeapfrogAI?"),
+    ]
+    second_turn = first_turn + [
+        ChatMessage(role="assistant", content="A platform for local AI."),
+        ChatMessage(role="user", content="Does it run air-gapped?"),
+    ]
+
+    key = Composer.prompt_cache_key("thread_1", first_turn)
+
+    assert key.startswith("thread_1:")
+    assert Composer.prompt_cache_key("thread_1", second_turn) == key
+    assert Composer.prompt_cache_key("thread_2", first_turn) != key
+
+
+def test_prompt_cache_key_changes_with_instructions():
+    messages = [ChatMessage(role="user", content="What is LeapfrogAI?")]
+
+    assert Composer.prompt_cache_key(
+        "thread_1", [ChatMessage(role="system", content="Be brief."), *messages]
+    ) != Composer.prompt_cache_key("thread_1", messages)
@@ -0,0 +1,52 @@
+import sys
+
+import pytest
+
+from leapfrogai_api.backend.grpc_channels import ChannelPool
+from leapfrogai_api.utils.config import Config
+
+
+@pytest.mark.asyncio
+async def test_channel_is_reused_per_backend():
+    pool = ChannelPool()
+
+    channel = pool.get("localhost:50051")
+
+    assert pool.get("localhost:50051") is channel
+    assert pool.get("localhost:50052") is not channel
+
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_channel_is_rebuilt_after_discard():
+    pool = ChannelPool()
+
+    channel = pool.get("localhost:50051")
+    pool.discard("localhost:50051")
+
+    assert pool.get("localhost:50051") is not channel
+
+    await pool.close()
+
+
+@pytest.mark.asyncio
+async def test_config_reload_releases_old_backend(monkeypatch):
+    pool = ChannelPool()
+    monkeypatch.setattr(
+        sys.modules[Config.__module__], "get_channel_pool", lambda: pool
+    )
+    config = Config(models={}, config_sources={})
+
+    config.parse_models(
+        {"models": [{"name": "repeater", "backend": "localhost:50051"}]}, "a.yaml"
+    )
+    channel = pool.get("localhost:50051")
+
+    config.parse_models(
+        {"models": [{"name": "repeater", "backend": "localhost:50052"}]}, "a.yaml"
+    )
+
+    assert pool.get("localhost:50051") is not channel
+
+    await pool.close()
@@ -0,0 +1,189 @@
+import asyncio
+import base64
+
+import numpy as np
+import pytest
+
+import leapfrogai_sdk as lfai
+from leapfrogai_api.backend import grpc_client
+from leapfrogai_api.backend.deadline import set_request_deadline
+from leapfrogai_api.typedef.models import Model
+
+
+class FakeEmbeddingsStub:
+    """Embeds each input as [len(input)], finishing later batches first."""
+
+    in_flight = 0
+    max_in_flight = 0
+
+    def __init__(self, channel):
+        pass
+
+    async def CreateEmbedding(self, request: lfai.EmbeddingRequest, timeout=None):
+        FakeEmbeddingsStub.in_flight += 1
+        FakeEmbeddingsStub.max_in_flight = max(
+            FakeEmbeddingsStub.max_in_flight, FakeEmbeddingsStub.in_flight
+        )
+        await asyncio.sleep(0.01 * (10 - len(request.inputs[0])))
+        FakeEmbeddingsStub.in_flight -= 1
+        return lfai.embedding_response(
+            [[float(len(text))] for text in request.inputs], request.encoding
+        )
+
+
+class LegacyEmbeddingsStub:
+    """Ignores the requested encoding, like backends built before packed embeddings."""
+
+    def __init__(self, channel):
+        pass
+
+    async def CreateEmbedding(self, request: lfai.EmbeddingRequest, timeout=None):
+        return lfai.EmbeddingResponse(
+            embeddings=[lfai.Embedding(embedding=[0.5, -1.0]) for _ in request.inputs]
+        )
+
+
+@pytest.mark.asyncio
+async def test_stream_embeddings_preserves_order(monkeypatch):
+    monkeypatch.setattr(lfai, "EmbeddingsServiceStub", FakeEmbeddingsStub)
+    inputs = ["a" * (i // 2 + 1) for i in range(10)]
+
+    batches = [
+        batch
+        async for batch in grpc_client.stream_embeddings(
+            Model(name="text-embeddings", backend="localhost:50051"),
+            lfai.EmbeddingRequest(inputs=inputs),
+            batch_size=2,
+            max_concurrent_batches=3,
+        )
+    ]
+
+    assert len(batches) == 5
+    data = [item for batch in batches for item in batch]
+    assert [item.index for item in data] == list(range(10))
+    assert [item.embedding for item in data] == [[float(len(i))] for i in inputs]
+    assert FakeEmbeddingsStub.max_in_flight == 3
+
+
+@pytest.mark.asyncio
+async def test_create_embeddings_base64(monkeypatch):
+    monkeypatch.setattr(lfai, "EmbeddingsServiceStub", FakeEmbeddingsStub)
+
+    response = await grpc_client.create_embeddings(
+        Model(name="text-embeddings", backend="localhost:50051"),
+        lfai.EmbeddingRequest(inputs=["abc"], encoding=lfai.EmbeddingEncoding.FLOAT16),
+        encoding_format="base64",
+    )
+
+    decoded = np.frombuffer(base64.b64decode(response.data[0].embedding), "<f4")
+    assert decoded.tolist() == [3.0]
+
+
+@pytest.mark.asyncio
+async def test_create_embeddings_from_legacy_backend(monkeypatch):
+    monkeypatch.setattr(lfai, "EmbeddingsServiceStub", LegacyEmbeddingsStub)
+
+    response = await grpc_client.create_embeddings(
+        Model(name="text-embeddings", backend="localhost:50051"),
+        lfai.EmbeddingRequest(inputs=["a", "b"]),
+    )
+
+    assert [item.embedding for item in response.data] == [[0.5, -1.0], [0.5, -1.0]]
+
+
+class FakeStreamCall:
+    def __init__(self, responses):
+        self.responses = responses
+        self.cancelled = False
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for response in self.responses:
+            yield response
+
+    async def wait_for_connection(self):
+        pass
+
+    def done(self):
+        return False
+
+    def cancel(self):
+        self.cancelled = True
+
+
+class FakeLease:
+    def __init__(self):
+        self.released = False
+
+    def release(self, error=None):
+        self.released = True
+
+
+@pytest.mark.asyncio
+async def test_leased_stream_cancels_call_when_consumer_stops():
+    call = FakeStreamCall(["a", "b", "c"])
+    lease = FakeLease()
+
+    stream = grpc_client.LeasedStream(lease, call)
+    assert await anext(stream) == "a"
+    await stream.aclose()
+
+    assert call.cancelled
+    assert lease.released
+
+
+def test_leased_stream_released_when_dropped_unread():
+    call = FakeStreamCall(["a", "b", "c"])
+    lease = FakeLease()
+
+    # e.g. the streaming response was never sent because the client had already gone
+    stream = grpc_client.LeasedStream(lease, call)
+    del stream
+
+    assert call.cancelled
+    assert lease.released
+
+
+@pytest.mark.asyncio
+async def test_leased_stream_released_when_exhausted():
+    call = FakeStreamCall(["a", "b"])
+    lease = FakeLease()
+
+    assert [response async for response in grpc_client.LeasedStream(lease, call)] == [
+        "a",
+        "b",
+    ]
+    assert lease.released
+
+
+class FakeBatchCompletionStub:
+    timeouts: list[float | None] = []
+
+    def __init__(self, channel):
+        pass
+
+    def BatchComplete(self, request: lfai.BatchCompletionRequest, timeout=None):
+        FakeBatchCompletionStub.timeouts.append(timeout)
+        return FakeStreamCall([lfai.BatchCompletionResponse(index=0)])
+
+
+@pytest.mark.asyncio
+async def test_batches_have_no_deadline_unless_given_one(monkeypatch):
+    monkeypatch.setattr(lfai, "BatchCompletionServiceStub", FakeBatchCompletionStub)
+    monkeypatch.setattr(FakeBatchCompletionStub, "timeouts", [])
+    model = Model(name="vllm", backend="localhost:50051")
+    requests = [lfai.CompletionRequest(prompt="a")]
+
+    # Not even the deadline of the request that started the batch
+    set_request_deadline(30)
+    try:
+        async for _ in grpc_client.batch_completion_raw(model, requests):
+            pass
+    finally:
+        set_request_deadline(None)
+    async for _ in grpc_client.batch_completion_raw(model, requests, timeout=3600):
+        pass
+
+    assert FakeBatchCompletionStub.timeouts == [None, 3600]
@@ -0,0 +1,120 @@
+import json
+
+import numpy as np
+import pytest
+
+import leapfrogai_sdk as lfai
+from leapfrogai_api.backend.helpers import (
+    chat_chunk_encoder,
+    completion_chunk_encoder,
+    decode_embeddings,
+    grpc_priority,
+)
+from leapfrogai_api.typedef import Usage
+from leapfrogai_api.typedef.chat import (
+    ChatCompletionResponse,
+    ChatDelta,
+    ChatStreamChoice,
+)
+from leapfrogai_api.typedef.completion import (
+    CompletionChoice,
+    CompletionResponse,
+    FinishReason,
+)
+
+TEXTS = ["Hello", "", ' "quoted" \\ back', "new\nline\ttab\x00", "héllo ✓ 🐸"]
+USAGES = [
+    lfai.CompletionUsage(),
+    lfai.CompletionUsage(prompt_tokens=12, completion_tokens=3, total_tokens=15),
+]
+
+
+def _usage(usage: lfai.CompletionUsage) -> Usage:
+    return Usage(
+        prompt_tokens=usage.prompt_tokens,
+        completion_tokens=usage.completion_tokens,
+        total_tokens=usage.total_tokens,
+    )
+
+
+@pytest.mark.parametrize("text", TEXTS)
+@pytest.mark.parametrize("finish_reason", [0, 1, 2])
+@pytest.mark.parametrize("usage", USAGES)
+def test_chat_chunk_encoder_matches_pydantic(text, finish_reason, usage):
+    encoder = chat_chunk_encoder("llama-cpp-python")
+    frame = encoder.encode(text, finish_reason, usage)
+    header = json.loads(frame.removeprefix("data: "))
+
+    expected = ChatCompletionResponse(
+        id=header["id"],
+        object="chat.completion.chunk",
+        created=header["created"],
+        model="llama-cpp-python",
+        choices=[
+            ChatStreamChoice(
+                index=0,
+                delta=ChatDelta(role="assistant", content=text),
+                finish_reason=FinishReason(finish_reason).to_finish_reason(),
+            )
+        ],
+        usage=_usage(usage),
+    ).model_dump_json()
+
+    assert frame == f"data: {expected}\n\n"
+
+
+@pytest.mark.parametrize("text", TEXTS)
+@pytest.mark.parametrize("finish_reason", [0, 1, 2])
+@pytest.mark.parametrize("usage", USAGES)
+def test_completion_chunk_encoder_matches_pydantic(text, finish_reason, usage):
+    encoder = completion_chunk_encoder("llama-cpp-python")
+    frame = encoder.encode(text, finish_reason, usage)
+    header = json.loads(frame.removeprefix("data: "))
+
+    expected = CompletionResponse(
+        id=header["id"],
+        object="text_completion",
+        created=header["created"],
+        model="llama-cpp-python",
+        choices=[
+            CompletionChoice(
+                index=0,
+                text=text,
+                logprobs=None,
+                finish_reason=FinishReason(finish_reason).to_finish_reason(),
+            )
+        ],
+        usage=_usage(usage),
+    ).model_dump_json()
+
+    assert frame == f"data: {expected}\n\n"
+
+
+@pytest.mark.parametrize(
+    "encoding",
+    [
+        lfai.EmbeddingEncoding.FLOAT_LIST,
+        lfai.EmbeddingEncoding.FLOAT32,
+        lfai.EmbeddingEncoding.FLOAT16,
+    ],
+)
+@pytest.mark.parametrize("as_numpy", [False, True])
+def test_decode_embeddings_round_trips(encoding, as_numpy):
+    vectors = [[0.25, -1.5, 3.0], [0.0, 2.0, -0.125]]
+    response = lfai.embedding_response(
+        [np.array(v) if as_numpy else v for v in vectors], encoding
+    )
+    response = lfai.EmbeddingResponse.FromString(response.SerializeToString())
+
+    decoded = decode_embeddings(response)
+
+    assert response.encoding == encoding
+    assert [vector.dtype for vector in decoded] == [np.float32, np.float32]
+    assert [vector.tolist() for vector in decoded] == vectors
+
+
+@pytest.mark.parametrize(
+    "service_tier, priority", [(None, 0), ("auto", 0), ("default", 0), ("flex", 1)]
+)
+def test_grpc_priority(service_tier, priority):
+    assert grpc_priority(service_tier) == priority
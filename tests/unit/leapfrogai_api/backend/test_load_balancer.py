@@ -0,0 +1,116 @@
+import grpc
+from fastapi import HTTPException, status
+import pytest
+
+from leapfrogai_api.backend.load_balancer import LoadBalancer
+from leapfrogai_api.typedef.models import Model
+
+MODEL = Model(name="text-embeddings", backend=["replica-a:50051", "replica-b:50051"])
+
+
+class UnavailableError(grpc.aio.AioRpcError):
+    def __init__(self):
+        super().__init__(
+            grpc.StatusCode.UNAVAILABLE, grpc.aio.Metadata(), grpc.aio.Metadata()
+        )
+
+
+class DeadlineExceededError(grpc.aio.AioRpcError):
+    def __init__(self):
+        super().__init__(
+            grpc.StatusCode.DEADLINE_EXCEEDED, grpc.aio.Metadata(), grpc.aio.Metadata()
+        )
+
+
+class HealthGatedError(grpc.aio.AioRpcError):
+    def __init__(self):
+        super().__init__(
+            grpc.StatusCode.UNAVAILABLE,
+            grpc.aio.Metadata(),
+            grpc.aio.Metadata(),
+            details="connections to all backends failing; last error: "
+            "replica-a:50051: backend unhealthy",
+        )
+
+
+def test_single_backend_config_is_still_supported():
+    model = Model(name="repeater", backend="localhost:50051")
+
+    assert model.backends == ["localhost:50051"]
+    assert LoadBalancer().pick(model) == "localhost:50051"
+
+
+def test_pick_prefers_endpoint_with_fewer_in_flight_requests():
+    balancer = LoadBalancer()
+    busy = balancer.acquire(MODEL)
+
+    for _ in range(10):
+        assert balancer.pick(MODEL) != busy.endpoint
+
+    busy.release()
+    assert balancer.stats[busy.endpoint].in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_failing_endpoint_is_ejected():
+    balancer = LoadBalancer(max_consecutive_failures=2)
+
+    for _ in range(2):
+        with pytest.raises(UnavailableError):
+            async with balancer.endpoint(
+                Model(name="one", backend=["replica-a:50051"])
+            ):
+                raise UnavailableError()
+
+    for _ in range(10):
+        assert balancer.pick(MODEL) == "replica-b:50051"
+    assert balancer.stats["replica-a:50051"].in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast_then_probes(monkeypatch):
+    balancer = LoadBalancer(max_consecutive_failures=1, ejection_seconds=30)
+    model = Model(name="vllm", backend="localhost:50051")
+
+    with pytest.raises(UnavailableError):
+        async with balancer.endpoint(model):
+            raise UnavailableError()
+
+    with pytest.raises(HTTPException) as exc:
+        balancer.pick(model)
+    assert exc.value.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+
+    # Once the cool-down is over a single probe is let through and closes the circuit
+    balancer.stats["localhost:50051"].ejected_until = 0
+    async with balancer.endpoint(model):
+        with pytest.raises(HTTPException):
+            balancer.pick(model)
+
+    assert balancer.pick(model) == "localhost:50051"
+
+
+@pytest.mark.asyncio
+async def test_deadlines_running_out_do_not_eject():
+    balancer = LoadBalancer(max_consecutive_failures=1)
+    model = Model(name="one", backend=["replica-a:50051"])
+
+    # Whether the client's deadline or the API's own, e.g. after queueing on a busy backend
+    for _ in range(3):
+        with pytest.raises(DeadlineExceededError):
+            async with balancer.endpoint(model):
+                raise DeadlineExceededError()
+
+    assert balancer.pick(model) == "replica-a:50051"
+
+
+@pytest.mark.asyncio
+async def test_backend_reporting_not_serving_is_not_ejected():
+    balancer = LoadBalancer(max_consecutive_failures=1)
+    model = Model(name="one", backend=["replica-a:50051"])
+
+    for _ in range(3):
+        with pytest.raises(HealthGatedError):
+            async with balancer.endpoint(model):
+                raise HealthGatedError()
+
+    assert balancer.pick(model) == "replica-a:50051"
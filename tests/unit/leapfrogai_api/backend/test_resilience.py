@@ -0,0 +1,143 @@
+import asyncio
+
+import grpc
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from leapfrogai_api.backend import resilience
+from leapfrogai_api.backend.constants import (
+    BACKEND_RPC_TIMEOUT_SECONDS,
+    MIN_REQUEST_TIMEOUT_SECONDS,
+)
+from leapfrogai_api.backend.deadline import rpc_timeout
+from leapfrogai_api.backend.resilience import (
+    LatencyTracker,
+    RequestDeadlineMiddleware,
+    call_idempotent,
+)
+from leapfrogai_api.typedef.models import Model
+
+MODEL = Model(name="text-embeddings", backend=["replica-a:50051", "replica-b:50051"])
+
+
+def _rpc_error(code: grpc.StatusCode, details: str = "") -> grpc.aio.AioRpcError:
+    return grpc.aio.AioRpcError(
+        code, grpc.aio.Metadata(), grpc.aio.Metadata(), details=details
+    )
+
+
+@pytest.fixture
+def deadline_client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(RequestDeadlineMiddleware)
+
+    @app.get("/timeout")
+    async def timeout():
+        return rpc_timeout()
+
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("timeout", ["0", "-1", "nan", "inf", "soon"])
+def test_invalid_request_timeouts_are_rejected(deadline_client, timeout):
+    response = deadline_client.get("/timeout", headers={"X-Request-Timeout": timeout})
+
+    assert response.status_code == 400
+
+
+def test_rpcs_have_no_deadline_unless_the_client_sets_one(deadline_client):
+    response = deadline_client.get("/timeout")
+
+    assert response.status_code == 200
+    assert response.json() is None
+
+
+def test_short_request_timeouts_are_raised_to_the_minimum(deadline_client):
+    response = deadline_client.get("/timeout", headers={"X-Request-Timeout": "0.001"})
+
+    assert response.status_code == 200
+    assert 0 < response.json() <= MIN_REQUEST_TIMEOUT_SECONDS
+    assert response.json() > MIN_REQUEST_TIMEOUT_SECONDS / 2
+
+
+@pytest.mark.asyncio
+async def test_transient_failures_are_retried_on_another_replica():
+    calls = []
+
+    async def invoke(endpoint: str, timeout: float):
+        calls.append(endpoint)
+        if len(calls) == 1:
+            raise _rpc_error(grpc.StatusCode.UNAVAILABLE)
+        return endpoint
+
+    result = await call_idempotent(MODEL, "RetryTest", invoke)
+
+    assert len(calls) == 2
+    assert calls[0] != calls[1]
+    assert result == calls[1]
+
+
+@pytest.mark.asyncio
+async def test_non_transient_failures_are_not_retried():
+    calls = []
+
+    async def invoke(endpoint: str, timeout: float):
+        calls.append(endpoint)
+        raise _rpc_error(grpc.StatusCode.INVALID_ARGUMENT)
+
+    with pytest.raises(grpc.aio.AioRpcError):
+        await call_idempotent(MODEL, "NoRetryTest", invoke)
+
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_oversized_messages_are_not_retried():
+    calls = []
+
+    async def invoke(endpoint: str, timeout: float):
+        calls.append(endpoint)
+        raise _rpc_error(
+            grpc.StatusCode.RESOURCE_EXHAUSTED,
+            "Received message larger than max (8388608 vs. 4194304)",
+        )
+
+    with pytest.raises(grpc.aio.AioRpcError):
+        await call_idempotent(MODEL, "TooLargeTest", invoke)
+
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_idempotent_rpcs_get_the_default_deadline():
+    timeouts = []
+
+    async def invoke(endpoint: str, timeout: float):
+        timeouts.append(timeout)
+        return endpoint
+
+    await call_idempotent(MODEL, "DeadlineTest", invoke)
+
+    assert timeouts == [BACKEND_RPC_TIMEOUT_SECONDS]
+
+
+@pytest.mark.asyncio
+async def test_slow_call_is_hedged_to_second_replica(monkeypatch):
+    tracker = LatencyTracker()
+    for _ in range(resilience.HEDGE_MIN_SAMPLES):
+        tracker.record(0.01)
+    monkeypatch.setitem(resilience._latencies, (MODEL.name, "HedgeTest"), tracker)
+    calls = []
+
+    async def invoke(endpoint: str, timeout: float):
+        calls.append(endpoint)
+        # The first replica hangs, the hedged request answers right away
+        if len(calls) == 1:
+            await asyncio.sleep(10)
+        return endpoint
+
+    result = await asyncio.wait_for(call_idempotent(MODEL, "HedgeTest", invoke), 1)
+
+    assert len(calls) == 2
+    assert result == calls[1] != calls[0]
@@ -0,0 +1,129 @@
+import asyncio
+
+import pytest
+
+from leapfrogai_api.backend.deadline import rpc_timeout, set_request_deadline
+from leapfrogai_api.backend.single_flight import SingleFlight, content_key
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_calls_share_one_call():
+    single_flight = SingleFlight()
+    calls = 0
+
+    async def call():
+        nonlocal calls
+        calls += 1
+        result = calls
+        await asyncio.sleep(0.01)
+        return result
+
+    key = content_key(["What is LeapfrogAI?"])
+    results = await asyncio.gather(
+        *(single_flight.do("model", "CountTokens", key, call) for _ in range(5)),
+        single_flight.do("model", "CountTokens", content_key(["other"]), call),
+    )
+
+    assert calls == 2
+    assert results[:5] == [1] * 5
+    assert not single_flight.flights
+
+    # Finished calls are not cached
+    assert await single_flight.do("model", "CountTokens", key, call) == 3
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_others():
+    single_flight = SingleFlight()
+    started = asyncio.Event()
+
+    async def call():
+        started.set()
+        await asyncio.sleep(0.01)
+        return "done"
+
+    first = asyncio.create_task(single_flight.do("model", "m", "key", call))
+    second = asyncio.create_task(single_flight.do("model", "m", "key", call))
+    await started.wait()
+    first.cancel()
+
+    assert await second == "done"
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+@pytest.mark.asyncio
+async def test_call_cancelled_once_nobody_waits():
+    single_flight = SingleFlight()
+    cancelled = asyncio.Event()
+
+    async def call():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    waiter = asyncio.create_task(single_flight.do("model", "m", "key", call))
+    await asyncio.sleep(0)
+    waiter.cancel()
+
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
+    assert not single_flight.flights
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared():
+    single_flight = SingleFlight()
+
+    async def call():
+        await asyncio.sleep(0.01)
+        raise ValueError("backend failed")
+
+    results = await asyncio.gather(
+        single_flight.do("model", "m", "key", call),
+        single_flight.do("model", "m", "key", call),
+        return_exceptions=True,
+    )
+
+    assert [type(result) for result in results] == [ValueError, ValueError]
+
+
+@pytest.mark.asyncio
+async def test_shared_call_gets_the_latest_deadline_of_its_callers():
+    single_flight = SingleFlight()
+    joined = asyncio.Event()
+    timeouts = []
+
+    async def call():
+        timeouts.append(rpc_timeout())
+        await joined.wait()
+        timeouts.append(rpc_timeout())
+        return "done"
+
+    async def caller(timeout: float | None):
+        set_request_deadline(timeout)
+        return await single_flight.do("model", "m", "key", call)
+
+    first = asyncio.create_task(caller(1))
+    await asyncio.sleep(0)
+    second = asyncio.create_task(caller(30))
+    await asyncio.sleep(0)
+    # The shared call outlives the caller that started it, with the other's deadline
+    first.cancel()
+    joined.set()
+
+    assert await second == "done"
+    assert timeouts[0] <= 1
+    assert 1 < timeouts[1] <= 30
+
+    # Callers without a deadline don't share calls bounded by someone else's
+    joined.clear()
+    bounded = asyncio.create_task(caller(1))
+    unbounded = asyncio.create_task(caller(None))
+    await asyncio.sleep(0)
+    joined.set()
+    await asyncio.gather(bounded, unbounded)
+
+    assert len(timeouts) == 6
+    assert None in timeouts[2:]
@@ -0,0 +1,43 @@
+import asyncio
+
+import pytest
+from grpc_health.v1 import health_pb2
+
+from leapfrogai_sdk.health import HealthServicer
+
+SERVING = health_pb2.HealthCheckResponse.SERVING
+NOT_SERVING = health_pb2.HealthCheckResponse.NOT_SERVING
+
+
+@pytest.mark.asyncio
+async def test_every_watcher_sees_changes():
+    servicer = HealthServicer()
+    servicer.watch(["embeddings.EmbeddingsService"])
+    request = health_pb2.HealthCheckRequest(service="")
+    watchers = [servicer.Watch(request, None) for _ in range(2)]
+
+    for watcher in watchers:
+        assert (await anext(watcher)).status == NOT_SERVING
+
+    # One watcher going away must not stop updates to the others
+    await watchers.pop().aclose()
+    servicer.set_ready(True)
+    assert (await anext(watchers[0])).status == SERVING
+
+    # Changes from worker threads, e.g. synchronous RPCs finishing, reach the loop too
+    await asyncio.to_thread(servicer.enter_graceful_shutdown)
+    assert (await asyncio.wait_for(anext(watchers[0]), 1)).status == NOT_SERVING
+
+
+def test_overload_hysteresis():
+    servicer = HealthServicer(overload_threshold=8)
+    servicer.set_ready(True)
+
+    for _ in range(8):
+        servicer.started()
+    assert servicer.status() == NOT_SERVING
+
+    servicer.finished()
+    assert servicer.status() == NOT_SERVING
+    servicer.finished()
+    assert servicer.status() == SERVING
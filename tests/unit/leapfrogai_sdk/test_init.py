@@ -0,0 +1,30 @@
+import subprocess
+import sys
+
+import leapfrogai_sdk as lfai
+
+
+def test_import_does_not_load_protos():
+    loaded = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys, leapfrogai_sdk; print(sorted(m for m in sys.modules if m.endswith('_pb2')))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.splitlines()[-1]
+
+    assert loaded == "[]"
+
+
+def test_exports_resolve_lazily():
+    from leapfrogai_sdk.chat import chat_pb2
+
+    assert lfai.ChatItem is chat_pb2.ChatItem
+    assert lfai.GrpcContext.__name__ == "ServicerContext"
+    assert callable(lfai.serve)
+    assert "EmbeddingsServiceStub" in dir(lfai)
+    for name in lfai.__all__:
+        getattr(lfai, name)
@@ -0,0 +1,367 @@
+import asyncio
+
+import pytest
+from prometheus_client import REGISTRY
+
+import leapfrogai_sdk as lfai
+from leapfrogai_sdk.llm import LLM, GenerationChunk, GenerationConfig, coalesce_deltas
+
+
+class CountingModel:
+    """Generates a fixed reply and records every text it is asked to tokenize."""
+
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.counted: list[str] = []
+
+    async def generate(self, prompt: str, config: GenerationConfig):
+        for chunk in self.chunks:
+            yield chunk
+
+    async def count_tokens(self, raw_text: str) -> int:
+        self.counted.append(raw_text)
+        return len(raw_text.split())
+
+
+@LLM
+class Model(CountingModel):
+    pass
+
+
+def completion_request(prompt: str = "one two three") -> lfai.CompletionRequest:
+    return lfai.CompletionRequest(prompt=prompt, max_new_tokens=10)
+
+
+@pytest.mark.asyncio
+async def test_usage_from_generated_token_counts():
+    model = Model(
+        [
+            GenerationChunk("Hello", 1, prompt_token_count=7),
+            GenerationChunk(" there", 2),
+        ]
+    )
+
+    response = await model.Complete(completion_request(), None)
+
+    assert response.choices[0].text == "Hello there"
+    assert response.usage.prompt_tokens == 7
+    assert response.usage.completion_tokens == 3
+    assert model.counted == []
+
+
+@pytest.mark.asyncio
+async def test_usage_falls_back_to_count_tokens():
+    model = Model(["Hello", GenerationChunk(" there", 2)])
+
+    responses = [
+        response async for response in model.CompleteStream(completion_request(), None)
+    ]
+
+    assert [r.choices[0].text for r in responses] == ["Hello", " there"]
+    assert responses[-1].usage.prompt_tokens == 3
+    assert responses[-1].usage.completion_tokens == 2
+    assert model.counted == ["Hello there", "one two three"]
+
+
+@pytest.mark.asyncio
+async def test_prompt_token_counts_are_cached():
+    model = Model([GenerationChunk("Hi", 1)])
+
+    for _ in range(3):
+        response = await model.Complete(completion_request(), None)
+        assert response.usage.prompt_tokens == 3
+    await model.Complete(completion_request("a different prompt"), None)
+
+    assert model.counted == ["one two three", "a different prompt"]
+
+
+@pytest.mark.asyncio
+async def test_count_tokens_rpcs_share_the_cache():
+    model = Model([])
+
+    single = await model.CountTokens(lfai.TokenCountRequest(text="one two"), None)
+    batch = await model.BatchCountTokens(
+        lfai.BatchTokenCountRequest(texts=["a b c", "one two", "a b c", ""]), None
+    )
+
+    assert single.count == 2
+    assert list(batch.counts) == [3, 2, 3, 0]
+    assert model.counted == ["one two", "a b c", ""]
+
+
+class BatchCountingModel(CountingModel):
+    def __init__(self, chunks):
+        super().__init__(chunks)
+        self.batches: list[list[str]] = []
+
+    async def count_tokens_batch(self, texts: list[str]) -> list[int]:
+        self.batches.append(texts)
+        return [len(text.split()) for text in texts]
+
+
+@pytest.mark.asyncio
+async def test_batch_count_tokens_tokenizes_uncached_texts_in_one_call():
+    model = LLM(BatchCountingModel)([])
+    await model.CountTokens(lfai.TokenCountRequest(text="cached"), None)
+
+    response = await model.BatchCountTokens(
+        lfai.BatchTokenCountRequest(texts=["x y", "cached", "x y", "z"]), None
+    )
+
+    assert list(response.counts) == [2, 1, 2, 1]
+    assert model.batches == [["x y", "z"]]
+
+
+async def deltas(texts, delay=0.0):
+    for text in texts:
+        await asyncio.sleep(delay)
+        yield text
+
+
+@pytest.mark.asyncio
+async def test_coalesce_deltas_batches_after_first_delta():
+    batches = [
+        batch async for batch in coalesce_deltas(deltas("abcdefgh"), 10, max_bytes=3)
+    ]
+
+    assert batches == ["a", "bcd", "efg", "h"]
+
+
+@pytest.mark.asyncio
+async def test_coalesce_deltas_flushes_when_interval_elapses():
+    async def slow_tail():
+        for text in ["a", "b", "c"]:
+            yield text
+        await asyncio.sleep(0.2)
+        yield "d"
+
+    batches = []
+    async for batch in coalesce_deltas(slow_tail(), 0.05, max_bytes=1024):
+        batches.append(batch)
+
+    # "b" and "c" are sent once the interval passes, without waiting for "d"
+    assert batches == ["a", "bc", "d"]
+
+
+@pytest.mark.asyncio
+async def test_coalesce_deltas_disabled():
+    batches = [batch async for batch in coalesce_deltas(deltas("abc"), 0, 1024)]
+
+    assert batches == ["a", "b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_stream_coalesces_deltas():
+    model = Model([GenerationChunk(c, 1) for c in "Hello there"])
+
+    responses = [
+        response async for response in model.CompleteStream(completion_request(), None)
+    ]
+
+    assert "".join(r.choices[0].text for r in responses) == "Hello there"
+    assert len(responses) < len("Hello there")
+    assert responses[-1].usage.completion_tokens == len("Hello there")
+
+
+class FailingModel(CountingModel):
+    async def generate(self, prompt: str, config: GenerationConfig):
+        if prompt == "fail":
+            raise ValueError("bad prompt")
+        await asyncio.sleep(0.01 * len(prompt))
+        yield GenerationChunk(prompt, 1)
+
+
+@pytest.mark.asyncio
+async def test_batch_complete_reports_each_request_by_index():
+    model = LLM(FailingModel)([])
+    prompts = ["slowest", "fail", "ok"]
+
+    results = [
+        result
+        async for result in model.BatchComplete(
+            lfai.BatchCompletionRequest(
+                requests=[completion_request(prompt) for prompt in prompts]
+            ),
+            None,
+        )
+    ]
+
+    assert [result.index for result in results] == [1, 2, 0]
+    assert results[0].error == "bad prompt"
+    assert not results[0].HasField("response")
+    assert {r.index: r.response.choices[0].text for r in results[1:]} == {
+        0: "slowest",
+        2: "ok",
+    }
+
+
+class EndlessModel(CountingModel):
+    async def generate(self, prompt: str, config: GenerationConfig):
+        try:
+            while True:
+                await asyncio.sleep(0)
+                yield GenerationChunk("x", 1)
+        finally:
+            self.closed = True
+
+
+class CancelledContext:
+    def __init__(self, after: int):
+        self.checks = 0
+        self.after = after
+
+    def cancelled(self) -> bool:
+        self.checks += 1
+        return self.checks > self.after
+
+
+@pytest.mark.asyncio
+async def test_closing_stream_closes_generate():
+    model = LLM(EndlessModel)([])
+
+    stream = model.CompleteStream(completion_request(), None)
+    await anext(stream)
+    await stream.aclose()
+
+    assert model.closed
+
+
+@pytest.mark.asyncio
+async def test_cancelled_rpc_stops_generation():
+    model = LLM(EndlessModel)([])
+
+    response = await model.Complete(completion_request(), CancelledContext(after=3))
+
+    assert response.choices[0].text == "xxx"
+    assert model.closed
+
+
+def sample(name: str, rpc: str) -> float:
+    return REGISTRY.get_sample_value(name, {"model": "Model", "rpc": rpc}) or 0.0
+
+
+@pytest.mark.asyncio
+async def test_generation_metrics():
+    before = {
+        name: sample(name, "CompleteStream")
+        for name in (
+            "leapfrogai_backend_time_to_first_token_seconds_count",
+            "leapfrogai_backend_inter_token_latency_seconds_count",
+            "leapfrogai_backend_generated_tokens_total",
+            "leapfrogai_backend_prompt_tokens_total",
+        )
+    }
+    model = Model(
+        [
+            GenerationChunk("Hello", 1, prompt_token_count=7),
+            GenerationChunk("", 0),
+            GenerationChunk(" there", 2),
+        ]
+    )
+
+    async for _ in model.CompleteStream(completion_request(), None):
+        assert sample("leapfrogai_backend_requests_in_flight", "CompleteStream") == 1
+
+    after = {name: sample(name, "CompleteStream") for name in before}
+    assert {name: after[name] - before[name] for name in before} == {
+        "leapfrogai_backend_time_to_first_token_seconds_count": 1,
+        "leapfrogai_backend_inter_token_latency_seconds_count": 1,
+        "leapfrogai_backend_generated_tokens_total": 3,
+        "leapfrogai_backend_prompt_tokens_total": 7,
+    }
+    assert sample("leapfrogai_backend_requests_in_flight", "CompleteStream") == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_requests_are_counted():
+    model = LLM(FailingModel)([])
+    errors = REGISTRY.get_sample_value(
+        "leapfrogai_backend_request_errors_total",
+        {"model": "FailingModel", "rpc": "Complete"},
+    )
+
+    with pytest.raises(ValueError):
+        await model.Complete(completion_request("fail"), None)
+
+    assert (
+        REGISTRY.get_sample_value(
+            "leapfrogai_backend_request_errors_total",
+            {"model": "FailingModel", "rpc": "Complete"},
+        )
+        == (errors or 0) + 1
+    )
+
+
+class RecordingModel(CountingModel):
+    async def generate(self, prompt: str, config: GenerationConfig):
+        self.configs.append(config)
+        yield GenerationChunk("ok", 1)
+
+
+@pytest.mark.asyncio
+async def test_cache_key_is_passed_to_generate():
+    model = LLM(RecordingModel)([])
+    model.configs = []
+
+    chat_request = lfai.ChatCompletionRequest(max_new_tokens=10, cache_key="thread_1")
+    async for _ in model._build_gen_stream("prompt", chat_request):
+        pass
+    await model.Complete(completion_request(), None)
+
+    assert [config.cache_key for config in model.configs] == ["thread_1", None]
+
+
+@pytest.mark.asyncio
+async def test_priority_is_passed_to_generate():
+    model = LLM(RecordingModel)([])
+    model.configs = []
+
+    chat_request = lfai.ChatCompletionRequest(max_new_tokens=10, priority=1)
+    async for _ in model._build_gen_stream("prompt", chat_request):
+        pass
+    await model.Complete(completion_request(), None)
+
+    assert [config.priority for config in model.configs] == [1, 0]
+
+
+class FullModel(CountingModel):
+    async def generate(self, prompt: str, config: GenerationConfig):
+        raise AssertionError("non-streaming RPCs should use generate_full")
+        yield
+
+    async def generate_full(self, prompt: str, config: GenerationConfig):
+        return GenerationChunk("Hello there", 10, prompt_token_count=3)
+
+
+@pytest.mark.asyncio
+async def test_non_streaming_rpcs_use_generate_full():
+    model = LLM(FullModel)([])
+
+    response = await model.Complete(completion_request(), None)
+
+    assert response.choices[0].text == "Hello there"
+    assert response.choices[0].finish_reason == lfai.CompletionFinishReason.LENGTH
+    assert response.usage.prompt_tokens == 3
+    assert response.usage.completion_tokens == 10
+    assert model.counted == []
+
+
+@pytest.mark.asyncio
+async def test_generate_full_records_time_to_first_token():
+    name = "leapfrogai_backend_time_to_first_token_seconds_count"
+    labels = {"model": "FullModel", "rpc": "Complete"}
+    before = REGISTRY.get_sample_value(name, labels) or 0.0
+    model = LLM(FullModel)([])
+
+    await model.Complete(completion_request(), None)
+
+    assert REGISTRY.get_sample_value(name, labels) == before + 1
+
+
+@pytest.mark.asyncio
+async def test_generate_full_skipped_once_client_cancelled():
+    model = LLM(FullModel)([])
+
+    response = await model.Complete(completion_request(), CancelledContext(after=0))
+
+    assert response.choices[0].text == ""
@@ -0,0 +1,217 @@
+import asyncio
+import json
+import os
+import socket
+import tempfile
+import urllib.request
+
+import grpc
+import pytest
+from grpc_health.v1 import health_pb2, health_pb2_grpc
+
+import leapfrogai_sdk as lfai
+from leapfrogai_sdk.config import ServerConfig
+
+SERVING = health_pb2.HealthCheckResponse.SERVING
+NOT_SERVING = health_pb2.HealthCheckResponse.NOT_SERVING
+
+
+HEALTH_CHECKED_CHANNEL_OPTIONS = [
+    (
+        "grpc.service_config",
+        json.dumps(
+            {
+                "loadBalancingConfig": [{"round_robin": {}}],
+                "healthCheckConfig": {"serviceName": ""},
+            }
+        ),
+    )
+]
+
+
+class SlowEmbeddings:
+    async def CreateEmbedding(self, request, context):
+        await asyncio.sleep(0.2)
+        return lfai.EmbeddingResponse(embeddings=[lfai.Embedding(embedding=[1.0])])
+
+
+@pytest.mark.asyncio
+async def test_serve_rejects_rpcs_over_the_concurrency_limit():
+    with tempfile.TemporaryDirectory() as tmp:
+        uds = os.path.join(tmp, "backend.sock")
+        server = asyncio.create_task(
+            lfai.serve(
+                SlowEmbeddings(),
+                "127.0.0.1",
+                0,
+                uds,
+                ServerConfig(max_concurrent_rpcs=2),
+            )
+        )
+        try:
+            while not os.path.exists(uds):
+                await asyncio.sleep(0.01)
+
+            # Like the API's channels, watch health, which keeps a stream open that
+            # mustn't count toward the limit
+            async with grpc.aio.insecure_channel(
+                f"unix://{uds}", options=HEALTH_CHECKED_CHANNEL_OPTIONS
+            ) as channel:
+                stub = lfai.EmbeddingsServiceStub(channel)
+                results = await asyncio.gather(
+                    *(
+                        stub.CreateEmbedding(lfai.EmbeddingRequest(inputs=["a"]))
+                        for _ in range(3)
+                    ),
+                    return_exceptions=True,
+                )
+        finally:
+            server.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await server
+
+    errors = [result for result in results if isinstance(result, grpc.aio.AioRpcError)]
+    assert len(errors) == 1
+    assert errors[0].code() == grpc.StatusCode.RESOURCE_EXHAUSTED
+
+
+class SingleCounter:
+    async def CountTokens(self, request, context):
+        return lfai.TokenCountResponse(count=len(request.text.split()))
+
+
+@pytest.mark.asyncio
+async def test_serve_answers_unimplemented_for_optional_rpcs():
+    with tempfile.TemporaryDirectory() as tmp:
+        uds = os.path.join(tmp, "backend.sock")
+        server = asyncio.create_task(lfai.serve(SingleCounter(), "127.0.0.1", 0, uds))
+        try:
+            while not os.path.exists(uds):
+                await asyncio.sleep(0.01)
+
+            async with grpc.aio.insecure_channel(f"unix://{uds}") as channel:
+                stub = lfai.TokenCountServiceStub(channel)
+                response = await stub.CountTokens(
+                    lfai.TokenCountRequest(text="one two")
+                )
+                with pytest.raises(grpc.aio.AioRpcError) as error:
+                    await stub.BatchCountTokens(
+                        lfai.BatchTokenCountRequest(texts=["one"])
+                    )
+        finally:
+            server.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await server
+
+    assert response.count == 2
+    assert error.value.code() == grpc.StatusCode.UNIMPLEMENTED
+
+
+def test_server_config_grpc_options():
+    options = dict(
+        ServerConfig(
+            max_receive_message_length=1024, keepalive_time_ms=5000
+        ).grpc_options()
+    )
+
+    assert options["grpc.max_receive_message_length"] == 1024
+    assert options["grpc.keepalive_time_ms"] == 5000
+    assert "grpc.keepalive_time_ms" not in dict(ServerConfig().grpc_options())
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.mark.asyncio
+async def test_serve_exposes_metrics():
+    port = free_port()
+    server = asyncio.create_task(
+        lfai.serve(
+            SlowEmbeddings(), "127.0.0.1", 0, config=ServerConfig(metrics_port=port)
+        )
+    )
+    try:
+        body = None
+        while body is None:
+            await asyncio.sleep(0.01)
+            try:
+                body = await asyncio.to_thread(
+                    lambda: urllib.request.urlopen(
+                        f"http://127.0.0.1:{port}/metrics"
+                    ).read()
+                )
+            except OSError:
+                pass
+    finally:
+        server.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await server
+
+    assert b"leapfrogai_backend_requests_in_flight" in body
+
+
+class LoadingEmbeddings(SlowEmbeddings):
+    def __init__(self):
+        self.loaded = asyncio.Event()
+        self.embedded = asyncio.Event()
+
+    async def load(self):
+        await self.loaded.wait()
+
+    async def CreateEmbedding(self, request, context):
+        await self.embedded.wait()
+        return lfai.EmbeddingResponse(embeddings=[lfai.Embedding(embedding=[1.0])])
+
+
+async def health_status(channel, service: str = ""):
+    response = await health_pb2_grpc.HealthStub(channel).Check(
+        health_pb2.HealthCheckRequest(service=service)
+    )
+    return response.status
+
+
+async def wait_for_status(channel, status, timeout: float = 5):
+    async def poll():
+        while await health_status(channel) != status:
+            await asyncio.sleep(0.01)
+
+    await asyncio.wait_for(poll(), timeout)
+
+
+@pytest.mark.asyncio
+async def test_health_reflects_readiness_and_load():
+    backend = LoadingEmbeddings()
+    with tempfile.TemporaryDirectory() as tmp:
+        uds = os.path.join(tmp, "backend.sock")
+        server = asyncio.create_task(
+            lfai.serve(backend, "127.0.0.1", 0, uds, ServerConfig(overload_threshold=1))
+        )
+        try:
+            while not os.path.exists(uds):
+                await asyncio.sleep(0.01)
+
+            async with grpc.aio.insecure_channel(f"unix://{uds}") as channel:
+                # Health checks answer while the backend is still loading
+                assert await health_status(channel) == NOT_SERVING
+                backend.loaded.set()
+                await wait_for_status(channel, SERVING)
+                assert (
+                    await health_status(channel, "embeddings.EmbeddingsService")
+                    == SERVING
+                )
+
+                # A single RPC in flight reaches the overload threshold
+                call = lfai.EmbeddingsServiceStub(channel).CreateEmbedding(
+                    lfai.EmbeddingRequest(inputs=["a"])
+                )
+                await wait_for_status(channel, NOT_SERVING)
+                backend.embedded.set()
+                await call
+                await wait_for_status(channel, SERVING)
+        finally:
+            server.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await server
@@ -0,0 +1,84 @@
+from dataclasses import dataclass
+
+from prefix_cache import PrefixCache
+
+
+@dataclass
+class State:
+    conversation: str
+    n_tokens: int
+    llama_state_size: int
+
+
+class FakeLlama:
+    """Tracks which conversation's context is loaded, one byte of state per token."""
+
+    def __init__(self):
+        self.conversation: str | None = None
+        self.n_tokens = 0
+        self.saves = 0
+
+    def evaluate(self, conversation: str, n_tokens: int):
+        self.conversation = conversation
+        self.n_tokens = n_tokens
+
+    def save_state(self) -> State:
+        self.saves += 1
+        return State(self.conversation, self.n_tokens, self.n_tokens)
+
+    def load_state(self, state: State):
+        self.conversation = state.conversation
+        self.n_tokens = state.n_tokens
+
+
+def test_saved_context_is_restored_for_its_conversation():
+    llm = FakeLlama()
+    cache = PrefixCache(capacity_bytes=1000)
+
+    llm.evaluate("a", 10)
+    cache.save(llm, "a")
+    llm.evaluate("b", 20)
+    cache.save(llm, "b")
+
+    cache.restore(llm, "a")
+    assert (llm.conversation, llm.n_tokens) == ("a", 10)
+
+    # Requests without a key neither restore nor save
+    cache.restore(llm, None)
+    cache.save(llm, None)
+    assert llm.conversation == "a"
+    assert llm.saves == 2
+
+
+def test_context_is_only_saved_when_it_grew():
+    llm = FakeLlama()
+    cache = PrefixCache(capacity_bytes=1000)
+
+    llm.evaluate("a", 10)
+    cache.save(llm, "a")
+    # e.g. a retried request that evaluated nothing new
+    cache.save(llm, "a")
+    assert llm.saves == 1
+
+    llm.evaluate("a", 15)
+    cache.save(llm, "a")
+    assert llm.saves == 2
+    assert cache.size == 15
+
+
+def test_cache_is_bounded_by_state_size():
+    llm = FakeLlama()
+    cache = PrefixCache(capacity_bytes=100)
+
+    for conversation, n_tokens in [("a", 40), ("b", 40), ("c", 40)]:
+        llm.evaluate(conversation, n_tokens)
+        cache.save(llm, conversation)
+
+    assert list(cache.states) == ["b", "c"]
+    assert cache.size == 80
+
+    # A context bigger than the whole cache isn't kept
+    llm.evaluate("d", 200)
+    cache.save(llm, "d")
+    assert "d" not in cache.states
+    assert cache.size <= 100
@@ -0,0 +1,11 @@
+# Backends run from their own directory, so their modules import each other as top-level
+# modules; only those that don't need vLLM itself can be tested here
+import os
+import sys
+
+sys.path.insert(
+    0,
+    os.path.join(
+        os.path.dirname(__file__), "..", "..", "..", "packages", "vllm", "src"
+    ),
+)
@@ -0,0 +1,183 @@
+import asyncio
+import time
+from dataclasses import dataclass
+
+import pytest
+
+from output_scheduler import OutputScheduler
+
+TOKEN_INTERVAL = 0.01
+
+
+@dataclass
+class Output:
+    request_id: str
+    tokens: int
+    finished: bool = False
+
+
+async def engine_stream(request_id: str, tokens: int, interval=TOKEN_INTERVAL):
+    """Cumulative outputs of one request, one token per `interval` like a decode step."""
+    for i in range(1, tokens + 1):
+        await asyncio.sleep(interval)
+        yield Output(request_id, i, finished=i == tokens)
+
+
+class Recorder:
+    def __init__(self, delivery_cost: float = 0):
+        self.delivery_cost = delivery_cost
+        self.outputs: list[Output] = []
+        self.ended: list[str] = []
+        self.errors: dict[str, Exception] = {}
+        self.arrivals: dict[str, list[float]] = {}
+        self.all_ended = asyncio.Event()
+        self.expected = 0
+
+    async def deliver(self, output: Output):
+        self.outputs.append(output)
+        self.arrivals.setdefault(output.request_id, []).append(time.perf_counter())
+        if self.delivery_cost:
+            # Work done per delivery, e.g. detokenizing and sending the delta
+            time.sleep(self.delivery_cost)
+
+    def end(self, request_id: str, error: Exception | None):
+        self.ended.append(request_id)
+        if error is not None:
+            self.errors[request_id] = error
+        if len(self.ended) == self.expected:
+            self.all_ended.set()
+
+    def max_gap(self, request_id: str) -> float:
+        arrivals = self.arrivals[request_id]
+        return max(later - earlier for earlier, later in zip(arrivals, arrivals[1:]))
+
+
+@pytest.mark.asyncio
+async def test_higher_priority_requests_are_delivered_first():
+    recorder = Recorder()
+    scheduler = OutputScheduler(recorder.deliver, recorder.end)
+    recorder.expected = 3
+
+    engine_step = asyncio.Event()
+
+    async def one_output(request_id):
+        await engine_step.wait()
+        yield Output(request_id, 1, finished=True)
+
+    scheduler.add("batch", one_output("batch"), priority=1)
+    scheduler.add("chat-1", one_output("chat-1"), priority=0)
+    scheduler.add("chat-2", one_output("chat-2"), priority=0)
+    # All three outputs become ready in the same step, once every reader is waiting
+    await asyncio.sleep(0)
+    engine_step.set()
+    await asyncio.wait_for(recorder.all_ended.wait(), 1)
+
+    assert [output.request_id for output in recorder.outputs] == [
+        "chat-1",
+        "chat-2",
+        "batch",
+    ]
+    assert len(scheduler) == 0
+
+
+@pytest.mark.asyncio
+async def test_a_finished_stream_does_not_stall_the_others():
+    recorder = Recorder()
+    scheduler = OutputScheduler(recorder.deliver, recorder.end)
+    recorder.expected = 2
+
+    scheduler.add("short", engine_stream("short", 1))
+    scheduler.add("long", engine_stream("long", 20))
+    await asyncio.wait_for(recorder.all_ended.wait(), 2)
+
+    assert recorder.ended == ["short", "long"]
+    assert recorder.outputs[-1] == Output("long", 20, finished=True)
+
+
+@pytest.mark.asyncio
+async def test_stream_end_is_reported_after_its_last_output():
+    recorder = Recorder()
+    scheduler = OutputScheduler(recorder.deliver, recorder.end)
+    recorder.expected = 1
+
+    async def aborted(request_id):
+        yield Output(request_id, 1)
+
+    scheduler.add("aborted", aborted("aborted"))
+    await asyncio.wait_for(recorder.all_ended.wait(), 1)
+
+    assert recorder.outputs == [Output("aborted", 1)]
+    assert recorder.ended == ["aborted"]
+    assert recorder.errors == {}
+
+
+@pytest.mark.asyncio
+async def test_stream_errors_are_reported_with_its_end():
+    recorder = Recorder()
+    scheduler = OutputScheduler(recorder.deliver, recorder.end)
+    recorder.expected = 1
+    error = ValueError("engine failed")
+
+    async def failed(request_id):
+        yield Output(request_id, 1)
+        raise error
+
+    scheduler.add("failed", failed("failed"))
+    await asyncio.wait_for(recorder.all_ended.wait(), 1)
+
+    assert recorder.outputs == [Output("failed", 1)]
+    assert recorder.errors == {"failed": error}
+
+
+@pytest.mark.asyncio
+async def test_discarded_requests_are_no_longer_delivered():
+    recorder = Recorder()
+    scheduler = OutputScheduler(recorder.deliver, recorder.end)
+
+    scheduler.add("discarded", engine_stream("discarded", 100))
+    await asyncio.sleep(TOKEN_INTERVAL * 3)
+    scheduler.discard("discarded")
+    delivered = len(recorder.outputs)
+    await asyncio.sleep(TOKEN_INTERVAL * 3)
+
+    assert len(recorder.outputs) == delivered
+    assert recorder.ended == []
+    assert len(scheduler) == 0
+
+
+@pytest.mark.asyncio
+async def test_inter_token_latency_is_bounded_under_concurrency():
+    recorder = Recorder()
+    scheduler = OutputScheduler(recorder.deliver, recorder.end)
+    request_ids = [f"request-{i}" for i in range(32)]
+    recorder.expected = len(request_ids)
+
+    for request_id in request_ids:
+        scheduler.add(request_id, engine_stream(request_id, 20))
+    await asyncio.wait_for(recorder.all_ended.wait(), 5)
+
+    # Every request is served each step, rather than whenever a random pick lands on it
+    assert max(recorder.max_gap(request_id) for request_id in request_ids) < (
+        TOKEN_INTERVAL * 5
+    )
+
+
+@pytest.mark.asyncio
+async def test_interactive_latency_is_bounded_under_batch_load():
+    # Delivering every output takes longer than a decode step, so not every request can
+    # be served each step
+    recorder = Recorder(delivery_cost=0.001)
+    scheduler = OutputScheduler(recorder.deliver, recorder.end)
+    batch_ids = [f"batch-{i}" for i in range(30)]
+    recorder.expected = len(batch_ids) + 1
+
+    for request_id in batch_ids:
+        scheduler.add(request_id, engine_stream(request_id, 30), priority=1)
+    scheduler.add("chat", engine_stream("chat", 30), priority=0)
+    await asyncio.wait_for(recorder.all_ended.wait(), 10)
+
+    # Interactive outputs wait for at most the delivery in progress
+    assert recorder.max_gap("chat") < TOKEN_INTERVAL * 4
+    # Batch requests fall behind but still finish, skipping intermediate outputs
+    assert all(request_id in recorder.ended for request_id in batch_ids)
+    assert len(recorder.arrivals["batch-0"]) < 30
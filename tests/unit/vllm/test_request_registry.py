@@ -0,0 +1,106 @@
+import time
+from dataclasses import dataclass
+
+import pytest
+from prometheus_client import REGISTRY
+
+from leapfrogai_sdk.llm import GenerationChunk
+from request_registry import RequestRegistry, RequestState
+
+
+@dataclass
+class Completion:
+    text: str
+    token_ids: list[int]
+
+
+@dataclass
+class Output:
+    """The parts of vLLM's cumulative RequestOutput the registry reads."""
+
+    request_id: str
+    outputs: list[Completion]
+    prompt_token_ids: list[int]
+    finished: bool = False
+
+
+def output(request_id: str, text: str, tokens: int, finished=False) -> Output:
+    return Output(
+        request_id, [Completion(text, list(range(tokens)))], [0] * 4, finished
+    )
+
+
+def live_states(model: str) -> float:
+    return REGISTRY.get_sample_value(
+        "leapfrogai_backend_request_states", {"model": model}
+    )
+
+
+def drain(state: RequestState) -> list:
+    deltas = []
+    while not state.deltas.empty():
+        deltas.append(state.deltas.get_nowait())
+    return deltas
+
+
+@pytest.mark.asyncio
+async def test_partial_multi_byte_characters_are_held_back():
+    registry = RequestRegistry(ttl=60, model="hold-back")
+    state = registry.create("r")
+
+    registry.stream(output("r", "caf", 1))
+    # The engine decoded only the first byte of "é"
+    registry.stream(output("r", "caf\ufffd", 2))
+    registry.stream(output("r", "café", 3, finished=True))
+
+    assert drain(state) == [
+        GenerationChunk("caf", 1, 4),
+        GenerationChunk("é", 2, 4),
+        None,
+    ]
+
+
+@pytest.mark.asyncio
+async def test_finish_and_abort_drop_state():
+    registry = RequestRegistry(ttl=60, model="lifecycle")
+    finished = registry.create("finished")
+    registry.create("aborted")
+    assert live_states("lifecycle") == 2
+
+    registry.stream(output("finished", "done", 1, finished=True))
+    assert "finished" not in registry
+    assert drain(finished) == [
+        GenerationChunk("done", 1, 4),
+        None,
+    ]
+
+    assert registry.abort("aborted")
+    assert not registry.abort("aborted")
+    # Outputs the engine had already queued are ignored
+    registry.stream(output("aborted", "late", 1))
+
+    assert len(registry) == 0
+    assert live_states("lifecycle") == 0
+
+
+@pytest.mark.asyncio
+async def test_inactive_requests_are_evicted(monkeypatch):
+    registry = RequestRegistry(ttl=60, model="eviction")
+    stalled = registry.create("stalled")
+    registry.create("active")
+    # e.g. a non-streaming request, read straight from the engine
+    registry.create("touched")
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 30)
+    registry.stream(output("active", "a", 1))
+    registry.touch("touched")
+    monkeypatch.setattr(time, "monotonic", lambda: now + 61)
+
+    assert registry.evict_expired() == ["stalled"]
+    assert "active" in registry
+    assert "touched" in registry
+    assert live_states("eviction") == 2
+
+    (error,) = drain(stalled)
+    assert isinstance(error, TimeoutError)